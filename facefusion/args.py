@@ -44,6 +44,7 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('face_detector_size', args.get('face_detector_size'))
 	apply_state_item('face_detector_angles', args.get('face_detector_angles'))
 	apply_state_item('face_detector_score', args.get('face_detector_score'))
+	apply_state_item('face_tracker_interval', args.get('face_tracker_interval'))
 	# face landmarker
 	apply_state_item('face_landmarker_model', args.get('face_landmarker_model'))
 	apply_state_item('face_landmarker_score', args.get('face_landmarker_score'))
@@ -67,6 +68,9 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('trim_frame_end', args.get('trim_frame_end'))
 	apply_state_item('temp_frame_format', args.get('temp_frame_format'))
 	apply_state_item('keep_temp', args.get('keep_temp'))
+	apply_state_item('pipeline_mode', args.get('pipeline_mode'))
+	apply_state_item('video_segment_count', args.get('video_segment_count'))
+	apply_state_item('frame_cache_path', args.get('frame_cache_path'))
 	# output creation
 	apply_state_item('output_image_quality', args.get('output_image_quality'))
 	if is_image(args.get('target_path')):
@@ -103,11 +107,16 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	# execution
 	apply_state_item('execution_device_id', args.get('execution_device_id'))
 	apply_state_item('execution_providers', args.get('execution_providers'))
+	apply_state_item('execution_backend', args.get('execution_backend'))
 	apply_state_item('execution_thread_count', args.get('execution_thread_count'))
 	apply_state_item('execution_queue_count', args.get('execution_queue_count'))
+	apply_state_item('execution_batch_size', args.get('execution_batch_size'))
+	apply_state_item('execution_batch_window', args.get('execution_batch_window'))
 	# memory
 	apply_state_item('video_memory_strategy', args.get('video_memory_strategy'))
 	apply_state_item('system_memory_limit', args.get('system_memory_limit'))
+	apply_state_item('face_store_memory_limit', args.get('face_store_memory_limit'))
+	apply_state_item('face_store_spill', args.get('face_store_spill'))
 	# misc
 	apply_state_item('skip_download', args.get('skip_download'))
 	apply_state_item('log_level', args.get('log_level'))
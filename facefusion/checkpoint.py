@@ -0,0 +1,99 @@
+import json
+import os
+from typing import List, Optional, Set
+
+from facefusion import state_manager
+from facefusion.filesystem import is_file, remove_file
+from facefusion.frame_cache import collect_file_stat
+from facefusion.hash_helper import create_hash
+from facefusion.jobs import job_store
+from facefusion.json import read_json, write_json
+from facefusion.temp_helper import get_temp_directory_path, get_temp_frame_paths
+from facefusion.typing import Checkpoint
+
+CHECKPOINT_FRAME_LIMIT = 64
+CHECKPOINT_INTERVAL = 2.0
+
+
+def get_checkpoint_path(target_path : str) -> str:
+	return os.path.join(get_temp_directory_path(target_path), 'checkpoint.json')
+
+
+def create_args_hash(target_path : str) -> Optional[str]:
+	step_args =\
+	{
+		key: state_manager.get_item(key) for key in job_store.get_step_keys() #type:ignore[arg-type]
+	}
+
+	if step_args and is_file(target_path):
+		step_args['target_stat'] = collect_file_stat(target_path)
+		step_args['source_stats'] = [ collect_file_stat(source_path) for source_path in state_manager.get_item('source_paths') or [] ]
+		return create_hash(json.dumps(step_args, sort_keys = True, default = str).encode())
+	return None
+
+
+def read_checkpoint(target_path : str) -> Optional[Checkpoint]:
+	args_hash = create_args_hash(target_path)
+
+	if args_hash:
+		checkpoint = read_json(get_checkpoint_path(target_path))
+		if checkpoint and checkpoint.get('args_hash') == args_hash:
+			return checkpoint #type:ignore[return-value]
+	return None
+
+
+def write_checkpoint(target_path : str, checkpoint : Checkpoint) -> bool:
+	checkpoint_path = get_checkpoint_path(target_path)
+	temp_checkpoint_path = checkpoint_path + '.tmp'
+
+	if write_json(temp_checkpoint_path, checkpoint): #type:ignore[arg-type]
+		os.replace(temp_checkpoint_path, checkpoint_path)
+		return is_file(checkpoint_path)
+	return False
+
+
+def create_checkpoint(target_path : str) -> bool:
+	args_hash = create_args_hash(target_path)
+
+	if args_hash:
+		checkpoint : Checkpoint =\
+		{
+			'args_hash': args_hash,
+			'frame_total': 0,
+			'processed_frames': {}
+		}
+		return write_checkpoint(target_path, checkpoint)
+	remove_file(get_checkpoint_path(target_path))
+	return False
+
+
+def has_extracted_frames(target_path : str) -> bool:
+	checkpoint = read_checkpoint(target_path)
+	return bool(checkpoint and checkpoint.get('frame_total') and checkpoint.get('frame_total') == len(get_temp_frame_paths(target_path)))
+
+
+def set_extracted_frames(target_path : str) -> bool:
+	checkpoint = read_checkpoint(target_path)
+
+	if checkpoint:
+		checkpoint['frame_total'] = len(get_temp_frame_paths(target_path))
+		checkpoint['processed_frames'] = {}
+		return write_checkpoint(target_path, checkpoint)
+	return False
+
+
+def get_processed_frames(target_path : str, step_name : str) -> List[int]:
+	checkpoint = read_checkpoint(target_path)
+
+	if checkpoint:
+		return checkpoint.get('processed_frames').get(step_name, [])
+	return []
+
+
+def set_processed_frames(target_path : str, step_name : str, processed_frames : Set[int]) -> bool:
+	checkpoint = read_checkpoint(target_path)
+
+	if checkpoint:
+		checkpoint['processed_frames'][step_name] = sorted(processed_frames)
+		return write_checkpoint(target_path, checkpoint)
+	return False
@@ -1,15 +1,18 @@
+import subprocess
 from functools import lru_cache
+from typing import List
 
 import cv2
 import numpy
 from tqdm import tqdm
 
-from facefusion import inference_manager, state_manager, wording
+from facefusion import inference_manager, logger, state_manager, wording
 from facefusion.download import conditional_download_hashes, conditional_download_sources
+from facefusion.ffmpeg import open_sample_decoder
 from facefusion.filesystem import resolve_relative_path
-from facefusion.thread_helper import conditional_thread_semaphore
+from facefusion.inference_manager import has_dynamic_batch
 from facefusion.typing import Fps, InferencePool, ModelOptions, ModelSet, VisionFrame
-from facefusion.vision import count_video_frame_total, detect_video_fps, get_video_frame, read_image
+from facefusion.vision import count_video_frame_total, detect_video_fps, pack_resolution, read_image
 
 MODEL_SET : ModelSet =\
 {
@@ -37,6 +40,7 @@ MODEL_SET : ModelSet =\
 }
 PROBABILITY_LIMIT = 0.80
 RATE_LIMIT = 10
+SAMPLE_BATCH_SIZE = 16
 STREAM_COUNTER = 0
 
 
@@ -80,15 +84,26 @@ def analyse_frame(vision_frame : VisionFrame) -> bool:
 def forward(vision_frame : VisionFrame) -> float:
 	content_analyser = get_inference_pool().get('content_analyser')
 
-	with conditional_thread_semaphore():
-		probability = content_analyser.run(None,
-		{
-			'input': vision_frame
-		})[0][0][1]
+	probability = inference_manager.run_inference(content_analyser,
+	{
+		'input': vision_frame
+	})[0][0][1]
 
 	return probability
 
 
+def forward_frames(vision_frames : VisionFrame) -> List[float]:
+	content_analyser = get_inference_pool().get('content_analyser')
+
+	if has_dynamic_batch(content_analyser):
+		probabilities = inference_manager.run_inference(content_analyser,
+		{
+			'input': vision_frames
+		})[0][:, 1]
+		return probabilities.tolist()
+	return [ forward(vision_frame[numpy.newaxis]) for vision_frame in vision_frames ]
+
+
 def prepare_frame(vision_frame : VisionFrame) -> VisionFrame:
 	model_size = get_model_options().get('size')
 	model_mean = get_model_options().get('mean')
@@ -109,16 +124,54 @@ def analyse_video(video_path : str, start_frame : int, end_frame : int) -> bool:
 	video_frame_total = count_video_frame_total(video_path)
 	video_fps = detect_video_fps(video_path)
 	frame_range = range(start_frame or 0, end_frame or video_frame_total)
+	sample_interval = int(video_fps)
+	sample_total = len(range(-(-frame_range.start // sample_interval) * sample_interval, frame_range.stop, sample_interval))
+	sample_limit = RATE_LIMIT * len(frame_range) / (sample_interval * 100)
+	sample_counter = 0
 	rate = 0.0
 	counter = 0
 
 	with tqdm(total = len(frame_range), desc = wording.get('analysing'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
-		for frame_number in frame_range:
-			if frame_number % int(video_fps) == 0:
-				frame = get_video_frame(video_path, frame_number)
-				if analyse_frame(frame):
-					counter += 1
-			rate = counter * int(video_fps) / len(frame_range) * 100
-			progress.update()
-			progress.set_postfix(rate = rate)
+		if sample_total > sample_limit:
+			video_decoder = open_sample_decoder(video_path, frame_range.start, frame_range.stop, sample_interval, pack_resolution(get_model_options().get('size')))
+
+			try:
+				while counter <= sample_limit < counter + sample_total - sample_counter:
+					vision_frames = read_sample_frames(video_decoder, SAMPLE_BATCH_SIZE)
+					if not vision_frames.size:
+						if video_decoder.wait() == 0:
+							rate = counter / max(sample_counter, 1) * 100
+							break
+						logger.error(wording.get('analysing_video_failed'), __name__)
+						return True
+					for probability in forward_frames(prepare_frames(vision_frames)):
+						if probability > PROBABILITY_LIMIT:
+							counter += 1
+					sample_counter += vision_frames.shape[0]
+					rate = counter * sample_interval / len(frame_range) * 100
+					progress.update(min(vision_frames.shape[0] * sample_interval, progress.total - progress.n))
+					progress.set_postfix(rate = rate)
+			finally:
+				close_sample_decoder(video_decoder)
 	return rate > RATE_LIMIT
+
+
+def prepare_frames(vision_frames : VisionFrame) -> VisionFrame:
+	model_mean = get_model_options().get('mean')
+	vision_frames = vision_frames.astype(numpy.float32)
+	vision_frames -= numpy.array(model_mean).astype(numpy.float32)
+	return vision_frames
+
+
+def read_sample_frames(video_decoder : subprocess.Popen[bytes], sample_batch_size : int) -> VisionFrame:
+	model_width, model_height = get_model_options().get('size')
+	frame_size = model_width * model_height * 3
+	frame_buffer = video_decoder.stdout.read(frame_size * sample_batch_size)
+	frame_total = len(frame_buffer) // frame_size
+	return numpy.frombuffer(frame_buffer[:frame_total * frame_size], dtype = numpy.uint8).reshape(frame_total, model_height, model_width, 3)
+
+
+def close_sample_decoder(video_decoder : subprocess.Popen[bytes]) -> None:
+	video_decoder.stdout.close()
+	video_decoder.terminate()
+	video_decoder.wait()
@@ -1,12 +1,17 @@
+import multiprocessing
 import shutil
 import signal
 import sys
-from time import time
+from multiprocessing.pool import AsyncResult
+from time import sleep, time
+from typing import List, Union
 
 import numpy
 
 from facefusion import content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, logger, process_manager, state_manager, voice_extractor, wording
+from facefusion.app_context import bind_app_context
 from facefusion.args import apply_args, collect_job_args, reduce_step_args
+from facefusion.checkpoint import create_checkpoint, has_extracted_frames, read_checkpoint, set_extracted_frames
 from facefusion.common_helper import get_first
 from facefusion.content_analyser import analyse_image, analyse_video
 from facefusion.download import conditional_download_hashes, conditional_download_sources
@@ -14,18 +19,20 @@ from facefusion.exit_helper import conditional_exit, graceful_exit, hard_exit
 from facefusion.face_analyser import get_average_face, get_many_faces, get_one_face
 from facefusion.face_selector import sort_and_filter_faces
 from facefusion.face_store import append_reference_face, clear_reference_faces, get_reference_faces
-from facefusion.ffmpeg import copy_image, extract_frames, finalize_image, merge_video, replace_audio, restore_audio
-from facefusion.filesystem import filter_audio_paths, is_image, is_video, list_directory, resolve_relative_path
+from facefusion.face_tracker import clear_face_tracks
+from facefusion.ffmpeg import calc_video_segments, concat_video, copy_image, detect_keyframe_numbers, extract_frames, finalize_image, merge_video, replace_audio, restore_audio
+from facefusion.filesystem import filter_audio_paths, is_image, is_video, link_file, list_directory, resolve_relative_path
 from facefusion.jobs import job_helper, job_manager, job_runner
 from facefusion.jobs.job_list import compose_job_list
 from facefusion.memory import limit_system_memory
-from facefusion.processors.core import get_processors_modules
+from facefusion.processors.core import get_processors_modules, init_process, multi_process_chain, multi_process_stream
+from facefusion.processors.typing import ProcessorState
 from facefusion.program import create_program
 from facefusion.program_helper import validate_args
 from facefusion.statistics import conditional_log_statistics
-from facefusion.temp_helper import clear_temp_directory, create_temp_directory, get_temp_file_path, get_temp_frame_paths, move_temp_file
-from facefusion.typing import Args, ErrorCode
-from facefusion.vision import get_video_frame, pack_resolution, read_image, read_static_images, restrict_image_resolution, restrict_video_fps, restrict_video_resolution, unpack_resolution
+from facefusion.temp_helper import clear_temp_directory, create_temp_directory, get_temp_file_path, get_temp_frame_paths, get_temp_segment_path, move_temp_file
+from facefusion.typing import Args, ErrorCode, State, VideoSegment
+from facefusion.vision import count_video_frame_total, get_video_frame, pack_resolution, read_image, read_static_images, restrict_image_resolution, restrict_video_fps, restrict_video_resolution, unpack_resolution
 
 
 def cli() -> None:
@@ -67,11 +74,13 @@ def route(args : Args) -> None:
 				return conditional_exit(2)
 		ui.launch()
 	if state_manager.get_item('command') == 'headless-run':
+		bind_app_context('cli')
 		if not job_manager.init_jobs(state_manager.get_item('jobs_path')):
 			hard_exit(1)
 		error_core = process_headless(args)
 		hard_exit(error_core)
 	if state_manager.get_item('command') in [ 'job-run', 'job-run-all', 'job-retry', 'job-retry-all' ]:
+		bind_app_context('cli')
 		if not job_manager.init_jobs(state_manager.get_item('jobs_path')):
 			hard_exit(1)
 		error_code = route_job_runner()
@@ -281,6 +290,7 @@ def route_job_runner() -> ErrorCode:
 
 def process_step(job_id : str, step_index : int, step_args : Args) -> bool:
 	clear_reference_faces()
+	clear_face_tracks()
 	step_total = job_manager.count_step_total(job_id)
 	step_args.update(collect_job_args())
 	apply_args(step_args, state_manager.set_item)
@@ -354,50 +364,89 @@ def process_image(start_time : float) -> ErrorCode:
 def process_video(start_time : float) -> ErrorCode:
 	if analyse_video(state_manager.get_item('target_path'), state_manager.get_item('trim_frame_start'), state_manager.get_item('trim_frame_end')):
 		return 3
-	# clear temp
-	logger.debug(wording.get('clearing_temp'), __name__)
-	clear_temp_directory(state_manager.get_item('target_path'))
-	# create temp
-	logger.debug(wording.get('creating_temp'), __name__)
-	create_temp_directory(state_manager.get_item('target_path'))
-	# extract frames
+	if read_checkpoint(state_manager.get_item('target_path')):
+		logger.info(wording.get('resuming_checkpoint'), __name__)
+	else:
+		# clear temp
+		logger.debug(wording.get('clearing_temp'), __name__)
+		clear_temp_directory(state_manager.get_item('target_path'))
+		# create temp
+		logger.debug(wording.get('creating_temp'), __name__)
+		create_temp_directory(state_manager.get_item('target_path'))
+		create_checkpoint(state_manager.get_item('target_path'))
 	process_manager.start()
 	temp_video_resolution = pack_resolution(restrict_video_resolution(state_manager.get_item('target_path'), unpack_resolution(state_manager.get_item('output_video_resolution'))))
 	temp_video_fps = restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
-	logger.info(wording.get('extracting_frames').format(resolution = temp_video_resolution, fps = temp_video_fps), __name__)
-	if extract_frames(state_manager.get_item('target_path'), temp_video_resolution, temp_video_fps):
-		logger.debug(wording.get('extracting_frames_succeed'), __name__)
-	else:
-		if is_process_stopping():
+	if state_manager.get_item('video_segment_count') > 1:
+		# process segments
+		video_segments = create_video_segments(state_manager.get_item('target_path'), state_manager.get_item('video_segment_count'))
+		logger.info(wording.get('processing_segments').format(segment_total = len(video_segments)), __name__)
+		if multi_process_segments(state_manager.get_item('target_path'), video_segments):
+			logger.debug(wording.get('processing_segments_succeed'), __name__)
+		else:
+			if is_process_stopping():
+				process_manager.end()
+				return 4
+			logger.error(wording.get('processing_segments_failed'), __name__)
 			process_manager.end()
-			return 4
-		logger.error(wording.get('extracting_frames_failed'), __name__)
-		process_manager.end()
-		return 1
-	# process frames
-	temp_frame_paths = get_temp_frame_paths(state_manager.get_item('target_path'))
-	if temp_frame_paths:
-		for processor_module in get_processors_modules(state_manager.get_item('processors')):
-			logger.info(wording.get('processing'), processor_module.__name__)
-			processor_module.process_video(state_manager.get_item('source_paths'), temp_frame_paths)
-			processor_module.post_process()
-		if is_process_stopping():
-			return 4
-	else:
-		logger.error(wording.get('temp_frames_not_found'), __name__)
-		process_manager.end()
-		return 1
-	# merge video
-	logger.info(wording.get('merging_video').format(resolution = state_manager.get_item('output_video_resolution'), fps = state_manager.get_item('output_video_fps')), __name__)
-	if merge_video(state_manager.get_item('target_path'), state_manager.get_item('output_video_resolution'), state_manager.get_item('output_video_fps')):
-		logger.debug(wording.get('merging_video_succeed'), __name__)
+			return 1
+	elif state_manager.get_item('pipeline_mode') == 'stream':
+		# stream frames
+		logger.info(wording.get('streaming_frames').format(resolution = temp_video_resolution, fps = temp_video_fps), __name__)
+		if multi_process_stream(state_manager.get_item('source_paths'), state_manager.get_item('target_path'), temp_video_resolution, temp_video_fps):
+			logger.debug(wording.get('streaming_frames_succeed'), __name__)
+		else:
+			if is_process_stopping():
+				process_manager.end()
+				return 4
+			logger.error(wording.get('streaming_frames_failed'), __name__)
+			process_manager.end()
+			return 1
 	else:
-		if is_process_stopping():
+		# extract frames
+		if has_extracted_frames(state_manager.get_item('target_path')):
+			logger.info(wording.get('extracting_frames_skipped'), __name__)
+		else:
+			logger.info(wording.get('extracting_frames').format(resolution = temp_video_resolution, fps = temp_video_fps), __name__)
+			if extract_frames(state_manager.get_item('target_path'), temp_video_resolution, temp_video_fps):
+				set_extracted_frames(state_manager.get_item('target_path'))
+				logger.debug(wording.get('extracting_frames_succeed'), __name__)
+			else:
+				if is_process_stopping():
+					process_manager.end()
+					return 4
+				logger.error(wording.get('extracting_frames_failed'), __name__)
+				process_manager.end()
+				return 1
+		# process frames
+		temp_frame_paths = get_temp_frame_paths(state_manager.get_item('target_path'))
+		is_video_merged = False
+		if temp_frame_paths:
+			if state_manager.get_item('pipeline_mode') == 'fused':
+				logger.info(wording.get('processing'), __name__)
+				is_video_merged = multi_process_chain(state_manager.get_item('source_paths'), state_manager.get_item('target_path'), temp_frame_paths)
+			else:
+				for processor_module in get_processors_modules(state_manager.get_item('processors')):
+					logger.info(wording.get('processing'), processor_module.__name__)
+					processor_module.process_video(state_manager.get_item('source_paths'), temp_frame_paths)
+					processor_module.post_process()
+			if is_process_stopping():
+				return 4
+		else:
+			logger.error(wording.get('temp_frames_not_found'), __name__)
 			process_manager.end()
-			return 4
-		logger.error(wording.get('merging_video_failed'), __name__)
-		process_manager.end()
-		return 1
+			return 1
+		# merge video
+		logger.info(wording.get('merging_video').format(resolution = state_manager.get_item('output_video_resolution'), fps = state_manager.get_item('output_video_fps')), __name__)
+		if is_video_merged or merge_video(state_manager.get_item('target_path'), state_manager.get_item('output_video_resolution'), state_manager.get_item('output_video_fps')):
+			logger.debug(wording.get('merging_video_succeed'), __name__)
+		else:
+			if is_process_stopping():
+				process_manager.end()
+				return 4
+			logger.error(wording.get('merging_video_failed'), __name__)
+			process_manager.end()
+			return 1
 	# handle audio
 	if state_manager.get_item('skip_audio'):
 		logger.info(wording.get('skipping_audio'), __name__)
@@ -438,6 +487,57 @@ def process_video(start_time : float) -> ErrorCode:
 	return 0
 
 
+def create_video_segments(target_path : str, video_segment_count : int) -> List[VideoSegment]:
+	trim_frame_start = state_manager.get_item('trim_frame_start') or 0
+	trim_frame_end = state_manager.get_item('trim_frame_end') or count_video_frame_total(target_path)
+	keyframe_numbers = detect_keyframe_numbers(target_path)
+	return calc_video_segments(keyframe_numbers, trim_frame_start, trim_frame_end, video_segment_count)
+
+
+def multi_process_segments(target_path : str, video_segments : List[VideoSegment]) -> bool:
+	segment_output_paths = []
+
+	with multiprocessing.get_context('spawn').Pool(processes = len(video_segments)) as pool:
+		segment_results = []
+
+		for segment_index, (trim_frame_start, trim_frame_end) in enumerate(video_segments):
+			segment_name = 'segment-' + str(segment_index).zfill(3)
+			segment_target_path = get_temp_segment_path(target_path, segment_name)
+			segment_output_path = get_temp_segment_path(target_path, segment_name + '-output')
+
+			if link_file(target_path, segment_target_path):
+				segment_output_paths.append(segment_output_path)
+				segment_results.append(pool.apply_async(process_segment, (state_manager.get_state(), segment_target_path, segment_output_path, trim_frame_start, trim_frame_end)))
+
+		while not all(segment_result.ready() for segment_result in segment_results) and process_manager.is_processing():
+			sleep(0.5)
+
+		if process_manager.is_processing() and len(segment_results) == len(video_segments) and all(get_segment_error_code(segment_result) == 0 for segment_result in segment_results):
+			return concat_video(get_temp_file_path(target_path), segment_output_paths)
+	return False
+
+
+def get_segment_error_code(segment_result : AsyncResult[ErrorCode]) -> ErrorCode:
+	try:
+		return segment_result.get()
+	except Exception as exception:
+		logger.error(wording.get('processing_segment_failed').format(exception = exception), __name__)
+		return 1
+
+
+def process_segment(state : Union[State, ProcessorState], segment_target_path : str, segment_output_path : str, trim_frame_start : int, trim_frame_end : int) -> ErrorCode:
+	init_process(state, None)
+	state_manager.init_item('target_path', segment_target_path)
+	state_manager.init_item('output_path', segment_output_path)
+	state_manager.init_item('video_segment_offset', trim_frame_start - (state_manager.get_item('trim_frame_start') or 0))
+	state_manager.init_item('trim_frame_start', trim_frame_start)
+	state_manager.init_item('trim_frame_end', trim_frame_end)
+	state_manager.init_item('skip_audio', True)
+	state_manager.init_item('video_segment_count', 1)
+	state_manager.init_item('execution_backend', 'thread')
+	return conditional_process()
+
+
 def is_process_stopping() -> bool:
 	if process_manager.is_stopping():
 		process_manager.end()
@@ -19,6 +19,6 @@ def graceful_exit(error_code : ErrorCode) -> None:
 	process_manager.stop()
 	while process_manager.is_processing():
 		sleep(0.5)
-	if state_manager.get_item('target_path'):
+	if state_manager.get_item('target_path') and state_manager.get_item('command') not in [ 'job-run', 'job-run-all', 'job-retry', 'job-retry-all' ]:
 		clear_temp_directory(state_manager.get_item('target_path'))
 	hard_exit(error_code)
@@ -1,20 +1,138 @@
-from typing import List, Optional
+import threading
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy
 
-from facefusion import state_manager
+from facefusion import face_classifier, face_recognizer, state_manager
 from facefusion.common_helper import get_first
-from facefusion.face_classifier import classify_face
 from facefusion.face_detector import detect_faces, detect_rotated_faces
 from facefusion.face_helper import apply_nms, convert_to_face_landmark_5, estimate_face_angle, get_nms_threshold
 from facefusion.face_landmarker import detect_face_landmarks, estimate_face_landmark_68_5
-from facefusion.face_recognizer import calc_embedding
-from facefusion.face_store import get_static_faces, set_static_faces
-from facefusion.typing import BoundingBox, Face, FaceLandmark5, FaceLandmarkSet, FaceScoreSet, Score, VisionFrame
+from facefusion.face_store import create_frame_hash, find_static_faces, store_static_faces
+from facefusion.face_tracker import get_track_frame_number, set_face_track, track_faces
+from facefusion.typing import Age, Angle, BoundingBox, BoundingBoxes, Embedding, Face, FaceLandmarkSet, FaceLandmarks5, FaceScoreSet, Gender, Race, Scores, VisionFrame
 
 
-def create_faces(vision_frame : VisionFrame, bounding_boxes : List[BoundingBox], face_scores : List[Score], face_landmarks_5 : List[FaceLandmark5]) -> List[Face]:
-	faces = []
+class LazyFace(Face):
+	@property
+	def embedding(self) -> Embedding:
+		return get_face_item(self, 'embedding')
+
+	@property
+	def normed_embedding(self) -> Embedding:
+		return get_face_item(self, 'normed_embedding')
+
+	@property
+	def gender(self) -> Gender:
+		return get_face_item(self, 'gender')
+
+	@property
+	def age(self) -> Age:
+		return get_face_item(self, 'age')
+
+	@property
+	def race(self) -> Race:
+		return get_face_item(self, 'race')
+
+	def _replace(self, **kwargs : Any) -> 'LazyFace':
+		face = super()._replace(**kwargs)
+		face.__dict__.update(self.__dict__)
+		return face
+
+	def __getstate__(self) -> Dict[str, Any]:
+		return { key: value for key, value in self.__dict__.items() if key not in [ 'face_lock', 'vision_frame' ] }
+
+
+def create_lazy_face(bounding_box : BoundingBox, face_score_set : FaceScoreSet, face_landmark_set : FaceLandmarkSet, face_angle : Angle) -> LazyFace:
+	return LazyFace(
+		bounding_box = bounding_box,
+		score_set = face_score_set,
+		landmark_set = face_landmark_set,
+		angle = face_angle,
+		embedding = None,
+		normed_embedding = None,
+		gender = None,
+		age = None,
+		race = None
+	)
+
+
+def bind_face_group(vision_frame : VisionFrame, faces : List[Face]) -> None:
+	face_lock = threading.Lock()
+
+	for face in faces:
+		if isinstance(face, LazyFace):
+			face.__dict__['face_group'] = faces
+			face.__dict__['face_lock'] = face_lock
+			face.__dict__['vision_frame'] = weakref.ref(vision_frame)
+
+
+def bind_face_frame(vision_frame : VisionFrame, faces : List[Face]) -> None:
+	for face in faces:
+		if isinstance(face, LazyFace) and get_face_frame(face) is None:
+			bind_face_group(vision_frame, faces)
+			return
+
+
+def get_face_frame(face : LazyFace) -> Optional[VisionFrame]:
+	if 'face_lock' in face.__dict__:
+		return face.__dict__.get('vision_frame')()
+	return None
+
+
+def get_face_item(face : LazyFace, name : str) -> Any:
+	face_item = face[face._fields.index(name)]
+
+	if face_item is None:
+		if name in [ 'embedding', 'normed_embedding' ]:
+			embedding, normed_embedding = load_face_embedding(face)
+			face_item = embedding if name == 'embedding' else normed_embedding
+		if name in [ 'gender', 'age', 'race' ]:
+			gender, age, race = load_face_classification(face)
+			face_item = gender if name == 'gender' else age if name == 'age' else race
+	return face_item
+
+
+def load_face_embedding(face : LazyFace) -> Tuple[Embedding, Embedding]:
+	if 'embedding_set' not in face.__dict__ and 'face_lock' in face.__dict__:
+		with face.__dict__.get('face_lock'):
+			vision_frame = get_face_frame(face)
+
+			if 'embedding_set' not in face.__dict__ and vision_frame is not None:
+				lazy_faces = collect_lazy_faces(face, 'embedding_set')
+				embedding_sets = face_recognizer.calc_crop_embeddings([ face_recognizer.warp_face(vision_frame, lazy_face.landmark_set.get('5/68')) for lazy_face in lazy_faces ])
+
+				for lazy_face, embedding_set in zip(lazy_faces, embedding_sets):
+					lazy_face.__dict__['embedding_set'] = embedding_set
+	return face.__dict__.get('embedding_set', (None, None))
+
+
+def load_face_classification(face : LazyFace) -> Tuple[Gender, Age, Race]:
+	if 'classification_set' not in face.__dict__ and 'face_lock' in face.__dict__:
+		with face.__dict__.get('face_lock'):
+			vision_frame = get_face_frame(face)
+
+			if 'classification_set' not in face.__dict__ and vision_frame is not None:
+				lazy_faces = collect_lazy_faces(face, 'classification_set')
+				classification_sets = face_classifier.classify_crop_faces([ face_classifier.warp_face(vision_frame, lazy_face.landmark_set.get('5/68')) for lazy_face in lazy_faces ])
+
+				for lazy_face, classification_set in zip(lazy_faces, classification_sets):
+					lazy_face.__dict__['classification_set'] = classification_set
+	return face.__dict__.get('classification_set', (None, None, None))
+
+
+def collect_lazy_faces(face : LazyFace, name : str) -> List[LazyFace]:
+	lazy_faces = [ face ]
+
+	for lazy_face in face.__dict__.get('face_group', []):
+		if lazy_face is not face and name not in lazy_face.__dict__ and lazy_face.__dict__.get('face_lock') is face.__dict__.get('face_lock'):
+			lazy_faces.append(lazy_face)
+	return lazy_faces
+
+
+def create_faces(vision_frame : VisionFrame, bounding_boxes : BoundingBoxes, face_scores : Scores, face_landmarks_5 : FaceLandmarks5) -> List[Face]:
+	faces : List[Face] = []
 	nms_threshold = get_nms_threshold(state_manager.get_item('face_detector_model'), state_manager.get_item('face_detector_angles'))
 	keep_indices = apply_nms(bounding_boxes, face_scores, state_manager.get_item('face_detector_score'), nms_threshold)
 
@@ -45,19 +163,9 @@ def create_faces(vision_frame : VisionFrame, bounding_boxes : List[BoundingBox],
 			'detector': face_score,
 			'landmarker': face_landmark_score_68
 		}
-		embedding, normed_embedding = calc_embedding(vision_frame, face_landmark_set.get('5/68'))
-		gender, age, race = classify_face(vision_frame, face_landmark_set.get('5/68'))
-		faces.append(Face(
-			bounding_box = bounding_box,
-			score_set = face_score_set,
-			landmark_set = face_landmark_set,
-			angle = face_angle,
-			embedding = embedding,
-			normed_embedding = normed_embedding,
-			gender = gender,
-			age = age,
-			race = race
-		))
+		faces.append(create_lazy_face(bounding_box, face_score_set, face_landmark_set, face_angle))
+
+	bind_face_group(vision_frame, faces)
 	return faces
 
 
@@ -95,30 +203,46 @@ def get_average_face(faces : List[Face]) -> Optional[Face]:
 
 def get_many_faces(vision_frames : List[VisionFrame]) -> List[Face]:
 	many_faces : List[Face] = []
+	track_frame_number = get_track_frame_number() if len(vision_frames) == 1 else None
 
 	for vision_frame in vision_frames:
-		if numpy.any(vision_frame):
-			static_faces = get_static_faces(vision_frame)
+		frame_hash = create_frame_hash(vision_frame)
+
+		if frame_hash:
+			static_faces = find_static_faces(frame_hash)
 			if static_faces:
+				bind_face_frame(vision_frame, static_faces)
 				many_faces.extend(static_faces)
 			else:
-				all_bounding_boxes = []
-				all_face_scores = []
-				all_face_landmarks_5 = []
-
-				for face_detector_angle in state_manager.get_item('face_detector_angles'):
-					if face_detector_angle == 0:
-						bounding_boxes, face_scores, face_landmarks_5 = detect_faces(vision_frame)
-					else:
-						bounding_boxes, face_scores, face_landmarks_5 = detect_rotated_faces(vision_frame, face_detector_angle)
-					all_bounding_boxes.extend(bounding_boxes)
-					all_face_scores.extend(face_scores)
-					all_face_landmarks_5.extend(face_landmarks_5)
-
-				if all_bounding_boxes and all_face_scores and all_face_landmarks_5 and state_manager.get_item('face_detector_score') > 0:
-					faces = create_faces(vision_frame, all_bounding_boxes, all_face_scores, all_face_landmarks_5)
-
-					if faces:
-						many_faces.extend(faces)
-						set_static_faces(vision_frame, faces)
+				faces = track_faces(vision_frame, track_frame_number) if track_frame_number is not None and state_manager.get_item('face_tracker_interval') > 1 else None
+
+				if faces is None:
+					faces = detect_many_faces(vision_frame)
+					if track_frame_number is not None and state_manager.get_item('face_tracker_interval') > 1:
+						set_face_track(track_frame_number, vision_frame, faces, 0)
+				else:
+					bind_face_group(vision_frame, faces)
+
+				if faces:
+					many_faces.extend(faces)
+					store_static_faces(frame_hash, faces)
 	return many_faces
+
+
+def detect_many_faces(vision_frame : VisionFrame) -> List[Face]:
+	all_bounding_boxes = numpy.empty((0, 4))
+	all_face_scores = numpy.empty(0)
+	all_face_landmarks_5 = numpy.empty((0, 5, 2))
+
+	for face_detector_angle in state_manager.get_item('face_detector_angles'):
+		if face_detector_angle == 0:
+			bounding_boxes, face_scores, face_landmarks_5 = detect_faces(vision_frame)
+		else:
+			bounding_boxes, face_scores, face_landmarks_5 = detect_rotated_faces(vision_frame, face_detector_angle)
+		all_bounding_boxes = numpy.concatenate([ all_bounding_boxes, bounding_boxes ])
+		all_face_scores = numpy.concatenate([ all_face_scores, face_scores ])
+		all_face_landmarks_5 = numpy.concatenate([ all_face_landmarks_5, face_landmarks_5 ])
+
+	if all_face_scores.size and state_manager.get_item('face_detector_score') > 0:
+		return create_faces(vision_frame, all_bounding_boxes, all_face_scores, all_face_landmarks_5)
+	return []
@@ -6,7 +6,6 @@ from facefusion import inference_manager
 from facefusion.download import conditional_download_hashes, conditional_download_sources
 from facefusion.face_helper import warp_face_by_face_landmark_5
 from facefusion.filesystem import resolve_relative_path
-from facefusion.thread_helper import conditional_thread_semaphore
 from facefusion.typing import Age, FaceLandmark5, Gender, InferencePool, ModelOptions, ModelSet, Race, VisionFrame
 
 MODEL_SET : ModelSet =\
@@ -59,33 +58,72 @@ def pre_check() -> bool:
 
 
 def classify_face(temp_vision_frame : VisionFrame, face_landmark_5 : FaceLandmark5) -> Tuple[Gender, Age, Race]:
+	crop_vision_frame = warp_face(temp_vision_frame, face_landmark_5)
+	return classify_crop_face(crop_vision_frame)
+
+
+def classify_faces(temp_vision_frame : VisionFrame, face_landmarks_5 : List[FaceLandmark5]) -> List[Tuple[Gender, Age, Race]]:
+	crop_vision_frames = [ warp_face(temp_vision_frame, face_landmark_5) for face_landmark_5 in face_landmarks_5 ]
+	return classify_crop_faces(crop_vision_frames)
+
+
+def warp_face(temp_vision_frame : VisionFrame, face_landmark_5 : FaceLandmark5) -> VisionFrame:
 	model_template = get_model_options().get('template')
 	model_size = get_model_options().get('size')
+	crop_vision_frame, _ = warp_face_by_face_landmark_5(temp_vision_frame, face_landmark_5, model_template, model_size)
+	return crop_vision_frame
+
+
+def classify_crop_face(crop_vision_frame : VisionFrame) -> Tuple[Gender, Age, Race]:
+	return classify_crop_faces([ crop_vision_frame ])[0]
+
+
+def classify_crop_faces(crop_vision_frames : List[VisionFrame]) -> List[Tuple[Gender, Age, Race]]:
+	classification_sets = []
+
+	if crop_vision_frames:
+		crop_vision_frame = numpy.stack([ prepare_crop_frame(crop_vision_frame) for crop_vision_frame in crop_vision_frames ])
+		gender_ids, age_ids, race_ids = forward(crop_vision_frame)
+
+		for gender_id, age_id, race_id in zip(gender_ids, age_ids, race_ids):
+			gender = categorize_gender(gender_id)
+			age = categorize_age(age_id)
+			race = categorize_race(race_id)
+			classification_sets.append((gender, age, race))
+	return classification_sets
+
+
+def prepare_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
 	model_mean = get_model_options().get('mean')
 	model_standard_deviation = get_model_options().get('standard_deviation')
-	crop_vision_frame, _ = warp_face_by_face_landmark_5(temp_vision_frame, face_landmark_5, model_template, model_size)
 	crop_vision_frame = crop_vision_frame.astype(numpy.float32)[:, :, ::-1] / 255
 	crop_vision_frame -= model_mean
 	crop_vision_frame /= model_standard_deviation
 	crop_vision_frame = crop_vision_frame.transpose(2, 0, 1)
-	crop_vision_frame = numpy.expand_dims(crop_vision_frame, axis = 0)
-	gender_id, age_id, race_id = forward(crop_vision_frame)
-	gender = categorize_gender(gender_id[0])
-	age = categorize_age(age_id[0])
-	race = categorize_race(race_id[0])
-	return gender, age, race
+	return crop_vision_frame
 
 
 def forward(crop_vision_frame : VisionFrame) -> Tuple[List[int], List[int], List[int]]:
 	face_classifier = get_inference_pool().get('face_classifier')
 
-	with conditional_thread_semaphore():
-		race_id, gender_id, age_id = face_classifier.run(None,
+	if inference_manager.has_dynamic_batch(face_classifier):
+		race_ids, gender_ids, age_ids = inference_manager.run_inference(face_classifier,
 		{
 			'input': crop_vision_frame
 		})
+		return gender_ids, age_ids, race_ids
+
+	gender_ids, age_ids, race_ids = [], [], []
 
-	return gender_id, age_id, race_id
+	for index in range(crop_vision_frame.shape[0]):
+		race_id, gender_id, age_id = inference_manager.run_inference(face_classifier,
+		{
+			'input': crop_vision_frame[index:index + 1]
+		})
+		gender_ids.extend(gender_id)
+		age_ids.extend(age_id)
+		race_ids.extend(race_id)
+	return gender_ids, age_ids, race_ids
 
 
 def categorize_gender(gender_id : int) -> Gender:
@@ -1,14 +1,14 @@
-from typing import List, Tuple
+from typing import Tuple
 
 import cv2
 import numpy
 
 from facefusion import inference_manager, state_manager
 from facefusion.download import conditional_download_hashes, conditional_download_sources
-from facefusion.face_helper import create_rotated_matrix_and_size, create_static_anchors, distance_to_bounding_box, distance_to_face_landmark_5, normalize_bounding_box, transform_bounding_box, transform_points
+from facefusion.face_helper import create_rotated_matrix_and_size, create_static_anchors, distance_to_bounding_box, distance_to_face_landmark_5, normalize_bounding_boxes, transform_bounding_boxes, transform_many_points
 from facefusion.filesystem import resolve_relative_path
 from facefusion.thread_helper import thread_semaphore
-from facefusion.typing import Angle, BoundingBox, Detection, DownloadSet, FaceLandmark5, InferencePool, ModelSet, Score, VisionFrame
+from facefusion.typing import Angle, BoundingBoxes, Detection, DownloadSet, FaceLandmarks5, InferencePool, ModelSet, Scores, VisionFrame
 from facefusion.vision import resize_frame_resolution, unpack_resolution
 
 MODEL_SET : ModelSet =\
@@ -107,47 +107,47 @@ def pre_check() -> bool:
 	return conditional_download_hashes(download_directory_path, model_hashes) and conditional_download_sources(download_directory_path, model_sources)
 
 
-def detect_faces(vision_frame : VisionFrame) -> Tuple[List[BoundingBox], List[Score], List[FaceLandmark5]]:
-	all_bounding_boxes : List[BoundingBox] = []
-	all_face_scores : List[Score] = []
-	all_face_landmarks_5 : List[FaceLandmark5] = []
+def detect_faces(vision_frame : VisionFrame) -> Tuple[BoundingBoxes, Scores, FaceLandmarks5]:
+	all_bounding_boxes = numpy.empty((0, 4))
+	all_face_scores = numpy.empty(0)
+	all_face_landmarks_5 = numpy.empty((0, 5, 2))
 
 	if state_manager.get_item('face_detector_model') in [ 'many', 'retinaface' ]:
 		bounding_boxes, face_scores, face_landmarks_5 = detect_with_retinaface(vision_frame, state_manager.get_item('face_detector_size'))
-		all_bounding_boxes.extend(bounding_boxes)
-		all_face_scores.extend(face_scores)
-		all_face_landmarks_5.extend(face_landmarks_5)
+		all_bounding_boxes = numpy.concatenate([ all_bounding_boxes, bounding_boxes ])
+		all_face_scores = numpy.concatenate([ all_face_scores, face_scores ])
+		all_face_landmarks_5 = numpy.concatenate([ all_face_landmarks_5, face_landmarks_5 ])
 
 	if state_manager.get_item('face_detector_model') in [ 'many', 'scrfd' ]:
 		bounding_boxes, face_scores, face_landmarks_5 = detect_with_scrfd(vision_frame, state_manager.get_item('face_detector_size'))
-		all_bounding_boxes.extend(bounding_boxes)
-		all_face_scores.extend(face_scores)
-		all_face_landmarks_5.extend(face_landmarks_5)
+		all_bounding_boxes = numpy.concatenate([ all_bounding_boxes, bounding_boxes ])
+		all_face_scores = numpy.concatenate([ all_face_scores, face_scores ])
+		all_face_landmarks_5 = numpy.concatenate([ all_face_landmarks_5, face_landmarks_5 ])
 
 	if state_manager.get_item('face_detector_model') in [ 'many', 'yoloface' ]:
 		bounding_boxes, face_scores, face_landmarks_5 = detect_with_yoloface(vision_frame, state_manager.get_item('face_detector_size'))
-		all_bounding_boxes.extend(bounding_boxes)
-		all_face_scores.extend(face_scores)
-		all_face_landmarks_5.extend(face_landmarks_5)
+		all_bounding_boxes = numpy.concatenate([ all_bounding_boxes, bounding_boxes ])
+		all_face_scores = numpy.concatenate([ all_face_scores, face_scores ])
+		all_face_landmarks_5 = numpy.concatenate([ all_face_landmarks_5, face_landmarks_5 ])
 
-	all_bounding_boxes = [ normalize_bounding_box(all_bounding_box) for all_bounding_box in all_bounding_boxes ]
+	all_bounding_boxes = normalize_bounding_boxes(all_bounding_boxes)
 	return all_bounding_boxes, all_face_scores, all_face_landmarks_5
 
 
-def detect_rotated_faces(vision_frame : VisionFrame, angle : Angle) -> Tuple[List[BoundingBox], List[Score], List[FaceLandmark5]]:
+def detect_rotated_faces(vision_frame : VisionFrame, angle : Angle) -> Tuple[BoundingBoxes, Scores, FaceLandmarks5]:
 	rotated_matrix, rotated_size = create_rotated_matrix_and_size(angle, vision_frame.shape[:2][::-1])
 	rotated_vision_frame = cv2.warpAffine(vision_frame, rotated_matrix, rotated_size)
 	rotated_inverse_matrix = cv2.invertAffineTransform(rotated_matrix)
 	bounding_boxes, face_scores, face_landmarks_5 = detect_faces(rotated_vision_frame)
-	bounding_boxes = [ transform_bounding_box(bounding_box, rotated_inverse_matrix) for bounding_box in bounding_boxes ]
-	face_landmarks_5 = [ transform_points(face_landmark_5, rotated_inverse_matrix) for face_landmark_5 in face_landmarks_5 ]
+	bounding_boxes = transform_bounding_boxes(bounding_boxes, rotated_inverse_matrix)
+	face_landmarks_5 = transform_many_points(face_landmarks_5, rotated_inverse_matrix)
 	return bounding_boxes, face_scores, face_landmarks_5
 
 
-def detect_with_retinaface(vision_frame : VisionFrame, face_detector_size : str) -> Tuple[List[BoundingBox], List[Score], List[FaceLandmark5]]:
-	bounding_boxes = []
-	face_scores = []
-	face_landmarks_5 = []
+def detect_with_retinaface(vision_frame : VisionFrame, face_detector_size : str) -> Tuple[BoundingBoxes, Scores, FaceLandmarks5]:
+	bounding_boxes = numpy.empty((0, 4))
+	face_scores = numpy.empty(0)
+	face_landmarks_5 = numpy.empty((0, 5, 2))
 	feature_strides = [ 8, 16, 32 ]
 	feature_map_channel = 3
 	anchor_total = 2
@@ -159,37 +159,25 @@ def detect_with_retinaface(vision_frame : VisionFrame, face_detector_size : str)
 	detection = forward_with_retinaface(detect_vision_frame)
 
 	for index, feature_stride in enumerate(feature_strides):
-		keep_indices = numpy.where(detection[index] >= state_manager.get_item('face_detector_score'))[0]
+		keep_indices = numpy.where(detection[index][:, 0] >= state_manager.get_item('face_detector_score'))[0]
 
-		if numpy.any(keep_indices):
+		if keep_indices.size:
 			stride_height = face_detector_height // feature_stride
 			stride_width = face_detector_width // feature_stride
-			anchors = create_static_anchors(feature_stride, anchor_total, stride_height, stride_width)
-			bounding_box_raw = detection[index + feature_map_channel] * feature_stride
-			face_landmark_5_raw = detection[index + feature_map_channel * 2] * feature_stride
-
-			for bounding_box in distance_to_bounding_box(anchors, bounding_box_raw)[keep_indices]:
-				bounding_boxes.append(numpy.array(
-				[
-					bounding_box[0] * ratio_width,
-					bounding_box[1] * ratio_height,
-					bounding_box[2] * ratio_width,
-					bounding_box[3] * ratio_height,
-				]))
-
-			for score in detection[index][keep_indices]:
-				face_scores.append(score[0])
-
-			for face_landmark_5 in distance_to_face_landmark_5(anchors, face_landmark_5_raw)[keep_indices]:
-				face_landmarks_5.append(face_landmark_5 * [ ratio_width, ratio_height ])
+			anchors = create_static_anchors(feature_stride, anchor_total, stride_height, stride_width)[keep_indices]
+			bounding_box_raw = detection[index + feature_map_channel][keep_indices] * feature_stride
+			face_landmark_5_raw = detection[index + feature_map_channel * 2][keep_indices] * feature_stride
+			bounding_boxes = numpy.concatenate([ bounding_boxes, distance_to_bounding_box(anchors, bounding_box_raw) * [ ratio_width, ratio_height, ratio_width, ratio_height ] ])
+			face_scores = numpy.concatenate([ face_scores, detection[index][keep_indices, 0] ])
+			face_landmarks_5 = numpy.concatenate([ face_landmarks_5, distance_to_face_landmark_5(anchors, face_landmark_5_raw) * [ ratio_width, ratio_height ] ])
 
 	return bounding_boxes, face_scores, face_landmarks_5
 
 
-def detect_with_scrfd(vision_frame : VisionFrame, face_detector_size : str) -> Tuple[List[BoundingBox], List[Score], List[FaceLandmark5]]:
-	bounding_boxes = []
-	face_scores = []
-	face_landmarks_5 = []
+def detect_with_scrfd(vision_frame : VisionFrame, face_detector_size : str) -> Tuple[BoundingBoxes, Scores, FaceLandmarks5]:
+	bounding_boxes = numpy.empty((0, 4))
+	face_scores = numpy.empty(0)
+	face_landmarks_5 = numpy.empty((0, 5, 2))
 	feature_strides = [ 8, 16, 32 ]
 	feature_map_channel = 3
 	anchor_total = 2
@@ -201,37 +189,22 @@ def detect_with_scrfd(vision_frame : VisionFrame, face_detector_size : str) -> T
 	detection = forward_with_scrfd(detect_vision_frame)
 
 	for index, feature_stride in enumerate(feature_strides):
-		keep_indices = numpy.where(detection[index] >= state_manager.get_item('face_detector_score'))[0]
+		keep_indices = numpy.where(detection[index][:, 0] >= state_manager.get_item('face_detector_score'))[0]
 
-		if numpy.any(keep_indices):
+		if keep_indices.size:
 			stride_height = face_detector_height // feature_stride
 			stride_width = face_detector_width // feature_stride
-			anchors = create_static_anchors(feature_stride, anchor_total, stride_height, stride_width)
-			bounding_box_raw = detection[index + feature_map_channel] * feature_stride
-			face_landmark_5_raw = detection[index + feature_map_channel * 2] * feature_stride
-
-			for bounding_box in distance_to_bounding_box(anchors, bounding_box_raw)[keep_indices]:
-				bounding_boxes.append(numpy.array(
-				[
-					bounding_box[0] * ratio_width,
-					bounding_box[1] * ratio_height,
-					bounding_box[2] * ratio_width,
-					bounding_box[3] * ratio_height,
-				]))
-
-			for score in detection[index][keep_indices]:
-				face_scores.append(score[0])
-
-			for face_landmark_5 in distance_to_face_landmark_5(anchors, face_landmark_5_raw)[keep_indices]:
-				face_landmarks_5.append(face_landmark_5 * [ ratio_width, ratio_height ])
+			anchors = create_static_anchors(feature_stride, anchor_total, stride_height, stride_width)[keep_indices]
+			bounding_box_raw = detection[index + feature_map_channel][keep_indices] * feature_stride
+			face_landmark_5_raw = detection[index + feature_map_channel * 2][keep_indices] * feature_stride
+			bounding_boxes = numpy.concatenate([ bounding_boxes, distance_to_bounding_box(anchors, bounding_box_raw) * [ ratio_width, ratio_height, ratio_width, ratio_height ] ])
+			face_scores = numpy.concatenate([ face_scores, detection[index][keep_indices, 0] ])
+			face_landmarks_5 = numpy.concatenate([ face_landmarks_5, distance_to_face_landmark_5(anchors, face_landmark_5_raw) * [ ratio_width, ratio_height ] ])
 
 	return bounding_boxes, face_scores, face_landmarks_5
 
 
-def detect_with_yoloface(vision_frame : VisionFrame, face_detector_size : str) -> Tuple[List[BoundingBox], List[Score], List[FaceLandmark5]]:
-	bounding_boxes = []
-	face_scores = []
-	face_landmarks_5 = []
+def detect_with_yoloface(vision_frame : VisionFrame, face_detector_size : str) -> Tuple[BoundingBoxes, Scores, FaceLandmarks5]:
 	face_detector_width, face_detector_height = unpack_resolution(face_detector_size)
 	temp_vision_frame = resize_frame_resolution(vision_frame, (face_detector_width, face_detector_height))
 	ratio_height = vision_frame.shape[0] / temp_vision_frame.shape[0]
@@ -239,28 +212,17 @@ def detect_with_yoloface(vision_frame : VisionFrame, face_detector_size : str) -
 	detect_vision_frame = prepare_detect_frame(temp_vision_frame, face_detector_size)
 	detection = forward_with_yoloface(detect_vision_frame)
 	detection = numpy.squeeze(detection).T
-	bounding_box_raw, score_raw, face_landmark_5_raw = numpy.split(detection, [ 4, 5 ], axis = 1)
-	keep_indices = numpy.where(score_raw > state_manager.get_item('face_detector_score'))[0]
-
-	if numpy.any(keep_indices):
-		bounding_box_raw, face_landmark_5_raw, score_raw = bounding_box_raw[keep_indices], face_landmark_5_raw[keep_indices], score_raw[keep_indices]
-
-		for bounding_box in bounding_box_raw:
-			bounding_boxes.append(numpy.array(
-			[
-				(bounding_box[0] - bounding_box[2] / 2) * ratio_width,
-				(bounding_box[1] - bounding_box[3] / 2) * ratio_height,
-				(bounding_box[0] + bounding_box[2] / 2) * ratio_width,
-				(bounding_box[1] + bounding_box[3] / 2) * ratio_height,
-			]))
-
-		face_scores = score_raw.ravel().tolist()
-		face_landmark_5_raw[:, 0::3] = (face_landmark_5_raw[:, 0::3]) * ratio_width
-		face_landmark_5_raw[:, 1::3] = (face_landmark_5_raw[:, 1::3]) * ratio_height
-
-		for face_landmark_5 in face_landmark_5_raw:
-			face_landmarks_5.append(numpy.array(face_landmark_5.reshape(-1, 3)[:, :2]))
-
+	keep_indices = numpy.where(detection[:, 4] > state_manager.get_item('face_detector_score'))[0]
+	bounding_box_raw, score_raw, face_landmark_5_raw = numpy.split(detection[keep_indices], [ 4, 5 ], axis = 1)
+	bounding_boxes = numpy.column_stack(
+	[
+		bounding_box_raw[:, 0] - bounding_box_raw[:, 2] / 2,
+		bounding_box_raw[:, 1] - bounding_box_raw[:, 3] / 2,
+		bounding_box_raw[:, 0] + bounding_box_raw[:, 2] / 2,
+		bounding_box_raw[:, 1] + bounding_box_raw[:, 3] / 2
+	]) * [ ratio_width, ratio_height, ratio_width, ratio_height ]
+	face_scores = score_raw.ravel()
+	face_landmarks_5 = face_landmark_5_raw.reshape(-1, 5, 3)[:, :, :2] * [ ratio_width, ratio_height ]
 	return bounding_boxes, face_scores, face_landmarks_5
 
 
@@ -1,11 +1,11 @@
 from functools import lru_cache
-from typing import List, Sequence, Tuple
+from typing import List, Optional, Tuple
 
 import cv2
 import numpy
 from cv2.typing import Size
 
-from facefusion.typing import Anchors, Angle, BoundingBox, Distance, FaceDetectorModel, FaceLandmark5, FaceLandmark68, Mask, Matrix, Points, Scale, Score, Translation, VisionFrame, WarpTemplate, WarpTemplateSet
+from facefusion.typing import Anchors, Angle, BoundingBox, BoundingBoxes, Distance, FaceDetectorModel, FaceLandmark5, FaceLandmark68, Mask, Matrix, Points, Scale, Scores, Translation, VisionFrame, WarpTemplate, WarpTemplateSet
 
 WARP_TEMPLATES : WarpTemplateSet =\
 {
@@ -76,16 +76,31 @@ def warp_face_by_translation(temp_vision_frame : VisionFrame, translation : Tran
 
 def paste_back(temp_vision_frame : VisionFrame, crop_vision_frame : VisionFrame, crop_mask : Mask, affine_matrix : Matrix) -> VisionFrame:
 	inverse_matrix = cv2.invertAffineTransform(affine_matrix)
-	temp_size = temp_vision_frame.shape[:2][::-1]
-	inverse_mask = cv2.warpAffine(crop_mask, inverse_matrix, temp_size).clip(0, 1)
-	inverse_vision_frame = cv2.warpAffine(crop_vision_frame, inverse_matrix, temp_size, borderMode = cv2.BORDER_REPLICATE)
+	paste_bounding_box = calc_paste_bounding_box(crop_vision_frame.shape[:2][::-1], inverse_matrix, temp_vision_frame.shape[:2][::-1])
 	paste_vision_frame = temp_vision_frame.copy()
-	paste_vision_frame[:, :, 0] = inverse_mask * inverse_vision_frame[:, :, 0] + (1 - inverse_mask) * temp_vision_frame[:, :, 0]
-	paste_vision_frame[:, :, 1] = inverse_mask * inverse_vision_frame[:, :, 1] + (1 - inverse_mask) * temp_vision_frame[:, :, 1]
-	paste_vision_frame[:, :, 2] = inverse_mask * inverse_vision_frame[:, :, 2] + (1 - inverse_mask) * temp_vision_frame[:, :, 2]
+
+	if paste_bounding_box:
+		x1, y1, x2, y2 = paste_bounding_box
+		paste_size = x2 - x1, y2 - y1
+		inverse_matrix[:, 2] = inverse_matrix[:, 2] - (x1, y1)
+		inverse_mask = cv2.warpAffine(crop_mask, inverse_matrix, paste_size).clip(0, 1)[:, :, numpy.newaxis]
+		inverse_vision_frame = cv2.warpAffine(crop_vision_frame, inverse_matrix, paste_size, borderMode = cv2.BORDER_REPLICATE)
+		paste_vision_frame[y1:y2, x1:x2] = inverse_mask * inverse_vision_frame + (1 - inverse_mask) * temp_vision_frame[y1:y2, x1:x2]
 	return paste_vision_frame
 
 
+def calc_paste_bounding_box(crop_size : Size, inverse_matrix : Matrix, temp_size : Size) -> Optional[Tuple[int, int, int, int]]:
+	crop_width, crop_height = crop_size
+	crop_points = numpy.array([ [ 0, 0 ], [ crop_width, 0 ], [ crop_width, crop_height ], [ 0, crop_height ] ], dtype = numpy.float64)
+	paste_points = cv2.transform(crop_points.reshape(-1, 1, 2), inverse_matrix).reshape(-1, 2)
+	x1, y1 = numpy.maximum(numpy.floor(paste_points.min(axis = 0)).astype(int) - 1, 0)
+	x2, y2 = numpy.minimum(numpy.ceil(paste_points.max(axis = 0)).astype(int) + 1, temp_size)
+
+	if x2 > x1 and y2 > y1:
+		return int(x1), int(y1), int(x2), int(y2)
+	return None
+
+
 @lru_cache(maxsize = None)
 def create_static_anchors(feature_stride : int, anchor_total : int, stride_height : int, stride_width : int) -> Anchors:
 	y, x = numpy.mgrid[:stride_height, :stride_width][::-1]
@@ -117,6 +132,12 @@ def normalize_bounding_box(bounding_box : BoundingBox) -> BoundingBox:
 	return numpy.array([ x1, y1, x2, y2 ])
 
 
+def normalize_bounding_boxes(bounding_boxes : BoundingBoxes) -> BoundingBoxes:
+	x1, x2 = numpy.minimum(bounding_boxes[:, 0], bounding_boxes[:, 2]), numpy.maximum(bounding_boxes[:, 0], bounding_boxes[:, 2])
+	y1, y2 = numpy.minimum(bounding_boxes[:, 1], bounding_boxes[:, 3]), numpy.maximum(bounding_boxes[:, 1], bounding_boxes[:, 3])
+	return numpy.column_stack([ x1, y1, x2, y2 ])
+
+
 def transform_points(points : Points, matrix : Matrix) -> Points:
 	points = points.reshape(-1, 1, 2)
 	points = cv2.transform(points, matrix) #type:ignore[assignment]
@@ -138,6 +159,16 @@ def transform_bounding_box(bounding_box : BoundingBox, matrix : Matrix) -> Bound
 	return normalize_bounding_box(numpy.array([ x1, y1, x2, y2 ]))
 
 
+def transform_many_points(points : Points, matrix : Matrix) -> Points:
+	return points @ matrix[:, :2].T + matrix[:, 2]
+
+
+def transform_bounding_boxes(bounding_boxes : BoundingBoxes, matrix : Matrix) -> BoundingBoxes:
+	points = bounding_boxes[:, [ 0, 1, 2, 1, 2, 3, 0, 3 ]].reshape(-1, 4, 2)
+	points = transform_many_points(points, matrix)
+	return normalize_bounding_boxes(numpy.concatenate([ points.min(axis = 1), points.max(axis = 1) ], axis = 1))
+
+
 def distance_to_bounding_box(points : Points, distance : Distance) -> BoundingBox:
 	x1 = points[:, 0] - distance[:, 0]
 	y1 = points[:, 1] - distance[:, 1]
@@ -184,10 +215,10 @@ def estimate_face_angle(face_landmark_68 : FaceLandmark68) -> Angle:
 	return face_angle
 
 
-def apply_nms(bounding_boxes : List[BoundingBox], face_scores : List[Score], score_threshold : float, nms_threshold : float) -> Sequence[int]:
-	normed_bounding_boxes = [ (x1, y1, x2 - x1, y2 - y1) for (x1, y1, x2, y2) in bounding_boxes ]
-	keep_indices = cv2.dnn.NMSBoxes(normed_bounding_boxes, face_scores, score_threshold = score_threshold, nms_threshold = nms_threshold)
-	return keep_indices
+def apply_nms(bounding_boxes : BoundingBoxes, face_scores : Scores, score_threshold : float, nms_threshold : float) -> List[int]:
+	normed_bounding_boxes = numpy.column_stack([ bounding_boxes[:, :2], bounding_boxes[:, 2:] - bounding_boxes[:, :2] ])
+	keep_indices = cv2.dnn.NMSBoxes(normed_bounding_boxes, face_scores, score_threshold = score_threshold, nms_threshold = nms_threshold) #type:ignore[arg-type]
+	return numpy.ravel(keep_indices).tolist()
 
 
 def get_nms_threshold(face_detector_model : FaceDetectorModel, face_detector_angles : List[Angle]) -> float:
@@ -7,7 +7,6 @@ from facefusion import inference_manager, state_manager
 from facefusion.download import conditional_download_hashes, conditional_download_sources
 from facefusion.face_helper import create_rotated_matrix_and_size, estimate_matrix_by_face_landmark_5, transform_points, warp_face_by_translation
 from facefusion.filesystem import resolve_relative_path
-from facefusion.thread_helper import conditional_thread_semaphore
 from facefusion.typing import Angle, BoundingBox, DownloadSet, FaceLandmark5, FaceLandmark68, InferencePool, ModelSet, Prediction, Score, VisionFrame
 
 MODEL_SET : ModelSet =\
@@ -184,11 +183,10 @@ def estimate_face_landmark_68_5(face_landmark_5 : FaceLandmark5) -> FaceLandmark
 def forward_with_2dfan4(crop_vision_frame : VisionFrame) -> Tuple[Prediction, Prediction]:
 	face_landmarker = get_inference_pool().get('2dfan4')
 
-	with conditional_thread_semaphore():
-		prediction = face_landmarker.run(None,
-		{
-			'input': [ crop_vision_frame ]
-		})
+	prediction = inference_manager.run_inference(face_landmarker,
+	{
+		'input': [ crop_vision_frame ]
+	})
 
 	return prediction
 
@@ -196,11 +194,10 @@ def forward_with_2dfan4(crop_vision_frame : VisionFrame) -> Tuple[Prediction, Pr
 def forward_with_peppa_wutz(crop_vision_frame : VisionFrame) -> Prediction:
 	face_landmarker = get_inference_pool().get('peppa_wutz')
 
-	with conditional_thread_semaphore():
-		prediction = face_landmarker.run(None,
-		{
-			'input': crop_vision_frame
-		})[0]
+	prediction = inference_manager.run_inference(face_landmarker,
+	{
+		'input': crop_vision_frame
+	})[0]
 
 	return prediction
 
@@ -208,10 +205,9 @@ def forward_with_peppa_wutz(crop_vision_frame : VisionFrame) -> Prediction:
 def forward_fan_68_5(face_landmark_5 : FaceLandmark5) -> FaceLandmark68:
 	face_landmarker = get_inference_pool().get('fan_68_5')
 
-	with conditional_thread_semaphore():
-		face_landmark_68_5 = face_landmarker.run(None,
-		{
-			'input': [ face_landmark_5 ]
-		})[0][0]
+	face_landmark_68_5 = inference_manager.run_inference(face_landmarker,
+	{
+		'input': [ face_landmark_5 ]
+	})[0][0]
 
 	return face_landmark_68_5
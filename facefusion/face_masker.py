@@ -8,7 +8,6 @@ from cv2.typing import Size
 from facefusion import inference_manager
 from facefusion.download import conditional_download_hashes, conditional_download_sources
 from facefusion.filesystem import resolve_relative_path
-from facefusion.thread_helper import conditional_thread_semaphore
 from facefusion.typing import DownloadSet, FaceLandmark68, FaceMaskRegion, InferencePool, Mask, ModelSet, Padding, VisionFrame
 
 MODEL_SET : ModelSet =\
@@ -152,11 +151,10 @@ def create_mouth_mask(face_landmark_68 : FaceLandmark68) -> Mask:
 def forward_occlude_face(prepare_vision_frame : VisionFrame) -> Mask:
 	face_occluder = get_inference_pool().get('face_occluder')
 
-	with conditional_thread_semaphore():
-		occlusion_mask : Mask = face_occluder.run(None,
-		{
-			'input': prepare_vision_frame
-		})[0][0]
+	occlusion_mask : Mask = inference_manager.run_inference(face_occluder,
+	{
+		'input': prepare_vision_frame
+	})[0][0]
 
 	return occlusion_mask
 
@@ -164,10 +162,9 @@ def forward_occlude_face(prepare_vision_frame : VisionFrame) -> Mask:
 def forward_parse_face(prepare_vision_frame : VisionFrame) -> Mask:
 	face_parser = get_inference_pool().get('face_parser')
 
-	with conditional_thread_semaphore():
-		region_mask : Mask = face_parser.run(None,
-		{
-			'input': prepare_vision_frame
-		})[0][0]
+	region_mask : Mask = inference_manager.run_inference(face_parser,
+	{
+		'input': prepare_vision_frame
+	})[0][0]
 
 	return region_mask
@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import List, Tuple
 
 import numpy
 
@@ -6,7 +6,6 @@ from facefusion import inference_manager
 from facefusion.download import conditional_download_hashes, conditional_download_sources
 from facefusion.face_helper import warp_face_by_face_landmark_5
 from facefusion.filesystem import resolve_relative_path
-from facefusion.thread_helper import conditional_thread_semaphore
 from facefusion.typing import Embedding, FaceLandmark5, InferencePool, ModelOptions, ModelSet, VisionFrame
 
 MODEL_SET : ModelSet =\
@@ -57,25 +56,56 @@ def pre_check() -> bool:
 
 
 def calc_embedding(temp_vision_frame : VisionFrame, face_landmark_5 : FaceLandmark5) -> Tuple[Embedding, Embedding]:
+	crop_vision_frame = warp_face(temp_vision_frame, face_landmark_5)
+	return calc_crop_embedding(crop_vision_frame)
+
+
+def calc_embeddings(temp_vision_frame : VisionFrame, face_landmarks_5 : List[FaceLandmark5]) -> List[Tuple[Embedding, Embedding]]:
+	crop_vision_frames = [ warp_face(temp_vision_frame, face_landmark_5) for face_landmark_5 in face_landmarks_5 ]
+	return calc_crop_embeddings(crop_vision_frames)
+
+
+def warp_face(temp_vision_frame : VisionFrame, face_landmark_5 : FaceLandmark5) -> VisionFrame:
 	model_template = get_model_options().get('template')
 	model_size = get_model_options().get('size')
-	crop_vision_frame, matrix = warp_face_by_face_landmark_5(temp_vision_frame, face_landmark_5, model_template, model_size)
+	crop_vision_frame, _ = warp_face_by_face_landmark_5(temp_vision_frame, face_landmark_5, model_template, model_size)
+	return crop_vision_frame
+
+
+def calc_crop_embedding(crop_vision_frame : VisionFrame) -> Tuple[Embedding, Embedding]:
+	return calc_crop_embeddings([ crop_vision_frame ])[0]
+
+
+def calc_crop_embeddings(crop_vision_frames : List[VisionFrame]) -> List[Tuple[Embedding, Embedding]]:
+	embedding_sets = []
+
+	if crop_vision_frames:
+		crop_vision_frame = numpy.stack([ prepare_crop_frame(crop_vision_frame) for crop_vision_frame in crop_vision_frames ])
+		embeddings = forward(crop_vision_frame)
+
+		for embedding in embeddings:
+			embedding = embedding.ravel()
+			normed_embedding = embedding / numpy.linalg.norm(embedding)
+			embedding_sets.append((embedding, normed_embedding))
+	return embedding_sets
+
+
+def prepare_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
 	crop_vision_frame = crop_vision_frame / 127.5 - 1
 	crop_vision_frame = crop_vision_frame[:, :, ::-1].transpose(2, 0, 1).astype(numpy.float32)
-	crop_vision_frame = numpy.expand_dims(crop_vision_frame, axis = 0)
-	embedding = forward(crop_vision_frame)
-	embedding = embedding.ravel()
-	normed_embedding = embedding / numpy.linalg.norm(embedding)
-	return embedding, normed_embedding
+	return crop_vision_frame
 
 
 def forward(crop_vision_frame : VisionFrame) -> Embedding:
 	face_recognizer = get_inference_pool().get('face_recognizer')
 
-	with conditional_thread_semaphore():
-		embedding = face_recognizer.run(None,
+	if inference_manager.has_dynamic_batch(face_recognizer):
+		return inference_manager.run_inference(face_recognizer,
 		{
 			'input': crop_vision_frame
 		})[0]
 
-	return embedding
+	return numpy.concatenate([ inference_manager.run_inference(face_recognizer,
+	{
+		'input': crop_vision_frame[index:index + 1]
+	})[0] for index in range(crop_vision_frame.shape[0]) ])
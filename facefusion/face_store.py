@@ -1,40 +1,217 @@
 import hashlib
-from typing import List, Optional
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import numpy
 
-from facefusion.typing import Face, FaceSet, FaceStore, VisionFrame
+from facefusion import state_manager
+from facefusion.filesystem import create_directory, is_directory, is_file, remove_directory, remove_file
+from facefusion.temp_helper import get_temp_directory_path
+from facefusion.typing import Face, FaceSet, FaceStore, FaceStoreStatistics, VisionFrame
 
 FACE_STORE : FaceStore =\
 {
-	'static_faces': {},
+	'static_faces': OrderedDict(),
 	'reference_faces': {}
 }
+FACE_STORE_STATISTICS : FaceStoreStatistics =\
+{
+	'static_face_hits': 0,
+	'static_face_misses': 0,
+	'static_face_evictions': 0,
+	'static_face_spills': 0,
+	'static_face_memory_size': 0
+}
+STATIC_FACE_SIZES : Dict[str, int] = {}
+FRAME_HASH_COLLISIONS : Set[str] = set()
+FRAME_HASH_STRIDE = 8
+FACE_EMBEDDING_SIZE = 2 * 512 * 4
+FACE_STORE_SPILL_PATH : Optional[str] = None
+FACE_STORE_SPILL_KEYS =\
+[
+	'face_detector_model',
+	'face_detector_size',
+	'face_detector_angles',
+	'face_detector_score',
+	'face_landmarker_model',
+	'face_landmarker_score'
+]
+FACE_STORE_LOCK : threading.Lock = threading.Lock()
 
 
 def get_face_store() -> FaceStore:
 	return FACE_STORE
 
 
+def get_face_store_statistics() -> FaceStoreStatistics:
+	return FACE_STORE_STATISTICS
+
+
 def get_static_faces(vision_frame : VisionFrame) -> Optional[List[Face]]:
 	frame_hash = create_frame_hash(vision_frame)
-	if frame_hash in FACE_STORE['static_faces']:
-		return FACE_STORE['static_faces'][frame_hash]
+	return find_static_faces(frame_hash)
+
+
+def find_static_faces(frame_hash : Optional[str]) -> Optional[List[Face]]:
+	if frame_hash:
+		with FACE_STORE_LOCK:
+			if frame_hash in FACE_STORE['static_faces']:
+				FACE_STORE['static_faces'].move_to_end(frame_hash)
+				FACE_STORE_STATISTICS['static_face_hits'] += 1
+				return FACE_STORE['static_faces'][frame_hash]
+
+		faces = read_spill_faces(frame_hash)
+		if faces:
+			store_static_faces(frame_hash, faces)
+			with FACE_STORE_LOCK:
+				FACE_STORE_STATISTICS['static_face_hits'] += 1
+			return faces
+		with FACE_STORE_LOCK:
+			FACE_STORE_STATISTICS['static_face_misses'] += 1
 	return None
 
 
 def set_static_faces(vision_frame : VisionFrame, faces : List[Face]) -> None:
 	frame_hash = create_frame_hash(vision_frame)
-	if frame_hash:
+	store_static_faces(frame_hash, faces)
+
+
+def store_static_faces(frame_hash : Optional[str], faces : List[Face]) -> None:
+	if not frame_hash:
+		return
+
+	face_store_memory_limit = state_manager.get_item('face_store_memory_limit')
+	evicted_static_faces = []
+
+	with FACE_STORE_LOCK:
+		if frame_hash in FACE_STORE['static_faces']:
+			if not has_same_faces(FACE_STORE['static_faces'].get(frame_hash), faces):
+				FRAME_HASH_COLLISIONS.add(frame_hash)
+			FACE_STORE['static_faces'].pop(frame_hash)
+			FACE_STORE_STATISTICS['static_face_memory_size'] -= STATIC_FACE_SIZES.pop(frame_hash)
+		if frame_hash in FRAME_HASH_COLLISIONS:
+			return
 		FACE_STORE['static_faces'][frame_hash] = faces
+		FACE_STORE['static_faces'].move_to_end(frame_hash)
+		STATIC_FACE_SIZES[frame_hash] = calc_faces_size(faces)
+		FACE_STORE_STATISTICS['static_face_memory_size'] += STATIC_FACE_SIZES.get(frame_hash)
+
+		if face_store_memory_limit:
+			while FACE_STORE_STATISTICS.get('static_face_memory_size') > face_store_memory_limit * 1024 * 1024 and len(FACE_STORE['static_faces']) > 1:
+				evicted_static_faces.append(FACE_STORE['static_faces'].popitem(last = False))
+				FACE_STORE_STATISTICS['static_face_memory_size'] -= STATIC_FACE_SIZES.pop(evicted_static_faces[-1][0])
+				FACE_STORE_STATISTICS['static_face_evictions'] += 1
+
+	if state_manager.get_item('face_store_spill'):
+		write_spill_faces(evicted_static_faces)
 
 
 def clear_static_faces() -> None:
-	FACE_STORE['static_faces'] = {}
+	global FACE_STORE_SPILL_PATH
+
+	with FACE_STORE_LOCK:
+		FACE_STORE['static_faces'] = OrderedDict()
+		STATIC_FACE_SIZES.clear()
+		FRAME_HASH_COLLISIONS.clear()
+		FACE_STORE_STATISTICS.update(
+		{
+			'static_face_hits': 0,
+			'static_face_misses': 0,
+			'static_face_evictions': 0,
+			'static_face_spills': 0,
+			'static_face_memory_size': 0
+		})
+		if FACE_STORE_SPILL_PATH:
+			remove_directory(FACE_STORE_SPILL_PATH)
+		FACE_STORE_SPILL_PATH = None
+
+
+def has_same_faces(faces : List[Face], other_faces : List[Face]) -> bool:
+	if len(faces) == len(other_faces):
+		return all(numpy.allclose(face.bounding_box, other_face.bounding_box) for face, other_face in zip(faces, other_faces))
+	return False
+
+
+def calc_faces_size(faces : List[Face]) -> int:
+	faces_size = 0
+
+	for face in faces:
+		face_dict = getattr(face, '__dict__', {})
+
+		for face_item in list(face) + [ value for key, value in face_dict.items() if key != 'face_group' ]:
+			faces_size += calc_face_item_size(face_item)
+		if face._asdict().get('embedding') is None and 'embedding_set' not in face_dict:
+			faces_size += FACE_EMBEDDING_SIZE
+	return faces_size
+
+
+def calc_face_item_size(face_item : Any) -> int:
+	if isinstance(face_item, numpy.ndarray):
+		return face_item.nbytes
+	if isinstance(face_item, dict):
+		return sum(calc_face_item_size(value) for value in face_item.values())
+	if isinstance(face_item, tuple):
+		return sum(calc_face_item_size(value) for value in face_item)
+	return 0
+
+
+def create_spill_directory() -> Optional[str]:
+	global FACE_STORE_SPILL_PATH
+	temp_directory_path = get_temp_directory_path(state_manager.get_item('target_path'))
+
+	with FACE_STORE_LOCK:
+		if not FACE_STORE_SPILL_PATH or os.path.dirname(FACE_STORE_SPILL_PATH) != temp_directory_path or not is_directory(FACE_STORE_SPILL_PATH):
+			FACE_STORE_SPILL_PATH = None
+			if create_directory(temp_directory_path):
+				FACE_STORE_SPILL_PATH = tempfile.mkdtemp(prefix = 'face_store-', dir = temp_directory_path)
+	return FACE_STORE_SPILL_PATH
+
+
+def get_spill_file_path(frame_hash : str) -> Optional[str]:
+	if FACE_STORE_SPILL_PATH:
+		spill_args = [ frame_hash ] + [ str(state_manager.get_item(key)) for key in FACE_STORE_SPILL_KEYS ] #type:ignore[arg-type]
+		spill_hash = hashlib.sha1('|'.join(spill_args).encode()).hexdigest()
+		return os.path.join(FACE_STORE_SPILL_PATH, spill_hash + '.pickle')
+	return None
+
+
+def write_spill_faces(evicted_static_faces : List[Tuple[str, List[Face]]]) -> None:
+	if evicted_static_faces and create_spill_directory():
+		for frame_hash, faces in evicted_static_faces:
+			spill_file_path = get_spill_file_path(frame_hash)
+			if spill_file_path:
+				with open(spill_file_path, 'wb') as spill_file:
+					pickle.dump(faces, spill_file)
+				with FACE_STORE_LOCK:
+					FACE_STORE_STATISTICS['static_face_spills'] += 1
+
+
+def read_spill_faces(frame_hash : str) -> Optional[List[Face]]:
+	spill_file_path = get_spill_file_path(frame_hash)
+
+	if state_manager.get_item('face_store_spill') and is_file(spill_file_path):
+		with open(spill_file_path, 'rb') as spill_file:
+			faces = pickle.load(spill_file)
+		remove_file(spill_file_path)
+		return faces
+	return None
 
 
 def create_frame_hash(vision_frame : VisionFrame) -> Optional[str]:
-	return hashlib.sha1(vision_frame.tobytes()).hexdigest() if numpy.any(vision_frame) else None
+	sample_vision_frame = numpy.ascontiguousarray(vision_frame[::FRAME_HASH_STRIDE])
+
+	if numpy.any(sample_vision_frame):
+		frame_shape = 'x'.join(map(str, vision_frame.shape))
+		frame_hash = frame_shape + '-' + vision_frame.dtype.str + '-' + hashlib.sha1(sample_vision_frame.data.cast('B')).hexdigest()
+
+		if frame_hash in FRAME_HASH_COLLISIONS:
+			return frame_hash + '-' + hashlib.sha1(numpy.ascontiguousarray(vision_frame).data.cast('B')).hexdigest()
+		return frame_hash
+	return None
 
 
 def get_reference_faces() -> Optional[FaceSet]:
@@ -46,6 +223,8 @@ def get_reference_faces() -> Optional[FaceSet]:
 def append_reference_face(name : str, face : Face) -> None:
 	if name not in FACE_STORE['reference_faces']:
 		FACE_STORE['reference_faces'][name] = []
+	if face:
+		face = face._replace(embedding = face.embedding, normed_embedding = face.normed_embedding)
 	FACE_STORE['reference_faces'][name].append(face)
 
 
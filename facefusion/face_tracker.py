@@ -0,0 +1,105 @@
+import threading
+from contextvars import ContextVar
+from typing import List, Optional
+
+import cv2
+import numpy
+
+from facefusion import state_manager
+from facefusion.face_helper import convert_to_face_landmark_5, estimate_face_angle, transform_bounding_box
+from facefusion.face_landmarker import detect_face_landmarks, estimate_face_landmark_68_5
+from facefusion.typing import Face, FaceLandmarkSet, FaceScoreSet, FaceTrack, FaceTrackSet, VisionFrame
+
+TRACK_FRAME_NUMBER : ContextVar[Optional[int]] = ContextVar('track_frame_number', default = None)
+FACE_TRACKS : FaceTrackSet = {}
+FACE_TRACK_LOCK : threading.Lock = threading.Lock()
+FACE_TRACK_TOTAL = 256
+
+
+def get_track_frame_number() -> Optional[int]:
+	return TRACK_FRAME_NUMBER.get()
+
+
+def set_track_frame_number(frame_number : Optional[int]) -> None:
+	TRACK_FRAME_NUMBER.set(frame_number)
+
+
+def get_face_track(frame_number : int) -> Optional[FaceTrack]:
+	return FACE_TRACKS.get(frame_number)
+
+
+def set_face_track(frame_number : int, vision_frame : VisionFrame, faces : List[Face], track_total : int) -> None:
+	with FACE_TRACK_LOCK:
+		FACE_TRACKS[frame_number] =\
+		{
+			'thumbnail_frame': create_thumbnail_frame(vision_frame),
+			'faces': faces,
+			'track_total': track_total
+		}
+		while len(FACE_TRACKS) > FACE_TRACK_TOTAL:
+			del FACE_TRACKS[min(FACE_TRACKS)]
+
+
+def clear_face_tracks() -> None:
+	with FACE_TRACK_LOCK:
+		FACE_TRACKS.clear()
+
+
+def track_faces(vision_frame : VisionFrame, frame_number : int) -> Optional[List[Face]]:
+	face_track = get_face_track(frame_number - 1)
+	faces = []
+
+	if state_manager.get_item('face_landmarker_score') > 0 and face_track and face_track.get('faces') and face_track.get('track_total') < state_manager.get_item('face_tracker_interval') - 1:
+		if detect_scene_change(face_track.get('thumbnail_frame'), create_thumbnail_frame(vision_frame)):
+			return None
+
+		for face in face_track.get('faces'):
+			face = refine_face(vision_frame, face)
+			if not face:
+				return None
+			faces.append(face)
+
+		set_face_track(frame_number, vision_frame, faces, face_track.get('track_total') + 1)
+		return faces
+	return None
+
+
+def refine_face(vision_frame : VisionFrame, face : Face) -> Optional[Face]:
+	face_landmark_68, face_landmark_score_68 = detect_face_landmarks(vision_frame, face.bounding_box, face.angle)
+
+	if face_landmark_score_68 > max(state_manager.get_item('face_landmarker_score'), 0.5):
+		affine_matrix, _ = cv2.estimateAffinePartial2D(face.landmark_set.get('68'), face_landmark_68)
+
+		if affine_matrix is not None:
+			face_landmark_5_68 = convert_to_face_landmark_5(face_landmark_68)
+			face_landmark_68_5 = estimate_face_landmark_68_5(face_landmark_5_68)
+			face_landmark_set : FaceLandmarkSet =\
+			{
+				'5': face_landmark_5_68,
+				'5/68': face_landmark_5_68,
+				'68': face_landmark_68,
+				'68/5': face_landmark_68_5
+			}
+			face_score_set : FaceScoreSet =\
+			{
+				'detector': face.score_set.get('detector'),
+				'landmarker': face_landmark_score_68
+			}
+			return face._replace(
+				bounding_box = transform_bounding_box(face.bounding_box, affine_matrix),
+				score_set = face_score_set,
+				landmark_set = face_landmark_set,
+				angle = estimate_face_angle(face_landmark_68_5)
+			)
+	return None
+
+
+def create_thumbnail_frame(vision_frame : VisionFrame) -> VisionFrame:
+	thumbnail_frame = cv2.resize(vision_frame, (32, 32), interpolation = cv2.INTER_AREA)
+	thumbnail_frame = cv2.cvtColor(thumbnail_frame, cv2.COLOR_BGR2GRAY)
+	return thumbnail_frame
+
+
+def detect_scene_change(thumbnail_frame : VisionFrame, next_thumbnail_frame : VisionFrame) -> bool:
+	frame_difference = numpy.abs(thumbnail_frame.astype(numpy.int16) - next_thumbnail_frame.astype(numpy.int16)).mean()
+	return bool(frame_difference > 24)
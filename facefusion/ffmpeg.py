@@ -1,16 +1,18 @@
 import os
+import re
 import shutil
 import subprocess
 import tempfile
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 import filetype
 
 from facefusion import logger, process_manager, state_manager
-from facefusion.filesystem import remove_file
+from facefusion.filesystem import is_video, remove_file
 from facefusion.temp_helper import get_temp_file_path, get_temp_frames_pattern
-from facefusion.typing import AudioBuffer, Fps, OutputVideoPreset
-from facefusion.vision import restrict_video_fps
+from facefusion.typing import AudioBuffer, Fps, OutputVideoPreset, VideoSegment
+from facefusion.vision import detect_video_fps, restrict_video_fps
 
 
 def run_ffmpeg(args : List[str]) -> subprocess.Popen[bytes]:
@@ -48,28 +50,93 @@ def log_debug(process : subprocess.Popen[bytes]) -> None:
 
 
 def extract_frames(target_path : str, temp_video_resolution : str, temp_video_fps : Fps) -> bool:
-	trim_frame_start = state_manager.get_item('trim_frame_start')
-	trim_frame_end = state_manager.get_item('trim_frame_end')
 	temp_frames_pattern = get_temp_frames_pattern(target_path, '%08d')
-	commands = [ '-i', target_path, '-s', str(temp_video_resolution), '-q:v', '0' ]
-
-	if isinstance(trim_frame_start, int) and isinstance(trim_frame_end, int):
-		commands.extend([ '-vf', 'trim=start_frame=' + str(trim_frame_start) + ':end_frame=' + str(trim_frame_end) + ',fps=' + str(temp_video_fps) ])
-	elif isinstance(trim_frame_start, int):
-		commands.extend([ '-vf', 'trim=start_frame=' + str(trim_frame_start) + ',fps=' + str(temp_video_fps) ])
-	elif isinstance(trim_frame_end, int):
-		commands.extend([ '-vf', 'trim=end_frame=' + str(trim_frame_end) + ',fps=' + str(temp_video_fps) ])
-	else:
-		commands.extend([ '-vf', 'fps=' + str(temp_video_fps) ])
+	commands = collect_seek_commands(target_path)
+	commands.extend([ '-i', target_path, '-s', str(temp_video_resolution), '-q:v', '0' ])
+	commands.extend(collect_frame_filter_commands(target_path, temp_video_fps))
 	commands.extend([ '-vsync', '0', temp_frames_pattern ])
 	return run_ffmpeg(commands).returncode == 0
 
 
+def open_video_decoder(target_path : str, temp_video_resolution : str, temp_video_fps : Fps) -> subprocess.Popen[bytes]:
+	commands = collect_seek_commands(target_path)
+	commands.extend([ '-i', target_path, '-s', str(temp_video_resolution) ])
+	commands.extend(collect_frame_filter_commands(target_path, temp_video_fps))
+	commands.extend([ '-vsync', '0', '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-' ])
+	return open_ffmpeg(commands)
+
+
+def open_sample_decoder(target_path : str, frame_start : int, frame_end : int, sample_interval : int, sample_resolution : str) -> subprocess.Popen[bytes]:
+	video_fps = detect_video_fps(target_path)
+	commands = []
+
+	if frame_start > 0 and video_fps:
+		commands.extend([ '-ss', str((frame_start - 0.5) / video_fps) ])
+	commands.extend([ '-i', target_path, '-an', '-s', str(sample_resolution) ])
+	commands.extend([ '-vf', 'trim=end_frame=' + str(frame_end - frame_start) + ',select=not(mod(n+' + str(frame_start) + '\\,' + str(sample_interval) + '))' ])
+	commands.extend([ '-vsync', '0', '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-' ])
+	return open_ffmpeg(commands)
+
+
+def collect_seek_commands(target_path : str) -> List[str]:
+	trim_frame_start = state_manager.get_item('trim_frame_start')
+	video_fps = detect_video_fps(target_path)
+
+	if isinstance(trim_frame_start, int) and trim_frame_start > 0 and video_fps:
+		seek_time = (trim_frame_start - 0.5) / video_fps
+		return [ '-ss', str(seek_time) ]
+	return []
+
+
+def collect_frame_filter_commands(target_path : str, temp_video_fps : Fps) -> List[str]:
+	trim_frame_start = state_manager.get_item('trim_frame_start')
+	trim_frame_end = state_manager.get_item('trim_frame_end')
+	seek_frame_start = trim_frame_start if collect_seek_commands(target_path) else 0
+	trim_options = []
+	frame_filters = []
+
+	if isinstance(trim_frame_start, int) and trim_frame_start > seek_frame_start:
+		trim_options.append('start_frame=' + str(trim_frame_start - seek_frame_start))
+	if isinstance(trim_frame_end, int):
+		trim_options.append('end_frame=' + str(trim_frame_end - seek_frame_start))
+	if trim_options:
+		frame_filters.append('trim=' + ':'.join(trim_options))
+	if seek_frame_start:
+		frame_filters.append('setpts=PTS-STARTPTS+' + str(seek_frame_start / detect_video_fps(target_path)) + '/TB')
+	frame_filters.append('fps=' + str(temp_video_fps))
+	return [ '-vf', ','.join(frame_filters) ]
+
+
 def merge_video(target_path : str, output_video_resolution : str, output_video_fps : Fps) -> bool:
 	temp_video_fps = restrict_video_fps(target_path, output_video_fps)
 	temp_file_path = get_temp_file_path(target_path)
 	temp_frames_pattern = get_temp_frames_pattern(target_path, '%08d')
-	commands = [ '-r', str(temp_video_fps), '-i', temp_frames_pattern, '-s', str(output_video_resolution), '-c:v', state_manager.get_item('output_video_encoder') ]
+	commands = [ '-r', str(temp_video_fps), '-i', temp_frames_pattern, '-s', str(output_video_resolution) ]
+	commands.extend(collect_video_encoder_commands())
+	commands.extend([ '-vf', 'framerate=fps=' + str(output_video_fps), '-pix_fmt', 'yuv420p', '-colorspace', 'bt709', '-y', temp_file_path ])
+	return run_ffmpeg(commands).returncode == 0
+
+
+def open_video_encoder(target_path : str, temp_video_resolution : str, output_video_resolution : str, output_video_fps : Fps) -> subprocess.Popen[bytes]:
+	temp_video_fps = restrict_video_fps(target_path, output_video_fps)
+	temp_file_path = get_temp_file_path(target_path)
+	commands = [ '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', str(temp_video_resolution), '-r', str(temp_video_fps), '-i', '-', '-s', str(output_video_resolution) ]
+	commands.extend(collect_video_encoder_commands())
+	commands.extend([ '-vf', 'framerate=fps=' + str(output_video_fps), '-pix_fmt', 'yuv420p', '-colorspace', 'bt709', '-y', temp_file_path ])
+	return open_ffmpeg(commands)
+
+
+def open_frame_encoder(target_path : str, output_video_resolution : str, output_video_fps : Fps) -> subprocess.Popen[bytes]:
+	temp_video_fps = restrict_video_fps(target_path, output_video_fps)
+	temp_file_path = get_temp_file_path(target_path)
+	commands = [ '-f', 'image2pipe', '-r', str(temp_video_fps), '-i', '-', '-s', str(output_video_resolution) ]
+	commands.extend(collect_video_encoder_commands())
+	commands.extend([ '-vf', 'framerate=fps=' + str(output_video_fps), '-pix_fmt', 'yuv420p', '-colorspace', 'bt709', '-y', temp_file_path ])
+	return open_ffmpeg(commands)
+
+
+def collect_video_encoder_commands() -> List[str]:
+	commands = [ '-c:v', state_manager.get_item('output_video_encoder') ]
 
 	if state_manager.get_item('output_video_encoder') in [ 'libx264', 'libx265' ]:
 		output_video_compression = round(51 - (state_manager.get_item('output_video_quality') * 0.51))
@@ -85,8 +152,42 @@ def merge_video(target_path : str, output_video_resolution : str, output_video_f
 		commands.extend([ '-qp_i', str(output_video_compression), '-qp_p', str(output_video_compression), '-quality', map_amf_preset(state_manager.get_item('output_video_preset')) ])
 	if state_manager.get_item('output_video_encoder') in [ 'h264_videotoolbox', 'hevc_videotoolbox' ]:
 		commands.extend([ '-q:v', str(state_manager.get_item('output_video_quality')) ])
-	commands.extend([ '-vf', 'framerate=fps=' + str(output_video_fps), '-pix_fmt', 'yuv420p', '-colorspace', 'bt709', '-y', temp_file_path ])
-	return run_ffmpeg(commands).returncode == 0
+	return commands
+
+
+def detect_keyframe_numbers(target_path : str) -> List[int]:
+	if is_video(target_path):
+		target_stat = os.stat(target_path)
+		return list(probe_keyframe_numbers(target_path, target_stat.st_size, target_stat.st_mtime_ns))
+	return []
+
+
+@lru_cache(maxsize = 32)
+def probe_keyframe_numbers(target_path : str, target_size : int, target_mtime : int) -> Tuple[int, ...]:
+	target_video_fps = detect_video_fps(target_path)
+	commands = [ shutil.which('ffmpeg'), '-hide_banner', '-skip_frame', 'nokey', '-i', target_path, '-an', '-vf', 'showinfo', '-f', 'null', '-' ]
+	keyframe_numbers = []
+
+	if target_video_fps:
+		process = subprocess.run(commands, stdout = subprocess.DEVNULL, stderr = subprocess.PIPE)
+
+		for keyframe_time in re.findall(r'pts_time:\s*(-?[0-9.]+)', process.stderr.decode(errors = 'ignore')):
+			keyframe_numbers.append(round(float(keyframe_time) * target_video_fps))
+	return tuple(keyframe_numbers)
+
+
+def calc_video_segments(keyframe_numbers : List[int], frame_start : int, frame_end : int, segment_count : int) -> List[VideoSegment]:
+	segment_frame_starts = [ frame_start ]
+
+	for segment_index in range(1, segment_count):
+		segment_frame_start = frame_start + (frame_end - frame_start) * segment_index // segment_count
+		segment_keyframe_numbers = [ keyframe_number for keyframe_number in keyframe_numbers if segment_frame_starts[-1] < keyframe_number < frame_end ]
+
+		if segment_keyframe_numbers:
+			segment_frame_start = min(segment_keyframe_numbers, key = lambda keyframe_number: abs(keyframe_number - segment_frame_start))
+		if segment_frame_starts[-1] < segment_frame_start < frame_end:
+			segment_frame_starts.append(segment_frame_start)
+	return list(zip(segment_frame_starts, segment_frame_starts[1:] + [ frame_end ]))
 
 
 def concat_video(output_path : str, temp_output_paths : List[str]) -> bool:
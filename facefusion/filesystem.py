@@ -104,6 +104,16 @@ def copy_file(file_path : str, move_path : str) -> bool:
 	return False
 
 
+def link_file(file_path : str, link_path : str) -> bool:
+	if is_file(file_path):
+		try:
+			os.symlink(os.path.abspath(file_path), link_path)
+		except OSError:
+			shutil.copy(file_path, link_path)
+		return is_file(link_path)
+	return False
+
+
 def move_file(file_path : str, move_path : str) -> bool:
 	if is_file(file_path):
 		shutil.move(file_path, move_path)
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+from types import ModuleType
+from typing import List, Optional
+
+from facefusion import process_manager, state_manager
+from facefusion.filesystem import copy_file, create_directory, is_file, list_directory
+from facefusion.jobs import job_store
+from facefusion.typing import Fps, ProcessFrames, QueuePayload, UpdateProgress
+from facefusion.vision import restrict_video_fps
+
+FRAME_CACHE_IGNORE_KEYS =\
+[
+	'source_paths',
+	'target_path',
+	'output_',
+	'trim_frame_start',
+	'trim_frame_end',
+	'temp_frame_format',
+	'keep_temp',
+	'pipeline_mode',
+	'video_segment_count',
+	'frame_cache_path'
+]
+
+
+def create_step_hash(processor_modules : List[ModuleType]) -> Optional[str]:
+	processors = [ processor_module.__name__.split('.')[-1] for processor_module in processor_modules ]
+	ignore_processors = [ processor for processor in list_directory('facefusion/processors/modules') or [] if processor not in processors ]
+	step_keys = [ key for key in job_store.get_step_keys() if not key.startswith(tuple(FRAME_CACHE_IGNORE_KEYS + ignore_processors)) ]
+
+	if state_manager.get_item('frame_cache_path') and step_keys:
+		step_content =\
+		{
+			'processors': processors,
+			'step_args': { key: state_manager.get_item(key) for key in step_keys }, #type:ignore[arg-type]
+			'source_stats': [ collect_file_stat(source_path) for source_path in state_manager.get_item('source_paths') or [] ],
+			'model_hashes': [ collect_model_hashes(processor_module) for processor_module in processor_modules ]
+		}
+		return hashlib.blake2b(json.dumps(step_content, sort_keys = True, default = str).encode(), digest_size = 16).hexdigest()
+	return None
+
+
+def collect_file_stat(file_path : str) -> List[str]:
+	if is_file(file_path):
+		return [ file_path, str(os.path.getsize(file_path)), str(os.path.getmtime(file_path)) ]
+	return [ file_path ]
+
+
+def collect_model_hashes(processor_module : ModuleType) -> List[str]:
+	model_hashes = []
+
+	if hasattr(processor_module, 'get_model_options'):
+		for model_hash in processor_module.get_model_options().get('hashes').values():
+			model_hash_path = model_hash.get('path')
+			if is_file(model_hash_path):
+				with open(model_hash_path, 'r') as model_hash_file:
+					model_hashes.append(model_hash_file.read().strip())
+			else:
+				model_hashes.append(model_hash.get('url'))
+	return model_hashes
+
+
+def create_frame_hash(step_hash : str, frame_number : int, frame_fps : Fps, frame_path : str) -> str:
+	frame_hash = hashlib.blake2b(step_hash.encode(), digest_size = 16)
+	frame_hash.update((str(frame_number) + '@' + str(frame_fps)).encode())
+
+	with open(frame_path, 'rb') as frame_file:
+		frame_hash.update(frame_file.read())
+	return frame_hash.hexdigest()
+
+
+def get_cache_frame_path(frame_hash : str, frame_path : str) -> str:
+	_, frame_extension = os.path.splitext(frame_path)
+	return os.path.join(state_manager.get_item('frame_cache_path'), frame_hash[:2], frame_hash + frame_extension)
+
+
+def restore_cache_frame(frame_hash : str, frame_path : str) -> bool:
+	cache_frame_path = get_cache_frame_path(frame_hash, frame_path)
+	return is_file(cache_frame_path) and copy_file(cache_frame_path, frame_path)
+
+
+def store_cache_frame(frame_hash : str, frame_path : str) -> bool:
+	cache_frame_path = get_cache_frame_path(frame_hash, frame_path)
+	return create_directory(os.path.dirname(cache_frame_path)) and copy_file(frame_path, cache_frame_path)
+
+
+def process_cache_frames(process_frames : ProcessFrames, step_hash : str, source_paths : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
+	trim_frame_start = state_manager.get_item('trim_frame_start') or 0
+	temp_video_fps = restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
+	process_queue_payloads = []
+	frame_hashes = []
+
+	for queue_payload in process_manager.manage(queue_payloads):
+		frame_hash = create_frame_hash(step_hash, queue_payload.get('frame_number') + trim_frame_start, temp_video_fps, queue_payload.get('frame_path'))
+		if restore_cache_frame(frame_hash, queue_payload.get('output_frame_path')):
+			update_progress(1)
+		else:
+			process_queue_payloads.append(queue_payload)
+			frame_hashes.append(frame_hash)
+
+	if process_queue_payloads:
+		process_frames(source_paths, process_queue_payloads, update_progress)
+		if process_manager.is_processing():
+			for queue_payload, frame_hash in zip(process_queue_payloads, frame_hashes):
+				store_cache_frame(frame_hash, queue_payload.get('output_frame_path'))
@@ -0,0 +1,104 @@
+from multiprocessing.shared_memory import SharedMemory
+from typing import List
+
+import numpy
+from numpy.typing import NDArray
+
+from facefusion.typing import FrameRing, FrameRingSet, FrameShape, FrameSlotState, VisionFrame
+
+FRAME_RINGS : FrameRingSet = {}
+FRAME_SLOT_STATES : List[FrameSlotState] = [ 'free', 'decoded', 'processed' ]
+FRAME_RING_META_TOTAL = 4
+
+
+def create_frame_ring(slot_total : int, frame_shape : FrameShape) -> FrameRing:
+	shared_memory = SharedMemory(create = True, size = calc_header_size(slot_total) + slot_total * int(numpy.prod(frame_shape)))
+	frame_ring_meta : NDArray[numpy.int64] = numpy.ndarray((FRAME_RING_META_TOTAL,), dtype = numpy.int64, buffer = shared_memory.buf)
+	frame_ring_meta[:] = [ slot_total, *frame_shape ]
+	del frame_ring_meta
+	frame_ring : FrameRing =\
+	{
+		'shared_memory': shared_memory,
+		'slot_total': slot_total,
+		'frame_shape': frame_shape
+	}
+	FRAME_RINGS[shared_memory.name] = frame_ring
+	return frame_ring
+
+
+def attach_frame_ring(frame_ring_name : str) -> FrameRing:
+	if frame_ring_name not in FRAME_RINGS:
+		shared_memory = SharedMemory(name = frame_ring_name)
+		slot_total, frame_height, frame_width, frame_channel_total = numpy.ndarray((FRAME_RING_META_TOTAL,), dtype = numpy.int64, buffer = shared_memory.buf).tolist()
+		FRAME_RINGS[frame_ring_name] =\
+		{
+			'shared_memory': shared_memory,
+			'slot_total': slot_total,
+			'frame_shape': (frame_height, frame_width, frame_channel_total)
+		}
+	return FRAME_RINGS[frame_ring_name]
+
+
+def close_frame_rings() -> None:
+	for frame_ring in list(FRAME_RINGS.values()):
+		close_frame_ring(frame_ring)
+
+
+def close_frame_ring(frame_ring : FrameRing) -> None:
+	shared_memory = frame_ring.get('shared_memory')
+	FRAME_RINGS.pop(shared_memory.name, None)
+	shared_memory.close()
+
+
+def destroy_frame_ring(frame_ring : FrameRing) -> None:
+	shared_memory = frame_ring.get('shared_memory')
+	FRAME_RINGS.pop(shared_memory.name, None)
+	shared_memory.close()
+	shared_memory.unlink()
+
+
+def calc_header_size(slot_total : int) -> int:
+	return (FRAME_RING_META_TOTAL + slot_total * 2) * numpy.dtype(numpy.int64).itemsize
+
+
+def get_frame_ring_name(frame_ring : FrameRing) -> str:
+	return frame_ring.get('shared_memory').name
+
+
+def get_frame_slot_total(frame_ring : FrameRing) -> int:
+	return frame_ring.get('slot_total')
+
+
+def get_slot_headers(frame_ring : FrameRing) -> NDArray[numpy.int64]:
+	return numpy.ndarray((frame_ring.get('slot_total'), 2), dtype = numpy.int64, buffer = frame_ring.get('shared_memory').buf, offset = FRAME_RING_META_TOTAL * numpy.dtype(numpy.int64).itemsize)
+
+
+def get_frame_slot_number(frame_ring : FrameRing, frame_slot : int) -> int:
+	return int(get_slot_headers(frame_ring)[frame_slot, 0])
+
+
+def get_frame_slot_state(frame_ring : FrameRing, frame_slot : int) -> FrameSlotState:
+	return FRAME_SLOT_STATES[get_slot_headers(frame_ring)[frame_slot, 1]]
+
+
+def set_frame_slot(frame_ring : FrameRing, frame_slot : int, frame_number : int, frame_slot_state : FrameSlotState) -> None:
+	get_slot_headers(frame_ring)[frame_slot] = [ frame_number, FRAME_SLOT_STATES.index(frame_slot_state) ]
+
+
+def read_frame_slot(frame_ring : FrameRing, frame_slot : int) -> VisionFrame:
+	frame_size = int(numpy.prod(frame_ring.get('frame_shape')))
+	return numpy.ndarray(frame_ring.get('frame_shape'), dtype = numpy.uint8, buffer = frame_ring.get('shared_memory').buf, offset = calc_header_size(frame_ring.get('slot_total')) + frame_slot * frame_size)
+
+
+def write_frame_slot(frame_ring : FrameRing, frame_slot : int, frame_number : int, vision_frame : VisionFrame) -> bool:
+	if vision_frame.shape == frame_ring.get('frame_shape'):
+		read_frame_slot(frame_ring, frame_slot)[:] = vision_frame
+		set_frame_slot(frame_ring, frame_slot, frame_number, 'processed')
+		return True
+	return False
+
+
+def get_frame_slot_buffer(frame_ring : FrameRing, frame_slot : int) -> memoryview:
+	frame_size = int(numpy.prod(frame_ring.get('frame_shape')))
+	frame_offset = calc_header_size(frame_ring.get('slot_total')) + frame_slot * frame_size
+	return frame_ring.get('shared_memory').buf[frame_offset:frame_offset + frame_size]
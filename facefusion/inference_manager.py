@@ -1,21 +1,27 @@
+import threading
+from concurrent.futures import Future
 from functools import lru_cache
-from time import sleep
-from typing import List
+from queue import Empty, Queue
+from time import perf_counter, sleep
+from typing import Dict, List, Optional, Tuple
 
+import numpy
 import onnx
 from onnxruntime import InferenceSession
 
 from facefusion import process_manager, state_manager
 from facefusion.app_context import detect_app_context
 from facefusion.execution import create_execution_providers, has_execution_provider
-from facefusion.thread_helper import thread_lock
-from facefusion.typing import DownloadSet, ExecutionProviderKey, InferencePool, InferencePoolSet, ModelInitializer
+from facefusion.thread_helper import conditional_thread_semaphore, thread_lock
+from facefusion.typing import DownloadSet, ExecutionProviderKey, InferenceBrokerSet, InferenceInputs, InferenceOutputs, InferencePool, InferencePoolSet, InferenceRequest, ModelInitializer
 
 INFERENCE_POOLS : InferencePoolSet =\
 {
 	'cli': {}, # type:ignore[typeddict-item]
 	'ui': {} # type:ignore[typeddict-item]
 }
+INFERENCE_BROKERS : InferenceBrokerSet = {}
+INFERENCE_BROKER_LOCK : threading.Lock = threading.Lock()
 
 
 def get_inference_pool(model_context : str, model_sources : DownloadSet) -> InferencePool:
@@ -53,6 +59,8 @@ def clear_inference_pool(model_context : str) -> None:
 	inference_context = get_inference_context(model_context)
 
 	if INFERENCE_POOLS.get(app_context).get(inference_context):
+		for inference_session in INFERENCE_POOLS.get(app_context).get(inference_context).values():
+			clear_inference_broker(inference_session)
 		del INFERENCE_POOLS[app_context][inference_context]
 
 
@@ -61,6 +69,136 @@ def create_inference_session(model_path : str, execution_device_id : str, execut
 	return InferenceSession(model_path, providers = execution_providers)
 
 
+def run_inference(inference_session : InferenceSession, inference_inputs : InferenceInputs) -> InferenceOutputs:
+	if state_manager.get_item('execution_batch_size') > 1 and has_dynamic_batch(inference_session):
+		inference_request : InferenceRequest =\
+		{
+			'inference_inputs': inference_inputs,
+			'future': Future()
+		}
+		submit_inference_request(inference_session, inference_request)
+		return inference_request.get('future').result()
+
+	with conditional_thread_semaphore():
+		return inference_session.run(None, inference_inputs)
+
+
+def submit_inference_request(inference_session : InferenceSession, inference_request : InferenceRequest) -> None:
+	with INFERENCE_BROKER_LOCK:
+		if inference_session not in INFERENCE_BROKERS:
+			inference_queue : Queue[Optional[InferenceRequest]] = Queue()
+			inference_thread = threading.Thread(target = serve_inference_broker, args = (inference_session, inference_queue, state_manager.get_item('execution_batch_size'), state_manager.get_item('execution_batch_window')), daemon = True)
+			INFERENCE_BROKERS[inference_session] =\
+			{
+				'queue': inference_queue,
+				'thread': inference_thread
+			}
+			inference_thread.start()
+		INFERENCE_BROKERS.get(inference_session).get('queue').put(inference_request)
+
+
+def clear_inference_brokers() -> None:
+	for inference_session in list(INFERENCE_BROKERS.keys()):
+		clear_inference_broker(inference_session)
+
+
+def clear_inference_broker(inference_session : InferenceSession) -> None:
+	with INFERENCE_BROKER_LOCK:
+		inference_broker = INFERENCE_BROKERS.pop(inference_session, None)
+
+		if inference_broker:
+			inference_broker.get('queue').put(None)
+
+
+def serve_inference_broker(inference_session : InferenceSession, inference_queue : Queue[Optional[InferenceRequest]], batch_size : int, batch_window : int) -> None:
+	try:
+		batch_inference_requests(inference_session, inference_queue, batch_size, batch_window)
+	finally:
+		with INFERENCE_BROKER_LOCK:
+			if inference_session in INFERENCE_BROKERS and INFERENCE_BROKERS.get(inference_session).get('queue') is inference_queue:
+				del INFERENCE_BROKERS[inference_session]
+			fail_inference_requests(inference_queue)
+
+
+def batch_inference_requests(inference_session : InferenceSession, inference_queue : Queue[Optional[InferenceRequest]], batch_size : int, batch_window : int) -> None:
+	pending_request = inference_queue.get()
+
+	while pending_request:
+		inference_requests = [ pending_request ]
+		batch_total = count_batch_total(pending_request)
+		batch_end_time = perf_counter() + batch_window / 1000
+		pending_request = None
+
+		while batch_total < batch_size:
+			try:
+				inference_request = inference_queue.get(timeout = max(batch_end_time - perf_counter(), 0))
+			except Empty:
+				break
+			if not inference_request:
+				run_inference_requests(inference_session, inference_requests)
+				return
+			if batch_total + count_batch_total(inference_request) > batch_size:
+				pending_request = inference_request
+				break
+			inference_requests.append(inference_request)
+			batch_total += count_batch_total(inference_request)
+
+		run_inference_requests(inference_session, inference_requests)
+		pending_request = pending_request or inference_queue.get()
+
+
+def fail_inference_requests(inference_queue : Queue[Optional[InferenceRequest]]) -> None:
+	while not inference_queue.empty():
+		inference_request = inference_queue.get()
+		if inference_request and not inference_request.get('future').done():
+			inference_request.get('future').set_exception(RuntimeError('inference broker is closed'))
+
+
+def run_inference_requests(inference_session : InferenceSession, inference_requests : List[InferenceRequest]) -> None:
+	for batch_requests in group_inference_requests(inference_requests).values():
+		run_batch_inference(inference_session, batch_requests)
+
+
+def group_inference_requests(inference_requests : List[InferenceRequest]) -> Dict[Tuple[Tuple[str, Tuple[int, ...]], ...], List[InferenceRequest]]:
+	inference_request_groups : Dict[Tuple[Tuple[str, Tuple[int, ...]], ...], List[InferenceRequest]] = {}
+
+	for inference_request in inference_requests:
+		inference_signature = tuple((input_name, numpy.shape(input_value)[1:]) for input_name, input_value in inference_request.get('inference_inputs').items())
+		inference_request_groups.setdefault(inference_signature, []).append(inference_request)
+	return inference_request_groups
+
+
+def run_batch_inference(inference_session : InferenceSession, inference_requests : List[InferenceRequest]) -> None:
+	batch_totals = [ count_batch_total(inference_request) for inference_request in inference_requests ]
+	input_names = inference_requests[0].get('inference_inputs').keys()
+	inference_inputs =\
+	{
+		input_name: numpy.concatenate([ numpy.asarray(inference_request.get('inference_inputs').get(input_name)) for inference_request in inference_requests ]) for input_name in input_names
+	}
+
+	try:
+		with conditional_thread_semaphore():
+			inference_outputs = inference_session.run(None, inference_inputs)
+		batch_start = 0
+
+		for inference_request, batch_total in zip(inference_requests, batch_totals):
+			inference_request.get('future').set_result([ inference_output[batch_start:batch_start + batch_total] for inference_output in inference_outputs ])
+			batch_start += batch_total
+	except Exception as exception:
+		for inference_request in inference_requests:
+			inference_request.get('future').set_exception(exception)
+
+
+def count_batch_total(inference_request : InferenceRequest) -> int:
+	inference_input = next(iter(inference_request.get('inference_inputs').values()))
+	return len(inference_input)
+
+
+def has_dynamic_batch(inference_session : InferenceSession) -> bool:
+	session_nodes = inference_session.get_inputs() + inference_session.get_outputs()
+	return all(not isinstance(session_node.shape[0], int) for session_node in session_nodes if session_node.shape)
+
+
 @lru_cache(maxsize = None)
 def get_static_model_initializer(model_path : str) -> ModelInitializer:
 	model = onnx.load(model_path)
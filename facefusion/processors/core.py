@@ -1,15 +1,38 @@
 import importlib
+import multiprocessing
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import shutil
+import subprocess
+import threading
+from collections import deque
+from concurrent.futures import Executor, FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial
+from multiprocessing.util import Finalize
 from queue import Queue
+from time import time
 from types import ModuleType
-from typing import Any, List
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple, Union
 
+import numpy
 from tqdm import tqdm
 
-from facefusion import logger, state_manager, wording
+from facefusion import logger, process_manager, state_manager, wording
+from facefusion.app_context import bind_app_context, detect_app_context
+from facefusion.audio import create_empty_audio_frame, get_voice_frame, read_static_voice
+from facefusion.checkpoint import CHECKPOINT_FRAME_LIMIT, CHECKPOINT_INTERVAL, get_processed_frames, set_processed_frames
+from facefusion.common_helper import get_first
 from facefusion.exit_helper import hard_exit
-from facefusion.typing import ProcessFrames, QueuePayload
+from facefusion.face_analyser import get_average_face, get_many_faces
+from facefusion.face_store import append_reference_face, create_frame_hash, find_static_faces, get_reference_faces, store_static_faces
+from facefusion.face_tracker import set_track_frame_number
+from facefusion.ffmpeg import open_frame_encoder, open_video_decoder, open_video_encoder
+from facefusion.filesystem import create_directory, filter_audio_paths, filter_image_paths, is_file, remove_file
+from facefusion.frame_cache import create_step_hash, process_cache_frames
+from facefusion.frame_ring import attach_frame_ring, close_frame_rings, create_frame_ring, destroy_frame_ring, get_frame_ring_name, get_frame_slot_buffer, get_frame_slot_number, get_frame_slot_total, read_frame_slot, set_frame_slot, write_frame_slot
+from facefusion.processors.typing import ProcessorState
+from facefusion.temp_helper import get_temp_staging_path
+from facefusion.typing import AudioFrame, ConsumeFrame, Face, FaceSet, Fps, FrameRing, ProcessFrames, QueuePayload, State, UpdateProgress, VisionFrame
+from facefusion.vision import count_video_frame_total, detect_video_fps, read_image, read_static_images, restrict_video_fps, unpack_resolution, write_image
 
 PROCESSORS_METHODS =\
 [
@@ -26,6 +49,12 @@ PROCESSORS_METHODS =\
 	'process_image',
 	'process_video'
 ]
+FACE_PRESERVING_PROCESSORS =\
+[
+	'face_debugger',
+	'face_enhancer',
+	'frame_colorizer'
+]
 
 
 def load_processor_module(processor : str) -> Any:
@@ -59,26 +88,154 @@ def clear_processors_modules(processors : List[str]) -> None:
 		processor_module.clear_inference_pool()
 
 
-def multi_process_frames(source_paths : List[str], temp_frame_paths : List[str], process_frames : ProcessFrames) -> None:
+def multi_process_frames(source_paths : List[str], temp_frame_paths : List[str], process_frames : ProcessFrames, consume_frame : Optional[ConsumeFrame] = None) -> None:
 	queue_payloads = create_queue_payloads(temp_frame_paths)
-	with tqdm(total = len(queue_payloads), desc = wording.get('processing'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
+	step_name = process_frames.__module__
+	step_modules = get_step_modules(process_frames)
+	step_hash = create_step_hash(step_modules)
+	queue_per_future = calc_queue_per_future(step_modules)
+	processed_frames = recover_staging_frames(queue_payloads, step_name)
+	reorder_buffer : Dict[int, QueuePayload] = { queue_payload.get('frame_number'): queue_payload for queue_payload in queue_payloads if queue_payload.get('frame_number') in processed_frames }
+	reorder_frame_number = consume_reorder_frames(reorder_buffer, 0, consume_frame)
+	queue_payloads = [ queue_payload for queue_payload in queue_payloads if queue_payload.get('frame_number') not in processed_frames ]
+
+	if step_hash:
+		process_frames = partial(process_cache_frames, process_frames, step_hash)
+	process_frames = partial(process_staging_frames, process_frames)
+
+	for staging_directory_path in { os.path.dirname(get_temp_staging_path(queue_payload.get('frame_path'))) for queue_payload in queue_payloads }:
+		create_directory(staging_directory_path)
+
+	with tqdm(total = len(processed_frames) + len(queue_payloads), initial = len(processed_frames), desc = wording.get('processing'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
 		progress.set_postfix(
 		{
 			'execution_providers': state_manager.get_item('execution_providers'),
+			'execution_backend': state_manager.get_item('execution_backend'),
 			'execution_thread_count': state_manager.get_item('execution_thread_count'),
 			'execution_queue_count': state_manager.get_item('execution_queue_count')
 		})
-		with ThreadPoolExecutor(max_workers = state_manager.get_item('execution_thread_count')) as executor:
-			futures = []
+		with create_executor() as executor:
+			futures : Dict[Future[Any], List[QueuePayload]] = {}
 			queue : Queue[QueuePayload] = create_queue(queue_payloads)
-			queue_per_future = max(len(queue_payloads) // state_manager.get_item('execution_thread_count') * state_manager.get_item('execution_queue_count'), 1)
+			staging_payloads : List[QueuePayload] = []
+			checkpoint_time = time()
+			future_limit = state_manager.get_item('execution_thread_count') * 2
+
+			while futures or (not queue.empty() and process_manager.is_processing()):
+				while not queue.empty() and len(futures) < future_limit and process_manager.is_processing():
+					future_payloads = pick_queue(queue, queue_per_future)
+					if isinstance(executor, ProcessPoolExecutor):
+						future = executor.submit(process_frames_in_process, process_frames, source_paths, future_payloads)
+					else:
+						future = executor.submit(process_frames, source_paths, future_payloads, progress.update)
+					futures[future] = future_payloads
+
+				futures_done, _ = wait(futures, return_when = FIRST_COMPLETED)
+				if process_manager.is_stopping():
+					for future in futures:
+						future.cancel()
+
+				for future_done in futures_done:
+					future_payloads = futures.pop(future_done)
+					if future_done.cancelled() or not process_manager.is_processing():
+						continue
+					if isinstance(executor, ProcessPoolExecutor):
+						progress.update(future_done.result())
+					else:
+						future_done.result()
+					staging_payloads.extend(future_payloads)
+
+				if staging_payloads and (not futures or len(staging_payloads) >= CHECKPOINT_FRAME_LIMIT or time() - checkpoint_time > CHECKPOINT_INTERVAL):
+					commit_staging_frames(step_name, processed_frames, staging_payloads)
+					reorder_buffer.update({ queue_payload.get('frame_number'): queue_payload for queue_payload in staging_payloads })
+					reorder_frame_number = consume_reorder_frames(reorder_buffer, reorder_frame_number, consume_frame)
+					staging_payloads = []
+					checkpoint_time = time()
+
+
+def recover_staging_frames(queue_payloads : List[QueuePayload], step_name : str) -> Set[int]:
+	processed_frames = set(get_processed_frames(state_manager.get_item('target_path'), step_name))
+
+	for queue_payload in queue_payloads:
+		staging_frame_path = get_temp_staging_path(queue_payload.get('frame_path'))
+		if is_file(staging_frame_path):
+			if queue_payload.get('frame_number') in processed_frames:
+				os.replace(staging_frame_path, queue_payload.get('frame_path'))
+			else:
+				remove_file(staging_frame_path)
+	return processed_frames
+
+
+def process_staging_frames(process_frames : ProcessFrames, source_paths : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
+	staging_payloads : List[QueuePayload] = []
+
+	for queue_payload in queue_payloads:
+		staging_payload : QueuePayload =\
+		{
+			'frame_number': queue_payload.get('frame_number'),
+			'frame_path': queue_payload.get('frame_path'),
+			'output_frame_path': get_temp_staging_path(queue_payload.get('frame_path'))
+		}
+		staging_payloads.append(staging_payload)
+	process_frames(source_paths, staging_payloads, update_progress)
+	set_track_frame_number(None)
+
+
+def commit_staging_frames(step_name : str, processed_frames : Set[int], staging_payloads : List[QueuePayload]) -> None:
+	commit_payloads = [ queue_payload for queue_payload in staging_payloads if is_file(get_temp_staging_path(queue_payload.get('frame_path'))) ]
+	processed_frames.update(queue_payload.get('frame_number') for queue_payload in commit_payloads)
+	set_processed_frames(state_manager.get_item('target_path'), step_name, processed_frames)
+
+	for queue_payload in commit_payloads:
+		os.replace(get_temp_staging_path(queue_payload.get('frame_path')), queue_payload.get('frame_path'))
 
-			while not queue.empty():
-				future = executor.submit(process_frames, source_paths, pick_queue(queue, queue_per_future), progress.update)
-				futures.append(future)
 
-			for future_done in as_completed(futures):
-				future_done.result()
+def consume_reorder_frames(reorder_buffer : Dict[int, QueuePayload], reorder_frame_number : int, consume_frame : Optional[ConsumeFrame]) -> int:
+	while reorder_frame_number in reorder_buffer:
+		queue_payload = reorder_buffer.pop(reorder_frame_number)
+		if consume_frame:
+			consume_frame(queue_payload)
+		reorder_frame_number += 1
+	return reorder_frame_number
+
+
+def get_step_modules(process_frames : ProcessFrames) -> List[ModuleType]:
+	if process_frames == process_chain_frames:
+		return get_processors_modules(state_manager.get_item('processors'))
+	return [ importlib.import_module(process_frames.__module__) ]
+
+
+def calc_queue_per_future(step_modules : List[ModuleType]) -> int:
+	queue_per_future = state_manager.get_item('execution_queue_count')
+	step_names = [ step_module.__name__.split('.')[-1] for step_module in step_modules ]
+
+	if 'face_swapper' in step_names and state_manager.get_item('face_swapper_batch_size'):
+		queue_per_future = max(queue_per_future, state_manager.get_item('face_swapper_batch_size'))
+	return queue_per_future
+
+
+def create_executor() -> Executor:
+	if state_manager.get_item('execution_backend') == 'process':
+		return ProcessPoolExecutor(max_workers = state_manager.get_item('execution_thread_count'), mp_context = multiprocessing.get_context('spawn'), initializer = init_process, initargs = (state_manager.get_state(), get_reference_faces()))
+	return ThreadPoolExecutor(max_workers = state_manager.get_item('execution_thread_count'), initializer = bind_app_context, initargs = (detect_app_context(),))
+
+
+def init_process(state : Union[State, ProcessorState], reference_faces : Optional[FaceSet]) -> None:
+	bind_app_context('cli')
+	for key, value in state.items():
+		state_manager.init_item(key, value) #type:ignore[arg-type]
+	if reference_faces:
+		for name, faces in reference_faces.items():
+			for face in faces:
+				append_reference_face(name, face)
+	logger.init(state_manager.get_item('log_level'))
+	process_manager.start()
+	Finalize(None, close_frame_rings, exitpriority = 0)
+
+
+def process_frames_in_process(process_frames : ProcessFrames, source_paths : List[str], queue_payloads : List[QueuePayload]) -> int:
+	process_frames(source_paths, queue_payloads, lambda _: None)
+	return len(queue_payloads)
 
 
 def create_queue(queue_payloads : List[QueuePayload]) -> Queue[QueuePayload]:
@@ -104,7 +261,283 @@ def create_queue_payloads(temp_frame_paths : List[str]) -> List[QueuePayload]:
 		frame_payload : QueuePayload =\
 		{
 			'frame_number': frame_number,
-			'frame_path': frame_path
+			'frame_path': frame_path,
+			'output_frame_path': frame_path
 		}
 		queue_payloads.append(frame_payload)
 	return queue_payloads
+
+
+def multi_process_chain(source_paths : List[str], target_path : str, temp_frame_paths : List[str]) -> bool:
+	frame_queue : Queue[Optional[str]] = Queue()
+	encode_failed = threading.Event()
+	video_encoder = open_frame_encoder(target_path, state_manager.get_item('output_video_resolution'), state_manager.get_item('output_video_fps'))
+	encode_thread = threading.Thread(target = write_frame_files, args = (video_encoder, frame_queue, encode_failed), daemon = True)
+	encode_thread.start()
+	multi_process_frames(source_paths, temp_frame_paths, process_chain_frames, partial(consume_frame_file, frame_queue, encode_failed))
+	frame_queue.put(None)
+	encode_thread.join()
+
+	for processor_module in get_processors_modules(state_manager.get_item('processors')):
+		processor_module.post_process()
+	return close_frame_encoder(video_encoder, encode_failed)
+
+
+def consume_frame_file(frame_queue : Queue[Optional[str]], encode_failed : threading.Event, queue_payload : QueuePayload) -> None:
+	if not encode_failed.is_set():
+		frame_queue.put(queue_payload.get('frame_path'))
+
+
+def write_frame_files(video_encoder : subprocess.Popen[bytes], frame_queue : Queue[Optional[str]], encode_failed : threading.Event) -> None:
+	frame_path = frame_queue.get()
+
+	while frame_path:
+		if not encode_failed.is_set():
+			try:
+				with open(frame_path, 'rb') as frame_file:
+					shutil.copyfileobj(frame_file, video_encoder.stdin)
+			except (BrokenPipeError, OSError) as exception:
+				logger.error(wording.get('encoding_frames_failed'), __name__)
+				logger.debug(str(exception), __name__)
+				encode_failed.set()
+		frame_path = frame_queue.get()
+
+
+def close_frame_encoder(video_encoder : subprocess.Popen[bytes], encode_failed : threading.Event) -> bool:
+	try:
+		video_encoder.stdin.close()
+	except (BrokenPipeError, OSError):
+		pass
+	if process_manager.is_stopping() or encode_failed.is_set():
+		video_encoder.terminate()
+	video_encoder.wait()
+	return process_manager.is_processing() and not encode_failed.is_set() and video_encoder.returncode == 0
+
+
+def process_chain_frames(source_paths : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
+	processor_modules = get_processors_modules(state_manager.get_item('processors'))
+	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
+	source_frames = read_static_images(filter_image_paths(source_paths))
+	source_faces = get_many_faces(source_frames)
+	source_face = get_average_face(source_faces)
+	source_audio_path = get_first(filter_audio_paths(source_paths))
+	temp_video_fps = restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
+
+	for queue_payload in process_manager.manage(queue_payloads):
+		frame_number = queue_payload.get('frame_number')
+		target_vision_path = queue_payload.get('frame_path')
+		source_audio_frame = get_chain_audio_frame(source_audio_path, temp_video_fps, frame_number)
+		target_vision_frame = read_image(target_vision_path)
+		output_vision_frame = process_chain_frame(processor_modules, reference_faces, source_face, source_audio_frame, target_vision_frame, frame_number)
+		write_image(queue_payload.get('output_frame_path'), output_vision_frame)
+		update_progress(1)
+
+
+def multi_process_stream(source_paths : List[str], target_path : str, temp_video_resolution : str, temp_video_fps : Fps) -> bool:
+	processor_modules = get_processors_modules(state_manager.get_item('processors'))
+	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
+	source_frames = read_static_images(filter_image_paths(source_paths))
+	source_faces = get_many_faces(source_frames)
+	source_face = get_average_face(source_faces)
+	source_audio_path = get_first(filter_audio_paths(source_paths))
+	stream_frame_total = count_stream_frame_total(target_path, temp_video_fps)
+	stream_queue_count = state_manager.get_item('execution_thread_count') * state_manager.get_item('execution_queue_count')
+	stream_queue : Queue[Optional[Tuple[int, int]]] = Queue()
+	free_slot_queue : Queue[Optional[int]] = Queue()
+	temp_video_width, temp_video_height = unpack_resolution(temp_video_resolution)
+	input_frame_ring = create_frame_ring(stream_queue_count * 2, (temp_video_height, temp_video_width, 3))
+	output_frame_ring = None
+	video_decoder = open_video_decoder(target_path, temp_video_resolution, temp_video_fps)
+	video_encoder = None
+
+	for frame_slot in range(get_frame_slot_total(input_frame_ring)):
+		free_slot_queue.put(frame_slot)
+	if source_audio_path:
+		read_static_voice(source_audio_path, temp_video_fps)
+	stream_thread = threading.Thread(target = read_stream_frames, args = (video_decoder, input_frame_ring, free_slot_queue, stream_queue), daemon = True)
+	stream_thread.start()
+	stream_state = False
+
+	try:
+		with tqdm(total = stream_frame_total, desc = wording.get('processing'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
+			progress.set_postfix(
+			{
+				'execution_providers': state_manager.get_item('execution_providers'),
+				'execution_backend': state_manager.get_item('execution_backend'),
+				'execution_thread_count': state_manager.get_item('execution_thread_count'),
+				'execution_queue_count': state_manager.get_item('execution_queue_count')
+			})
+			with create_executor() as executor:
+				futures : Deque[Tuple[int, Future[Optional[VisionFrame]]]] = deque()
+				stream_payload = stream_queue.get()
+
+				while (stream_payload or futures) and process_manager.is_processing():
+					if stream_payload and len(futures) < stream_queue_count:
+						frame_number, frame_slot = stream_payload
+						if isinstance(executor, ProcessPoolExecutor):
+							future = executor.submit(process_stream_slot, source_paths, temp_video_fps, get_frame_ring_name(input_frame_ring), get_frame_ring_name(output_frame_ring) if output_frame_ring else None, frame_slot)
+						else:
+							source_audio_frame = get_chain_audio_frame(source_audio_path, temp_video_fps, frame_number)
+							future = executor.submit(process_chain_frame, processor_modules, reference_faces, source_face, source_audio_frame, read_frame_slot(input_frame_ring, frame_slot), frame_number)
+						futures.append((frame_slot, future))
+						stream_payload = stream_queue.get()
+
+					if futures and (futures[0][1].done() or len(futures) >= stream_queue_count or not stream_payload):
+						frame_slot, future = futures.popleft()
+						output_vision_frame = future.result()
+
+						if output_vision_frame is None and output_frame_ring:
+							output_vision_frame = read_frame_slot(output_frame_ring, frame_slot)
+						elif isinstance(executor, ProcessPoolExecutor) and not output_frame_ring:
+							output_frame_ring = create_frame_ring(get_frame_slot_total(input_frame_ring), output_vision_frame.shape)
+						video_encoder = video_encoder or open_video_encoder(target_path, pack_stream_resolution(output_vision_frame), state_manager.get_item('output_video_resolution'), state_manager.get_item('output_video_fps'))
+						write_stream_frame(video_encoder, output_vision_frame)
+						del output_vision_frame
+						set_frame_slot(input_frame_ring, frame_slot, -1, 'free')
+						free_slot_queue.put(frame_slot)
+						progress.update()
+
+				for _, future in futures:
+					future.cancel()
+
+		for processor_module in processor_modules:
+			processor_module.post_process()
+		stream_state = True
+	except BrokenPipeError as exception:
+		logger.debug(str(exception), __name__)
+	finally:
+		free_slot_queue.put(None)
+		stream_thread.join()
+		if not stream_state:
+			terminate_stream(video_decoder, video_encoder)
+		stream_state = close_stream(video_decoder, video_encoder) and stream_state
+		destroy_frame_ring(input_frame_ring)
+		if output_frame_ring:
+			destroy_frame_ring(output_frame_ring)
+	return stream_state
+
+
+def read_stream_frames(video_decoder : subprocess.Popen[bytes], frame_ring : FrameRing, free_slot_queue : Queue[Optional[int]], stream_queue : Queue[Optional[Tuple[int, int]]]) -> None:
+	frame_number = 0
+	frame_slot = free_slot_queue.get()
+
+	while frame_slot is not None:
+		with get_frame_slot_buffer(frame_ring, frame_slot) as frame_buffer:
+			if video_decoder.stdout.readinto(frame_buffer) < frame_buffer.nbytes: #type:ignore[attr-defined]
+				break
+		set_frame_slot(frame_ring, frame_slot, frame_number, 'decoded')
+		stream_queue.put((frame_number, frame_slot))
+		frame_number += 1
+		frame_slot = free_slot_queue.get()
+	stream_queue.put(None)
+
+
+def process_stream_slot(source_paths : List[str], temp_video_fps : Fps, input_frame_ring_name : str, output_frame_ring_name : Optional[str], frame_slot : int) -> Optional[VisionFrame]:
+	processor_modules = get_processors_modules(state_manager.get_item('processors'))
+	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
+	source_frames = read_static_images(filter_image_paths(source_paths))
+	source_faces = get_many_faces(source_frames)
+	source_face = get_average_face(source_faces)
+	source_audio_path = get_first(filter_audio_paths(source_paths))
+	input_frame_ring = attach_frame_ring(input_frame_ring_name)
+	frame_number = get_frame_slot_number(input_frame_ring, frame_slot)
+	source_audio_frame = get_chain_audio_frame(source_audio_path, temp_video_fps, frame_number)
+	output_vision_frame = process_chain_frame(processor_modules, reference_faces, source_face, source_audio_frame, read_frame_slot(input_frame_ring, frame_slot), frame_number)
+
+	if output_frame_ring_name and write_frame_slot(attach_frame_ring(output_frame_ring_name), frame_slot, frame_number, output_vision_frame):
+		return None
+	return output_vision_frame
+
+
+def write_stream_frame(video_encoder : subprocess.Popen[bytes], vision_frame : VisionFrame) -> None:
+	video_encoder.stdin.write(vision_frame.astype(numpy.uint8).tobytes())
+
+
+def close_stream(video_decoder : subprocess.Popen[bytes], video_encoder : Optional[subprocess.Popen[bytes]]) -> bool:
+	video_decoder.stdout.close()
+	if process_manager.is_stopping():
+		video_decoder.terminate()
+	video_decoder.wait()
+
+	if video_encoder:
+		try:
+			video_encoder.stdin.close()
+		except (BrokenPipeError, OSError):
+			pass
+		if process_manager.is_stopping():
+			video_encoder.terminate()
+		video_encoder.wait()
+		return process_manager.is_processing() and video_decoder.returncode == 0 and video_encoder.returncode == 0
+	return False
+
+
+def terminate_stream(video_decoder : subprocess.Popen[bytes], video_encoder : Optional[subprocess.Popen[bytes]]) -> None:
+	for stream_process in [ video_decoder, video_encoder ]:
+		if stream_process and stream_process.poll() is None:
+			stream_process.terminate()
+
+
+def process_chain_frame(processor_modules : List[ModuleType], reference_faces : FaceSet, source_face : Face, source_audio_frame : AudioFrame, target_vision_frame : VisionFrame, frame_number : int) -> VisionFrame:
+	source_vision_frame = target_vision_frame
+	target_vision_frame = target_vision_frame.copy()
+	frame_hash = None
+	set_track_frame_number(frame_number)
+
+	for processor_module in processor_modules:
+		output_vision_frame = processor_module.process_frame(
+		{
+			'reference_faces': reference_faces,
+			'source_face': source_face,
+			'source_audio_frame': source_audio_frame,
+			'source_vision_frame': source_vision_frame,
+			'target_vision_frame': target_vision_frame
+		})
+		if processor_module.__name__.split('.')[-1] in FACE_PRESERVING_PROCESSORS:
+			frame_hash = forward_static_faces(frame_hash or create_frame_hash(target_vision_frame), output_vision_frame)
+		else:
+			frame_hash = None
+		target_vision_frame = output_vision_frame
+	set_track_frame_number(None)
+	return target_vision_frame
+
+
+def forward_static_faces(frame_hash : Optional[str], output_vision_frame : VisionFrame) -> Optional[str]:
+	static_faces = find_static_faces(frame_hash)
+	output_frame_hash = create_frame_hash(output_vision_frame)
+
+	if static_faces:
+		store_static_faces(output_frame_hash, static_faces)
+	return output_frame_hash
+
+
+def get_chain_audio_frame(source_audio_path : str, temp_video_fps : Fps, frame_number : int) -> AudioFrame:
+	if source_audio_path:
+		source_audio_frame = get_voice_frame(source_audio_path, temp_video_fps, frame_number + calc_audio_frame_offset(temp_video_fps))
+		if numpy.any(source_audio_frame):
+			return source_audio_frame
+	return create_empty_audio_frame()
+
+
+def calc_audio_frame_offset(temp_video_fps : Fps) -> int:
+	video_fps = detect_video_fps(state_manager.get_item('target_path'))
+	video_segment_offset = state_manager.get_item('video_segment_offset')
+
+	if video_fps and video_segment_offset:
+		return round(video_segment_offset * temp_video_fps / video_fps)
+	return 0
+
+
+def count_stream_frame_total(target_path : str, temp_video_fps : Fps) -> int:
+	video_frame_total = count_video_frame_total(target_path)
+	video_fps = detect_video_fps(target_path)
+	trim_frame_start = state_manager.get_item('trim_frame_start') or 0
+	trim_frame_end = state_manager.get_item('trim_frame_end') or video_frame_total
+
+	if video_fps:
+		return round((trim_frame_end - trim_frame_start) * temp_video_fps / video_fps)
+	return 0
+
+
+def pack_stream_resolution(vision_frame : VisionFrame) -> str:
+	height, width = vision_frame.shape[:2]
+	return str(width) + 'x' + str(height)
@@ -17,6 +17,7 @@ from facefusion.face_helper import merge_matrix, paste_back, scale_face_landmark
 from facefusion.face_masker import create_occlusion_mask, create_static_box_mask
 from facefusion.face_selector import find_similar_faces, sort_and_filter_faces
 from facefusion.face_store import get_reference_faces
+from facefusion.face_tracker import set_track_frame_number
 from facefusion.filesystem import in_directory, is_image, is_video, resolve_relative_path, same_file_extension
 from facefusion.processors import choices as processors_choices
 from facefusion.processors.typing import AgeModifierInputs
@@ -242,6 +243,7 @@ def process_frames(source_path : List[str], queue_payloads : List[QueuePayload],
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
 
 	for queue_payload in process_manager.manage(queue_payloads):
+		set_track_frame_number(queue_payload.get('frame_number'))
 		target_vision_path = queue_payload['frame_path']
 		target_vision_frame = read_image(target_vision_path)
 		output_vision_frame = process_frame(
@@ -249,7 +251,7 @@ def process_frames(source_path : List[str], queue_payloads : List[QueuePayload],
 			'reference_faces': reference_faces,
 			'target_vision_frame': target_vision_frame
 		})
-		write_image(target_vision_path, output_vision_frame)
+		write_image(queue_payload.get('output_frame_path'), output_vision_frame)
 		update_progress(1)
 
 
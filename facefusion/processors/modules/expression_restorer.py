@@ -15,15 +15,16 @@ from facefusion.face_helper import paste_back, warp_face_by_face_landmark_5
 from facefusion.face_masker import create_occlusion_mask, create_static_box_mask
 from facefusion.face_selector import find_similar_faces, sort_and_filter_faces
 from facefusion.face_store import get_reference_faces
+from facefusion.face_tracker import set_track_frame_number
 from facefusion.filesystem import in_directory, is_image, is_video, resolve_relative_path, same_file_extension
 from facefusion.processors import choices as processors_choices
 from facefusion.processors.live_portrait import create_rotation, limit_expression
 from facefusion.processors.typing import ExpressionRestorerInputs
 from facefusion.processors.typing import LivePortraitExpression, LivePortraitFeatureVolume, LivePortraitMotionPoints, LivePortraitPitch, LivePortraitRoll, LivePortraitScale, LivePortraitTranslation, LivePortraitYaw
 from facefusion.program_helper import find_argument_group
-from facefusion.thread_helper import conditional_thread_semaphore, thread_semaphore
+from facefusion.thread_helper import thread_semaphore
 from facefusion.typing import ApplyStateItem, Args, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
-from facefusion.vision import get_video_frame, read_image, read_static_image, write_image
+from facefusion.vision import clear_video_readers, read_image, read_static_image, read_video_frame, write_image
 
 MODEL_SET : ModelSet =\
 {
@@ -122,6 +123,7 @@ def pre_process(mode : ProcessMode) -> bool:
 
 def post_process() -> None:
 	read_static_image.cache_clear()
+	clear_video_readers()
 	if state_manager.get_item('video_memory_strategy') in [ 'strict', 'moderate' ]:
 		clear_inference_pool()
 	if state_manager.get_item('video_memory_strategy') == 'strict':
@@ -176,11 +178,10 @@ def apply_restore(source_crop_vision_frame : VisionFrame, target_crop_vision_fra
 def forward_extract_feature(crop_vision_frame : VisionFrame) -> LivePortraitFeatureVolume:
 	feature_extractor = get_inference_pool().get('feature_extractor')
 
-	with conditional_thread_semaphore():
-		feature_volume = feature_extractor.run(None,
-		{
-			'input': crop_vision_frame
-		})[0]
+	feature_volume = inference_manager.run_inference(feature_extractor,
+	{
+		'input': crop_vision_frame
+	})[0]
 
 	return feature_volume
 
@@ -188,11 +189,10 @@ def forward_extract_feature(crop_vision_frame : VisionFrame) -> LivePortraitFeat
 def forward_extract_motion(crop_vision_frame : VisionFrame) -> Tuple[LivePortraitPitch, LivePortraitYaw, LivePortraitRoll, LivePortraitScale, LivePortraitTranslation, LivePortraitExpression, LivePortraitMotionPoints]:
 	motion_extractor = get_inference_pool().get('motion_extractor')
 
-	with conditional_thread_semaphore():
-		pitch, yaw, roll, scale, translation, expression, motion_points = motion_extractor.run(None,
-		{
-			'input': crop_vision_frame
-		})
+	pitch, yaw, roll, scale, translation, expression, motion_points = inference_manager.run_inference(motion_extractor,
+	{
+		'input': crop_vision_frame
+	})
 
 	return pitch, yaw, roll, scale, translation, expression, motion_points
 
@@ -255,12 +255,14 @@ def process_frame(inputs : ExpressionRestorerInputs) -> VisionFrame:
 
 def process_frames(source_path : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
+	frame_cache_total = processors.calc_queue_per_future(processors.get_step_modules(process_frames)) * state_manager.get_item('execution_thread_count') * 2
 
 	for queue_payload in process_manager.manage(queue_payloads):
+		set_track_frame_number(queue_payload.get('frame_number'))
 		frame_number = queue_payload.get('frame_number')
 		if state_manager.get_item('trim_frame_start'):
 			frame_number += state_manager.get_item('trim_frame_start')
-		source_vision_frame = get_video_frame(state_manager.get_item('target_path'), frame_number)
+		source_vision_frame = read_video_frame(state_manager.get_item('target_path'), frame_number, frame_cache_total)
 		target_vision_path = queue_payload.get('frame_path')
 		target_vision_frame = read_image(target_vision_path)
 		output_vision_frame = process_frame(
@@ -269,7 +271,7 @@ def process_frames(source_path : List[str], queue_payloads : List[QueuePayload],
 			'source_vision_frame': source_vision_frame,
 			'target_vision_frame': target_vision_frame
 		})
-		write_image(target_vision_path, output_vision_frame)
+		write_image(queue_payload.get('output_frame_path'), output_vision_frame)
 		update_progress(1)
 
 
@@ -13,6 +13,7 @@ from facefusion.face_helper import warp_face_by_face_landmark_5
 from facefusion.face_masker import create_occlusion_mask, create_region_mask, create_static_box_mask
 from facefusion.face_selector import find_similar_faces, sort_and_filter_faces
 from facefusion.face_store import get_reference_faces
+from facefusion.face_tracker import set_track_frame_number
 from facefusion.filesystem import in_directory, same_file_extension
 from facefusion.processors import choices as processors_choices
 from facefusion.processors.typing import FaceDebuggerInputs
@@ -196,6 +197,7 @@ def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload]
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
 
 	for queue_payload in process_manager.manage(queue_payloads):
+		set_track_frame_number(queue_payload.get('frame_number'))
 		target_vision_path = queue_payload['frame_path']
 		target_vision_frame = read_image(target_vision_path)
 		output_vision_frame = process_frame(
@@ -203,7 +205,7 @@ def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload]
 			'reference_faces': reference_faces,
 			'target_vision_frame': target_vision_frame
 		})
-		write_image(target_vision_path, output_vision_frame)
+		write_image(queue_payload.get('output_frame_path'), output_vision_frame)
 		update_progress(1)
 
 
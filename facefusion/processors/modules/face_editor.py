@@ -15,12 +15,13 @@ from facefusion.face_helper import paste_back, scale_face_landmark_5, warp_face_
 from facefusion.face_masker import create_static_box_mask
 from facefusion.face_selector import find_similar_faces, sort_and_filter_faces
 from facefusion.face_store import get_reference_faces
+from facefusion.face_tracker import set_track_frame_number
 from facefusion.filesystem import in_directory, is_image, is_video, resolve_relative_path, same_file_extension
 from facefusion.processors import choices as processors_choices
 from facefusion.processors.live_portrait import create_rotation, limit_euler_angles, limit_expression
 from facefusion.processors.typing import FaceEditorInputs, LivePortraitExpression, LivePortraitFeatureVolume, LivePortraitMotionPoints, LivePortraitPitch, LivePortraitRoll, LivePortraitRotation, LivePortraitScale, LivePortraitTranslation, LivePortraitYaw
 from facefusion.program_helper import find_argument_group
-from facefusion.thread_helper import conditional_thread_semaphore, thread_semaphore
+from facefusion.thread_helper import thread_semaphore
 from facefusion.typing import ApplyStateItem, Args, Face, FaceLandmark68, InferencePool, ModelOptions, ModelSet, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
 from facefusion.vision import read_image, read_static_image, write_image
 
@@ -230,11 +231,10 @@ def apply_edit(crop_vision_frame : VisionFrame, face_landmark_68 : FaceLandmark6
 def forward_extract_feature(crop_vision_frame : VisionFrame) -> LivePortraitFeatureVolume:
 	feature_extractor = get_inference_pool().get('feature_extractor')
 
-	with conditional_thread_semaphore():
-		feature_volume = feature_extractor.run(None,
-		{
-			'input': crop_vision_frame
-		})[0]
+	feature_volume = inference_manager.run_inference(feature_extractor,
+	{
+		'input': crop_vision_frame
+	})[0]
 
 	return feature_volume
 
@@ -242,11 +242,10 @@ def forward_extract_feature(crop_vision_frame : VisionFrame) -> LivePortraitFeat
 def forward_extract_motion(crop_vision_frame : VisionFrame) -> Tuple[LivePortraitPitch, LivePortraitYaw, LivePortraitRoll, LivePortraitScale, LivePortraitTranslation, LivePortraitExpression, LivePortraitMotionPoints]:
 	motion_extractor = get_inference_pool().get('motion_extractor')
 
-	with conditional_thread_semaphore():
-		pitch, yaw, roll, scale, translation, expression, motion_points = motion_extractor.run(None,
-		{
-			'input': crop_vision_frame
-		})
+	pitch, yaw, roll, scale, translation, expression, motion_points = inference_manager.run_inference(motion_extractor,
+	{
+		'input': crop_vision_frame
+	})
 
 	return pitch, yaw, roll, scale, translation, expression, motion_points
 
@@ -254,11 +253,10 @@ def forward_extract_motion(crop_vision_frame : VisionFrame) -> Tuple[LivePortrai
 def forward_retarget_eye(eye_motion_points : LivePortraitMotionPoints) -> LivePortraitMotionPoints:
 	eye_retargeter = get_inference_pool().get('eye_retargeter')
 
-	with conditional_thread_semaphore():
-		eye_motion_points = eye_retargeter.run(None,
-		{
-			'input': eye_motion_points
-		})[0]
+	eye_motion_points = inference_manager.run_inference(eye_retargeter,
+	{
+		'input': eye_motion_points
+	})[0]
 
 	return eye_motion_points
 
@@ -266,11 +264,10 @@ def forward_retarget_eye(eye_motion_points : LivePortraitMotionPoints) -> LivePo
 def forward_retarget_lip(lip_motion_points : LivePortraitMotionPoints) -> LivePortraitMotionPoints:
 	lip_retargeter = get_inference_pool().get('lip_retargeter')
 
-	with conditional_thread_semaphore():
-		lip_motion_points = lip_retargeter.run(None,
-		{
-			'input': lip_motion_points
-		})[0]
+	lip_motion_points = inference_manager.run_inference(lip_retargeter,
+	{
+		'input': lip_motion_points
+	})[0]
 
 	return lip_motion_points
 
@@ -502,6 +499,7 @@ def process_frames(source_path : List[str], queue_payloads : List[QueuePayload],
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
 
 	for queue_payload in process_manager.manage(queue_payloads):
+		set_track_frame_number(queue_payload.get('frame_number'))
 		target_vision_path = queue_payload['frame_path']
 		target_vision_frame = read_image(target_vision_path)
 		output_vision_frame = process_frame(
@@ -509,7 +507,7 @@ def process_frames(source_path : List[str], queue_payloads : List[QueuePayload],
 			'reference_faces': reference_faces,
 			'target_vision_frame': target_vision_frame
 		})
-		write_image(target_vision_path, output_vision_frame)
+		write_image(queue_payload.get('output_frame_path'), output_vision_frame)
 		update_progress(1)
 
 
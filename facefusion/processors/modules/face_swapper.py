@@ -1,13 +1,16 @@
+import hashlib
+import threading
 from argparse import ArgumentParser
-from typing import List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy
+from numpy.typing import NDArray
 
 import facefusion.jobs.job_manager
 import facefusion.jobs.job_store
 import facefusion.processors.core as processors
 from facefusion import config, content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, inference_manager, logger, process_manager, state_manager, wording
-from facefusion.common_helper import get_first
+from facefusion.common_helper import create_int_metavar, get_first
 from facefusion.download import conditional_download_hashes, conditional_download_sources
 from facefusion.execution import has_execution_provider
 from facefusion.face_analyser import get_average_face, get_many_faces, get_one_face
@@ -15,14 +18,14 @@ from facefusion.face_helper import paste_back, warp_face_by_face_landmark_5
 from facefusion.face_masker import create_occlusion_mask, create_region_mask, create_static_box_mask
 from facefusion.face_selector import find_similar_faces, sort_and_filter_faces
 from facefusion.face_store import get_reference_faces
+from facefusion.face_tracker import set_track_frame_number
 from facefusion.filesystem import filter_image_paths, has_image, in_directory, is_image, is_video, resolve_relative_path, same_file_extension
-from facefusion.inference_manager import get_static_model_initializer
+from facefusion.inference_manager import get_static_model_initializer, has_dynamic_batch
 from facefusion.processors import choices as processors_choices
 from facefusion.processors.pixel_boost import explode_pixel_boost, implode_pixel_boost
-from facefusion.processors.typing import FaceSwapperInputs
+from facefusion.processors.typing import FaceSwapperInputs, FaceSwapperSourceContext
 from facefusion.program_helper import find_argument_group, suggest_face_swapper_pixel_boost_choices
-from facefusion.thread_helper import conditional_thread_semaphore
-from facefusion.typing import ApplyStateItem, Args, Embedding, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
+from facefusion.typing import ApplyStateItem, Args, Embedding, Face, FaceSet, InferencePool, Mask, Matrix, ModelOptions, ModelSet, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
 from facefusion.vision import read_image, read_static_image, read_static_images, unpack_resolution, write_image
 
 MODEL_SET : ModelSet =\
@@ -294,6 +297,9 @@ MODEL_SET : ModelSet =\
 		'standard_deviation': [ 0.5, 0.5, 0.5 ]
 	}
 }
+SOURCE_CONTEXT : Optional[FaceSwapperSourceContext] = None
+SOURCE_CONTEXT_LOCK : threading.RLock = threading.RLock()
+SOURCE_INPUTS : Dict[str, NDArray[Any]] = {}
 
 
 def get_inference_pool() -> InferencePool:
@@ -319,12 +325,14 @@ def register_args(program : ArgumentParser) -> None:
 		group_processors.add_argument('--face-swapper-model', help = wording.get('help.face_swapper_model'), default = config.get_str_value('processors.face_swapper_model', 'inswapper_128_fp16'), choices = processors_choices.face_swapper_set.keys())
 		face_swapper_pixel_boost_choices = suggest_face_swapper_pixel_boost_choices(program)
 		group_processors.add_argument('--face-swapper-pixel-boost', help = wording.get('help.face_swapper_pixel_boost'), default = config.get_str_value('processors.face_swapper_pixel_boost', get_first(face_swapper_pixel_boost_choices)), choices = face_swapper_pixel_boost_choices)
-		facefusion.jobs.job_store.register_step_keys([ 'face_swapper_model', 'face_swapper_pixel_boost' ])
+		group_processors.add_argument('--face-swapper-batch-size', help = wording.get('help.face_swapper_batch_size'), type = int, default = config.get_int_value('processors.face_swapper_batch_size', '8'), choices = processors_choices.face_swapper_batch_size_range, metavar = create_int_metavar(processors_choices.face_swapper_batch_size_range))
+		facefusion.jobs.job_store.register_step_keys([ 'face_swapper_model', 'face_swapper_pixel_boost', 'face_swapper_batch_size' ])
 
 
 def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('face_swapper_model', args.get('face_swapper_model'))
 	apply_state_item('face_swapper_pixel_boost', args.get('face_swapper_pixel_boost'))
+	apply_state_item('face_swapper_batch_size', args.get('face_swapper_batch_size'))
 
 
 def pre_check() -> bool:
@@ -339,10 +347,8 @@ def pre_process(mode : ProcessMode) -> bool:
 	if not has_image(state_manager.get_item('source_paths')):
 		logger.error(wording.get('choose_image_source') + wording.get('exclamation_mark'), __name__)
 		return False
-	source_image_paths = filter_image_paths(state_manager.get_item('source_paths'))
-	source_frames = read_static_images(source_image_paths)
-	source_faces = get_many_faces(source_frames)
-	if not get_one_face(source_faces):
+	source_context = get_source_context(state_manager.get_item('source_paths'))
+	if not get_one_face(source_context.get('source_faces')):
 		logger.error(wording.get('no_source_face_detected') + wording.get('exclamation_mark'), __name__)
 		return False
 	if mode in [ 'output', 'preview' ] and not is_image(state_manager.get_item('target_path')) and not is_video(state_manager.get_item('target_path')):
@@ -359,6 +365,9 @@ def pre_process(mode : ProcessMode) -> bool:
 
 def post_process() -> None:
 	read_static_image.cache_clear()
+	clear_source_context()
+	with SOURCE_CONTEXT_LOCK:
+		SOURCE_INPUTS.clear()
 	if state_manager.get_item('video_memory_strategy') in [ 'strict', 'moderate' ]:
 		clear_inference_pool()
 		get_static_model_initializer.cache_clear()
@@ -371,13 +380,69 @@ def post_process() -> None:
 		face_recognizer.clear_inference_pool()
 
 
+def get_source_context(source_paths : List[str]) -> FaceSwapperSourceContext:
+	global SOURCE_CONTEXT
+
+	with SOURCE_CONTEXT_LOCK:
+		if not SOURCE_CONTEXT or SOURCE_CONTEXT.get('source_paths') != source_paths or SOURCE_CONTEXT.get('face_swapper_model') != state_manager.get_item('face_swapper_model'):
+			SOURCE_CONTEXT = create_source_context(source_paths)
+	return SOURCE_CONTEXT
+
+
+def create_source_context(source_paths : List[str]) -> FaceSwapperSourceContext:
+	source_frames = read_static_images(filter_image_paths(source_paths))
+	source_faces = get_many_faces(source_frames)
+	source_face = get_average_face(source_faces)
+	source_context : FaceSwapperSourceContext =\
+	{
+		'source_paths': source_paths,
+		'face_swapper_model': state_manager.get_item('face_swapper_model'),
+		'source_frames': source_frames,
+		'source_faces': source_faces,
+		'source_face': source_face,
+		'source_input': get_source_input(source_face) if source_face else None
+	}
+	return source_context
+
+
+def clear_source_context() -> None:
+	global SOURCE_CONTEXT
+
+	SOURCE_CONTEXT = None
+
+
 def swap_face(source_face : Face, target_face : Face, temp_vision_frame : VisionFrame) -> VisionFrame:
-	model_template = get_model_options().get('template')
+	return get_first(swap_faces(source_face, [ [ target_face ] ], [ temp_vision_frame ]))
+
+
+def swap_faces(source_face : Face, target_faces_list : List[List[Face]], temp_vision_frames : List[VisionFrame]) -> List[VisionFrame]:
 	model_size = get_model_options().get('size')
 	pixel_boost_size = unpack_resolution(state_manager.get_item('face_swapper_pixel_boost'))
 	pixel_boost_total = pixel_boost_size[0] // model_size[0]
+	swap_items = []
+	pixel_boost_vision_frames : List[VisionFrame] = []
+
+	for frame_index, (target_faces, temp_vision_frame) in enumerate(zip(target_faces_list, temp_vision_frames)):
+		for target_face in target_faces:
+			crop_vision_frame, affine_matrix, crop_masks = prepare_swap_face(target_face, temp_vision_frame, pixel_boost_size)
+			swap_items.append((frame_index, affine_matrix, crop_masks))
+			pixel_boost_vision_frames.extend(prepare_crop_frame(pixel_boost_vision_frame) for pixel_boost_vision_frame in implode_pixel_boost(crop_vision_frame, pixel_boost_total, model_size))
+
+	if pixel_boost_vision_frames:
+		crop_vision_frames = forward_swap_faces(source_face, numpy.concatenate(pixel_boost_vision_frames))
+		temp_vision_frames = list(temp_vision_frames)
+		pixel_boost_frame_total = pixel_boost_total ** 2
+
+		for swap_index, (frame_index, affine_matrix, crop_masks) in enumerate(swap_items):
+			temp_crop_vision_frames = [ normalize_crop_frame(crop_vision_frame) for crop_vision_frame in crop_vision_frames[swap_index * pixel_boost_frame_total:(swap_index + 1) * pixel_boost_frame_total] ]
+			crop_vision_frame = explode_pixel_boost(temp_crop_vision_frames, pixel_boost_total, model_size, pixel_boost_size)
+			temp_vision_frames[frame_index] = paste_swap_face(temp_vision_frames[frame_index], crop_vision_frame, crop_masks, affine_matrix)
+	return temp_vision_frames
+
+
+def prepare_swap_face(target_face : Face, temp_vision_frame : VisionFrame, pixel_boost_size : Tuple[int, int]) -> Tuple[VisionFrame, Matrix, List[Mask]]:
+	model_template = get_model_options().get('template')
 	crop_vision_frame, affine_matrix = warp_face_by_face_landmark_5(temp_vision_frame, target_face.landmark_set.get('5/68'), model_template, pixel_boost_size)
-	temp_vision_frames = []
 	crop_masks = []
 
 	if 'box' in state_manager.get_item('face_mask_types'):
@@ -387,56 +452,85 @@ def swap_face(source_face : Face, target_face : Face, temp_vision_frame : Vision
 	if 'occlusion' in state_manager.get_item('face_mask_types'):
 		occlusion_mask = create_occlusion_mask(crop_vision_frame)
 		crop_masks.append(occlusion_mask)
+	return crop_vision_frame, affine_matrix, crop_masks
 
-	pixel_boost_vision_frames = implode_pixel_boost(crop_vision_frame, pixel_boost_total, model_size)
-	for pixel_boost_vision_frame in pixel_boost_vision_frames:
-		pixel_boost_vision_frame = prepare_crop_frame(pixel_boost_vision_frame)
-		pixel_boost_vision_frame = forward_swap_face(source_face, pixel_boost_vision_frame)
-		pixel_boost_vision_frame = normalize_crop_frame(pixel_boost_vision_frame)
-		temp_vision_frames.append(pixel_boost_vision_frame)
-	crop_vision_frame = explode_pixel_boost(temp_vision_frames, pixel_boost_total, model_size, pixel_boost_size)
 
+def paste_swap_face(temp_vision_frame : VisionFrame, crop_vision_frame : VisionFrame, crop_masks : List[Mask], affine_matrix : Matrix) -> VisionFrame:
 	if 'region' in state_manager.get_item('face_mask_types'):
 		region_mask = create_region_mask(crop_vision_frame, state_manager.get_item('face_mask_regions'))
-		crop_masks.append(region_mask)
+		crop_masks = crop_masks + [ region_mask ]
 
 	crop_mask = numpy.minimum.reduce(crop_masks).clip(0, 1)
 	temp_vision_frame = paste_back(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
 	return temp_vision_frame
 
 
-def forward_swap_face(source_face : Face, crop_vision_frame : VisionFrame) -> VisionFrame:
+def forward_swap_faces(source_face : Face, crop_vision_frames : VisionFrame) -> VisionFrame:
+	face_swapper = get_inference_pool().get('face_swapper')
+	face_swapper_batch_size = state_manager.get_item('face_swapper_batch_size') if has_dynamic_batch(face_swapper) else 1
+	output_vision_frames = []
+
+	for index in range(0, len(crop_vision_frames), face_swapper_batch_size):
+		output_vision_frames.append(forward_swap_face(source_face, crop_vision_frames[index:index + face_swapper_batch_size]))
+	return numpy.concatenate(output_vision_frames)
+
+
+def forward_swap_face(source_face : Face, crop_vision_frames : VisionFrame) -> VisionFrame:
 	face_swapper = get_inference_pool().get('face_swapper')
-	model_type = get_model_options().get('type')
 	face_swapper_inputs = {}
 
 	for face_swapper_input in face_swapper.get_inputs():
 		if face_swapper_input.name == 'source':
-			if model_type == 'blendswap' or model_type == 'uniface':
-				face_swapper_inputs[face_swapper_input.name] = prepare_source_frame(source_face)
-			else:
-				face_swapper_inputs[face_swapper_input.name] = prepare_source_embedding(source_face)
+			source_input = get_source_input(source_face)
+			face_swapper_inputs[face_swapper_input.name] = numpy.repeat(source_input, len(crop_vision_frames), axis = 0)
 		if face_swapper_input.name == 'target':
-			face_swapper_inputs[face_swapper_input.name] = crop_vision_frame
+			face_swapper_inputs[face_swapper_input.name] = crop_vision_frames
 
-	with conditional_thread_semaphore():
-		crop_vision_frame = face_swapper.run(None, face_swapper_inputs)[0][0]
+	crop_vision_frames = inference_manager.run_inference(face_swapper, face_swapper_inputs)[0]
 
-	return crop_vision_frame
+	return crop_vision_frames
 
 
 def forward_convert_embedding(embedding : Embedding) -> Embedding:
 	embedding_converter = get_inference_pool().get('embedding_converter')
 
-	with conditional_thread_semaphore():
-		embedding = embedding_converter.run(None,
-		{
-			'input': embedding
-		})[0]
+	embedding = inference_manager.run_inference(embedding_converter,
+	{
+		'input': embedding
+	})[0]
 
 	return embedding
 
 
+def get_source_input(source_face : Face) -> NDArray[Any]:
+	source_input_key = create_source_input_key(source_face)
+
+	with SOURCE_CONTEXT_LOCK:
+		if source_input_key not in SOURCE_INPUTS:
+			SOURCE_INPUTS[source_input_key] = prepare_source_input(source_face)
+		return SOURCE_INPUTS[source_input_key]
+
+
+def create_source_input_key(source_face : Face) -> str:
+	model_type = get_model_options().get('type')
+	source_input_hash = hashlib.blake2b(state_manager.get_item('face_swapper_model').encode(), digest_size = 16)
+
+	if model_type == 'blendswap' or model_type == 'uniface':
+		source_input_hash.update(get_first(state_manager.get_item('source_paths')).encode())
+		source_input_hash.update(source_face.landmark_set.get('5/68').tobytes())
+	else:
+		source_input_hash.update(source_face.embedding.tobytes())
+	return source_input_hash.hexdigest()
+
+
+def prepare_source_input(source_face : Face) -> NDArray[Any]:
+	model_type = get_model_options().get('type')
+
+	if model_type == 'blendswap' or model_type == 'uniface':
+		return prepare_source_frame(source_face)
+	return prepare_source_embedding(source_face)
+
+
 def prepare_source_frame(source_face : Face) -> VisionFrame:
 	model_type = get_model_options().get('type')
 	source_vision_frame = read_static_image(get_first(state_manager.get_item('source_paths')))
@@ -504,52 +598,61 @@ def get_reference_frame(source_face : Face, target_face : Face, temp_vision_fram
 	return swap_face(source_face, target_face, temp_vision_frame)
 
 
-def process_frame(inputs : FaceSwapperInputs) -> VisionFrame:
-	reference_faces = inputs.get('reference_faces')
-	source_face = inputs.get('source_face')
-	target_vision_frame = inputs.get('target_vision_frame')
+def select_target_faces(reference_faces : FaceSet, target_vision_frame : VisionFrame) -> List[Face]:
 	many_faces = sort_and_filter_faces(get_many_faces([ target_vision_frame ]))
 
 	if state_manager.get_item('face_selector_mode') == 'many':
 		if many_faces:
-			for target_face in many_faces:
-				target_vision_frame = swap_face(source_face, target_face, target_vision_frame)
+			return many_faces
 	if state_manager.get_item('face_selector_mode') == 'one':
 		target_face = get_one_face(many_faces)
 		if target_face:
-			target_vision_frame = swap_face(source_face, target_face, target_vision_frame)
+			return [ target_face ]
 	if state_manager.get_item('face_selector_mode') == 'reference':
 		similar_faces = find_similar_faces(many_faces, reference_faces, state_manager.get_item('reference_face_distance'))
 		if similar_faces:
-			for similar_face in similar_faces:
-				target_vision_frame = swap_face(source_face, similar_face, target_vision_frame)
+			return similar_faces
+	return []
+
+
+def select_frame_target_faces(reference_faces : FaceSet, frame_number : int, target_vision_frame : VisionFrame) -> List[Face]:
+	set_track_frame_number(frame_number)
+	return select_target_faces(reference_faces, target_vision_frame)
+
+
+def process_frame(inputs : FaceSwapperInputs) -> VisionFrame:
+	reference_faces = inputs.get('reference_faces')
+	source_face = inputs.get('source_face')
+	target_vision_frame = inputs.get('target_vision_frame')
+	target_faces = select_target_faces(reference_faces, target_vision_frame)
+
+	if target_faces:
+		target_vision_frame = get_first(swap_faces(source_face, [ target_faces ], [ target_vision_frame ]))
 	return target_vision_frame
 
 
 def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
-	source_frames = read_static_images(source_paths)
-	source_faces = get_many_faces(source_frames)
-	source_face = get_average_face(source_faces)
+	source_face = get_source_context(source_paths).get('source_face')
+	face_swapper_batch_size = state_manager.get_item('face_swapper_batch_size')
+	target_queue_payloads = []
 
 	for queue_payload in process_manager.manage(queue_payloads):
-		target_vision_path = queue_payload['frame_path']
-		target_vision_frame = read_image(target_vision_path)
-		output_vision_frame = process_frame(
-		{
-			'reference_faces': reference_faces,
-			'source_face': source_face,
-			'target_vision_frame': target_vision_frame
-		})
-		write_image(target_vision_path, output_vision_frame)
-		update_progress(1)
+		target_queue_payloads.append(queue_payload)
+		if len(target_queue_payloads) == face_swapper_batch_size or queue_payload == queue_payloads[-1]:
+			target_vision_frames = [ read_image(target_queue_payload.get('frame_path')) for target_queue_payload in target_queue_payloads ]
+			target_faces_list = [ select_frame_target_faces(reference_faces, target_queue_payload.get('frame_number'), target_vision_frame) for target_queue_payload, target_vision_frame in zip(target_queue_payloads, target_vision_frames) ]
+			output_vision_frames = swap_faces(source_face, target_faces_list, target_vision_frames)
+
+			for target_queue_payload, output_vision_frame in zip(target_queue_payloads, output_vision_frames):
+				write_image(target_queue_payload.get('output_frame_path'), output_vision_frame)
+				update_progress(1)
+			target_queue_payloads = []
 
 
 def process_image(source_paths : List[str], target_path : str, output_path : str) -> None:
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
-	source_frames = read_static_images(source_paths)
-	source_faces = get_many_faces(source_frames)
-	source_face = get_average_face(source_faces)
+	source_face = get_source_context(source_paths).get('source_face')
 	target_vision_frame = read_static_image(target_path)
 	output_vision_frame = process_frame(
 	{
@@ -266,7 +266,7 @@ def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload]
 		{
 			'target_vision_frame': target_vision_frame
 		})
-		write_image(target_vision_path, output_vision_frame)
+		write_image(queue_payload.get('output_frame_path'), output_vision_frame)
 		update_progress(1)
 
 
@@ -14,7 +14,6 @@ from facefusion.filesystem import in_directory, is_image, is_video, resolve_rela
 from facefusion.processors import choices as processors_choices
 from facefusion.processors.typing import FrameEnhancerInputs
 from facefusion.program_helper import find_argument_group
-from facefusion.thread_helper import conditional_thread_semaphore
 from facefusion.typing import ApplyStateItem, Args, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
 from facefusion.vision import create_tile_frames, merge_tile_frames, read_image, read_static_image, write_image
 
@@ -352,11 +351,10 @@ def enhance_frame(temp_vision_frame : VisionFrame) -> VisionFrame:
 def forward(tile_vision_frame : VisionFrame) -> VisionFrame:
 	frame_enhancer = get_inference_pool().get('frame_enhancer')
 
-	with conditional_thread_semaphore():
-		tile_vision_frame = frame_enhancer.run(None,
-		{
-			'input': tile_vision_frame
-		})[0]
+	tile_vision_frame = inference_manager.run_inference(frame_enhancer,
+	{
+		'input': tile_vision_frame
+	})[0]
 
 	return tile_vision_frame
 
@@ -398,7 +396,7 @@ def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload]
 		{
 			'target_vision_frame': target_vision_frame
 		})
-		write_image(target_vision_path, output_vision_frame)
+		write_image(queue_payload.get('output_frame_path'), output_vision_frame)
 		update_progress(1)
 
 
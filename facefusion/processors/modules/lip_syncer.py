@@ -8,7 +8,7 @@ import facefusion.jobs.job_manager
 import facefusion.jobs.job_store
 import facefusion.processors.core as processors
 from facefusion import config, content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, inference_manager, logger, process_manager, state_manager, voice_extractor, wording
-from facefusion.audio import create_empty_audio_frame, get_voice_frame, read_static_voice
+from facefusion.audio import create_empty_audio_frame, read_static_voice
 from facefusion.common_helper import get_first
 from facefusion.download import conditional_download_hashes, conditional_download_sources
 from facefusion.face_analyser import get_many_faces, get_one_face
@@ -16,11 +16,11 @@ from facefusion.face_helper import create_bounding_box, paste_back, warp_face_by
 from facefusion.face_masker import create_mouth_mask, create_occlusion_mask, create_static_box_mask
 from facefusion.face_selector import find_similar_faces, sort_and_filter_faces
 from facefusion.face_store import get_reference_faces
+from facefusion.face_tracker import set_track_frame_number
 from facefusion.filesystem import filter_audio_paths, has_audio, in_directory, is_image, is_video, resolve_relative_path, same_file_extension
 from facefusion.processors import choices as processors_choices
 from facefusion.processors.typing import LipSyncerInputs
 from facefusion.program_helper import find_argument_group
-from facefusion.thread_helper import conditional_thread_semaphore
 from facefusion.typing import ApplyStateItem, Args, AudioFrame, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
 from facefusion.vision import read_image, read_static_image, restrict_video_fps, write_image
 
@@ -167,12 +167,11 @@ def sync_lip(target_face : Face, temp_audio_frame : AudioFrame, temp_vision_fram
 def forward(temp_audio_frame : AudioFrame, close_vision_frame : VisionFrame) -> VisionFrame:
 	lip_syncer = get_inference_pool().get('lip_syncer')
 
-	with conditional_thread_semaphore():
-		close_vision_frame = lip_syncer.run(None,
-		{
-			'source': temp_audio_frame,
-			'target': close_vision_frame
-		})[0]
+	close_vision_frame = inference_manager.run_inference(lip_syncer,
+	{
+		'source': temp_audio_frame,
+		'target': close_vision_frame
+	})[0]
 
 	return close_vision_frame
 
@@ -233,11 +232,10 @@ def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload]
 	temp_video_fps = restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
 
 	for queue_payload in process_manager.manage(queue_payloads):
+		set_track_frame_number(queue_payload.get('frame_number'))
 		frame_number = queue_payload.get('frame_number')
 		target_vision_path = queue_payload.get('frame_path')
-		source_audio_frame = get_voice_frame(source_audio_path, temp_video_fps, frame_number)
-		if not numpy.any(source_audio_frame):
-			source_audio_frame = create_empty_audio_frame()
+		source_audio_frame = processors.get_chain_audio_frame(source_audio_path, temp_video_fps, frame_number)
 		target_vision_frame = read_image(target_vision_path)
 		output_vision_frame = process_frame(
 		{
@@ -245,7 +243,7 @@ def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload]
 			'source_audio_frame': source_audio_frame,
 			'target_vision_frame': target_vision_frame
 		})
-		write_image(target_vision_path, output_vision_frame)
+		write_image(queue_payload.get('output_frame_path'), output_vision_frame)
 		update_progress(1)
 
 
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Literal, TypedDict
+from typing import Any, Dict, List, Literal, Optional, TypedDict
 
 from numpy._typing import NDArray
 
@@ -48,6 +48,15 @@ FaceSwapperInputs = TypedDict('FaceSwapperInputs',
 	'source_face' : Face,
 	'target_vision_frame' : VisionFrame
 })
+FaceSwapperSourceContext = TypedDict('FaceSwapperSourceContext',
+{
+	'source_paths' : List[str],
+	'face_swapper_model' : FaceSwapperModel,
+	'source_frames' : List[VisionFrame],
+	'source_faces' : List[Face],
+	'source_face' : Optional[Face],
+	'source_input' : Optional[NDArray[Any]]
+})
 FrameColorizerInputs = TypedDict('FrameColorizerInputs',
 {
 	'target_vision_frame' : VisionFrame
@@ -89,6 +98,7 @@ ProcessorStateKey = Literal\
 	'face_enhancer_blend',
 	'face_swapper_model',
 	'face_swapper_pixel_boost',
+	'face_swapper_batch_size',
 	'frame_colorizer_model',
 	'frame_colorizer_size',
 	'frame_colorizer_blend',
@@ -122,6 +132,7 @@ ProcessorState = TypedDict('ProcessorState',
 	'face_enhancer_blend' : int,
 	'face_swapper_model' : FaceSwapperModel,
 	'face_swapper_pixel_boost' : str,
+	'face_swapper_batch_size' : int,
 	'frame_colorizer_model' : FrameColorizerModel,
 	'frame_colorizer_size' : str,
 	'frame_colorizer_blend' : int,
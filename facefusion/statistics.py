@@ -3,11 +3,11 @@ from typing import Any, Dict
 import numpy
 
 from facefusion import logger, state_manager
-from facefusion.face_store import get_face_store
-from facefusion.typing import FaceSet
+from facefusion.face_store import get_face_store, get_face_store_statistics
+from facefusion.typing import FaceSet, FaceStoreStatistics
 
 
-def create_statistics(static_faces : FaceSet) -> Dict[str, Any]:
+def create_statistics(static_faces : FaceSet, face_store_statistics : FaceStoreStatistics) -> Dict[str, Any]:
 	face_detector_scores = []
 	face_landmarker_scores = []
 	statistics =\
@@ -20,7 +20,12 @@ def create_statistics(static_faces : FaceSet) -> Dict[str, Any]:
 		'average_face_landmarker_score': 0,
 		'total_face_landmark_5_fallbacks': 0,
 		'total_frames_with_faces': 0,
-		'total_faces': 0
+		'total_faces': 0,
+		'total_static_face_hits': face_store_statistics.get('static_face_hits'),
+		'total_static_face_misses': face_store_statistics.get('static_face_misses'),
+		'total_static_face_evictions': face_store_statistics.get('static_face_evictions'),
+		'total_static_face_spills': face_store_statistics.get('static_face_spills'),
+		'static_face_memory_size': round(face_store_statistics.get('static_face_memory_size') / 1024 / 1024, 2)
 	}
 
 	for faces in static_faces.values():
@@ -45,7 +50,7 @@ def create_statistics(static_faces : FaceSet) -> Dict[str, Any]:
 
 def conditional_log_statistics() -> None:
 	if state_manager.get_item('log_level') == 'debug':
-		statistics = create_statistics(get_face_store().get('static_faces'))
+		statistics = create_statistics(get_face_store().get('static_faces'), get_face_store_statistics())
 
 		for name, value in statistics.items():
 			logger.debug(str(name) + ': ' + str(value), __name__)
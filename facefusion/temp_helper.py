@@ -13,6 +13,12 @@ def get_temp_file_path(file_path : str) -> str:
 	return os.path.join(temp_directory_path, 'temp' + temp_file_extension)
 
 
+def get_temp_segment_path(file_path : str, segment_name : str) -> str:
+	temp_file_name, temp_file_extension = os.path.splitext(os.path.basename(file_path))
+	temp_directory_path = get_temp_directory_path(file_path)
+	return os.path.join(temp_directory_path, temp_file_name + '-' + segment_name + temp_file_extension)
+
+
 def move_temp_file(file_path : str, move_path : str) -> bool:
 	temp_file_path = get_temp_file_path(file_path)
 	return move_file(temp_file_path, move_path)
@@ -28,6 +34,10 @@ def get_temp_frames_pattern(target_path : str, temp_frame_prefix : str) -> str:
 	return os.path.join(temp_directory_path, temp_frame_prefix + '.' + state_manager.get_item('temp_frame_format'))
 
 
+def get_temp_staging_path(frame_path : str) -> str:
+	return os.path.join(os.path.dirname(frame_path), 'staging', os.path.basename(frame_path))
+
+
 def get_base_directory_path() -> str:
 	return os.path.join(tempfile.gettempdir(), 'facefusion')
 
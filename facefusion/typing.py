@@ -1,6 +1,11 @@
+import threading
 from collections import namedtuple
-from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, TypedDict
+from concurrent.futures import Future
+from multiprocessing.shared_memory import SharedMemory
+from queue import Queue
+from typing import Any, Callable, Dict, List, Literal, Optional, OrderedDict, Tuple, TypedDict
 
+import cv2
 import numpy
 from numpy.typing import NDArray
 from onnxruntime import InferenceSession
@@ -13,7 +18,10 @@ Detection = NDArray[Any]
 Prediction = NDArray[Any]
 
 BoundingBox = NDArray[Any]
+BoundingBoxes = NDArray[Any]
+Scores = NDArray[Any]
 FaceLandmark5 = NDArray[Any]
+FaceLandmarks5 = NDArray[Any]
 FaceLandmark68 = NDArray[Any]
 FaceLandmarkSet = TypedDict('FaceLandmarkSet',
 {
@@ -44,11 +52,20 @@ Face = namedtuple('Face',
 	'race'
 ])
 FaceSet = Dict[str, List[Face]]
+StaticFaceSet = OrderedDict[str, List[Face]]
 FaceStore = TypedDict('FaceStore',
 {
-	'static_faces' : FaceSet,
+	'static_faces' : StaticFaceSet,
 	'reference_faces' : FaceSet
 })
+FaceStoreStatistics = TypedDict('FaceStoreStatistics',
+{
+	'static_face_hits' : int,
+	'static_face_misses' : int,
+	'static_face_evictions' : int,
+	'static_face_spills' : int,
+	'static_face_memory_size' : int
+})
 
 VisionFrame = NDArray[Any]
 Mask = NDArray[Any]
@@ -58,6 +75,14 @@ Matrix = NDArray[Any]
 Anchors = NDArray[Any]
 Translation = NDArray[Any]
 
+FaceTrack = TypedDict('FaceTrack',
+{
+	'thumbnail_frame' : VisionFrame,
+	'faces' : List[Face],
+	'track_total' : int
+})
+FaceTrackSet = Dict[int, FaceTrack]
+
 AudioBuffer = bytes
 Audio = NDArray[Any]
 AudioChunk = NDArray[Any]
@@ -67,6 +92,7 @@ Mel = NDArray[Any]
 MelFilterBank = NDArray[Any]
 
 Fps = float
+VideoSegment = Tuple[int, int]
 Padding = Tuple[int, int, int, int]
 Orientation = Literal['landscape', 'portrait']
 Resolution = Tuple[int, int]
@@ -75,11 +101,40 @@ ProcessState = Literal['checking', 'processing', 'stopping', 'pending']
 QueuePayload = TypedDict('QueuePayload',
 {
 	'frame_number' : int,
-	'frame_path' : str
+	'frame_path' : str,
+	'output_frame_path' : str
 })
 Args = Dict[str, Any]
 UpdateProgress = Callable[[int], None]
 ProcessFrames = Callable[[List[str], List[QueuePayload], UpdateProgress], None]
+ConsumeFrame = Callable[[QueuePayload], None]
+
+FrameShape = Tuple[int, int, int]
+FrameSlotState = Literal['free', 'decoded', 'processed']
+FrameRing = TypedDict('FrameRing',
+{
+	'shared_memory' : SharedMemory,
+	'slot_total' : int,
+	'frame_shape' : FrameShape
+})
+FrameRingSet = Dict[str, FrameRing]
+VideoReader = TypedDict('VideoReader',
+{
+	'video_capture' : cv2.VideoCapture,
+	'frame_position' : int,
+	'frame_total' : int,
+	'vision_frames' : OrderedDict[int, VisionFrame]
+})
+VideoReaderSet = Dict[str, VideoReader]
+VideoMetadata = TypedDict('VideoMetadata',
+{
+	'frame_total' : int,
+	'fps' : Fps,
+	'resolution' : Resolution,
+	'duration' : float,
+	'codec' : str,
+	'rotation' : int
+})
 ProcessStep = Callable[[str, int, Args], bool]
 
 Content = Dict[str, Any]
@@ -96,6 +151,7 @@ TableHeaders = List[str]
 TableContents = List[List[Any]]
 
 VideoMemoryStrategy = Literal['strict', 'moderate', 'tolerant']
+ExecutionBackend = Literal['thread', 'process']
 FaceDetectorModel = Literal['many', 'retinaface', 'scrfd', 'yoloface']
 FaceLandmarkerModel = Literal['many', '2dfan4', 'peppa_wutz']
 FaceDetectorSet = Dict[FaceDetectorModel, List[str]]
@@ -104,6 +160,7 @@ FaceSelectorOrder = Literal['left-right', 'right-left', 'top-bottom', 'bottom-to
 FaceMaskType = Literal['box', 'occlusion', 'region']
 FaceMaskRegion = Literal['skin', 'left-eyebrow', 'right-eyebrow', 'left-eye', 'right-eye', 'glasses', 'nose', 'mouth', 'upper-lip', 'lower-lip']
 TempFrameFormat = Literal['jpg', 'png', 'bmp']
+PipelineMode = Literal['disk', 'fused', 'stream']
 OutputAudioEncoder = Literal['aac', 'libmp3lame', 'libopus', 'libvorbis']
 OutputVideoEncoder = Literal['libx264', 'libx265', 'libvpx-vp9', 'h264_nvenc', 'hevc_nvenc', 'h264_amf', 'hevc_amf', 'h264_videotoolbox', 'hevc_videotoolbox']
 OutputVideoPreset = Literal['ultrafast', 'superfast', 'veryfast', 'faster', 'fast', 'medium', 'slow', 'slower', 'veryslow']
@@ -161,9 +218,28 @@ AppContext = Literal['cli', 'ui']
 
 InferencePool = Dict[str, InferenceSession]
 InferencePoolSet = Dict[AppContext, Dict[str, InferencePool]]
+InferenceInputs = Dict[str, Any]
+InferenceOutputs = Any
+InferenceRequest = TypedDict('InferenceRequest',
+{
+	'inference_inputs' : InferenceInputs,
+	'future' : Future[InferenceOutputs]
+})
+InferenceBroker = TypedDict('InferenceBroker',
+{
+	'queue' : Queue[Optional[InferenceRequest]],
+	'thread' : threading.Thread
+})
+InferenceBrokerSet = Dict[InferenceSession, InferenceBroker]
 
 UiWorkflow = Literal['instant_runner', 'job_runner', 'job_manager']
 
+Checkpoint = TypedDict('Checkpoint',
+{
+	'args_hash' : str,
+	'frame_total' : int,
+	'processed_frames' : Dict[str, List[int]]
+})
 JobStore = TypedDict('JobStore',
 {
 	'job_keys' : List[str],
@@ -199,6 +275,7 @@ StateKey = Literal\
 	'face_detector_size',
 	'face_detector_angles',
 	'face_detector_score',
+	'face_tracker_interval',
 	'face_landmarker_model',
 	'face_landmarker_score',
 	'face_selector_mode',
@@ -218,6 +295,10 @@ StateKey = Literal\
 	'trim_frame_end',
 	'temp_frame_format',
 	'keep_temp',
+	'pipeline_mode',
+	'video_segment_count',
+	'video_segment_offset',
+	'frame_cache_path',
 	'output_image_quality',
 	'output_image_resolution',
 	'output_audio_encoder',
@@ -233,10 +314,15 @@ StateKey = Literal\
 	'ui_workflow',
 	'execution_device_id',
 	'execution_providers',
+	'execution_backend',
 	'execution_thread_count',
 	'execution_queue_count',
+	'execution_batch_size',
+	'execution_batch_window',
 	'video_memory_strategy',
 	'system_memory_limit',
+	'face_store_memory_limit',
+	'face_store_spill',
 	'skip_download',
 	'log_level',
 	'job_id',
@@ -255,6 +341,7 @@ State = TypedDict('State',
 	'face_detector_size' : str,
 	'face_detector_angles' : List[Angle],
 	'face_detector_score' : Score,
+	'face_tracker_interval' : int,
 	'face_landmarker_model' : FaceLandmarkerModel,
 	'face_landmarker_score' : Score,
 	'face_selector_mode' : FaceSelectorMode,
@@ -274,6 +361,10 @@ State = TypedDict('State',
 	'trim_frame_end' : int,
 	'temp_frame_format' : TempFrameFormat,
 	'keep_temp' : bool,
+	'pipeline_mode' : PipelineMode,
+	'video_segment_count' : int,
+	'video_segment_offset' : int,
+	'frame_cache_path' : str,
 	'output_image_quality' : int,
 	'output_image_resolution' : str,
 	'output_audio_encoder' : OutputAudioEncoder,
@@ -289,10 +380,15 @@ State = TypedDict('State',
 	'ui_workflow' : UiWorkflow,
 	'execution_device_id' : str,
 	'execution_providers' : List[ExecutionProviderKey],
+	'execution_backend' : ExecutionBackend,
 	'execution_thread_count' : int,
 	'execution_queue_count' : int,
+	'execution_batch_size' : int,
+	'execution_batch_window' : int,
 	'video_memory_strategy' : VideoMemoryStrategy,
 	'system_memory_limit' : int,
+	'face_store_memory_limit' : int,
+	'face_store_spill' : bool,
 	'skip_download' : bool,
 	'log_level' : LogLevel,
 	'job_id' : str,
@@ -0,0 +1,30 @@
+from typing import Optional
+
+import gradio
+
+import facefusion.choices
+from facefusion import inference_manager, state_manager, wording
+from facefusion.common_helper import calc_int_step
+
+EXECUTION_BATCH_SIZE_SLIDER : Optional[gradio.Slider] = None
+
+
+def render() -> None:
+	global EXECUTION_BATCH_SIZE_SLIDER
+
+	EXECUTION_BATCH_SIZE_SLIDER = gradio.Slider(
+		label = wording.get('uis.execution_batch_size_slider'),
+		value = state_manager.get_item('execution_batch_size'),
+		step = calc_int_step(facefusion.choices.execution_batch_size_range),
+		minimum = facefusion.choices.execution_batch_size_range[0],
+		maximum = facefusion.choices.execution_batch_size_range[-1]
+	)
+
+
+def listen() -> None:
+	EXECUTION_BATCH_SIZE_SLIDER.release(update_execution_batch_size, inputs = EXECUTION_BATCH_SIZE_SLIDER)
+
+
+def update_execution_batch_size(execution_batch_size : float) -> None:
+	inference_manager.clear_inference_brokers()
+	state_manager.set_item('execution_batch_size', int(execution_batch_size))
@@ -9,11 +9,13 @@ from facefusion.typing import VideoMemoryStrategy
 
 VIDEO_MEMORY_STRATEGY_DROPDOWN : Optional[gradio.Dropdown] = None
 SYSTEM_MEMORY_LIMIT_SLIDER : Optional[gradio.Slider] = None
+FACE_STORE_MEMORY_LIMIT_SLIDER : Optional[gradio.Slider] = None
 
 
 def render() -> None:
 	global VIDEO_MEMORY_STRATEGY_DROPDOWN
 	global SYSTEM_MEMORY_LIMIT_SLIDER
+	global FACE_STORE_MEMORY_LIMIT_SLIDER
 
 	VIDEO_MEMORY_STRATEGY_DROPDOWN = gradio.Dropdown(
 		label = wording.get('uis.video_memory_strategy_dropdown'),
@@ -27,11 +29,19 @@ def render() -> None:
 		maximum = facefusion.choices.system_memory_limit_range[-1],
 		value = state_manager.get_item('system_memory_limit')
 	)
+	FACE_STORE_MEMORY_LIMIT_SLIDER = gradio.Slider(
+		label = wording.get('uis.face_store_memory_limit_slider'),
+		step = calc_int_step(facefusion.choices.face_store_memory_limit_range),
+		minimum = facefusion.choices.face_store_memory_limit_range[0],
+		maximum = facefusion.choices.face_store_memory_limit_range[-1],
+		value = state_manager.get_item('face_store_memory_limit')
+	)
 
 
 def listen() -> None:
 	VIDEO_MEMORY_STRATEGY_DROPDOWN.change(update_video_memory_strategy, inputs = VIDEO_MEMORY_STRATEGY_DROPDOWN)
 	SYSTEM_MEMORY_LIMIT_SLIDER.release(update_system_memory_limit, inputs = SYSTEM_MEMORY_LIMIT_SLIDER)
+	FACE_STORE_MEMORY_LIMIT_SLIDER.release(update_face_store_memory_limit, inputs = FACE_STORE_MEMORY_LIMIT_SLIDER)
 
 
 def update_video_memory_strategy(video_memory_strategy : VideoMemoryStrategy) -> None:
@@ -40,3 +50,7 @@ def update_video_memory_strategy(video_memory_strategy : VideoMemoryStrategy) ->
 
 def update_system_memory_limit(system_memory_limit : float) -> None:
 	state_manager.set_item('system_memory_limit', int(system_memory_limit))
+
+
+def update_face_store_memory_limit(face_store_memory_limit : float) -> None:
+	state_manager.set_item('face_store_memory_limit', int(face_store_memory_limit))
@@ -12,6 +12,7 @@ from facefusion.content_analyser import analyse_frame
 from facefusion.core import conditional_append_reference_faces
 from facefusion.face_analyser import get_average_face, get_many_faces
 from facefusion.face_store import clear_reference_faces, clear_static_faces, get_reference_faces
+from facefusion.face_tracker import clear_face_tracks
 from facefusion.filesystem import filter_audio_paths, is_image, is_video
 from facefusion.processors.core import get_processors_modules
 from facefusion.typing import AudioFrame, Face, FaceSet, VisionFrame
@@ -227,6 +228,7 @@ def update_preview_frame_slider() -> gradio.Slider:
 def process_preview_frame(reference_faces : FaceSet, source_face : Face, source_audio_frame : AudioFrame, target_vision_frame : VisionFrame) -> VisionFrame:
 	target_vision_frame = resize_frame_resolution(target_vision_frame, (1024, 1024))
 	source_vision_frame = target_vision_frame.copy()
+	clear_face_tracks()
 	if analyse_frame(target_vision_frame):
 		return cv2.GaussianBlur(target_vision_frame, (99, 99), 0)
 
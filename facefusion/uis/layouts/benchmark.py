@@ -2,7 +2,7 @@ import gradio
 
 from facefusion import state_manager
 from facefusion.download import conditional_download
-from facefusion.uis.components import about, age_modifier_options, benchmark, benchmark_options, execution, execution_queue_count, execution_thread_count, expression_restorer_options, face_debugger_options, face_editor_options, face_enhancer_options, face_swapper_options, frame_colorizer_options, frame_enhancer_options, lip_syncer_options, memory, processors
+from facefusion.uis.components import about, age_modifier_options, benchmark, benchmark_options, execution, execution_batch_size, execution_queue_count, execution_thread_count, expression_restorer_options, face_debugger_options, face_editor_options, face_enhancer_options, face_swapper_options, frame_colorizer_options, frame_enhancer_options, lip_syncer_options, memory, processors
 
 
 def pre_check() -> bool:
@@ -53,6 +53,7 @@ def render() -> gradio.Blocks:
 					execution.render()
 					execution_thread_count.render()
 					execution_queue_count.render()
+					execution_batch_size.render()
 				with gradio.Blocks():
 					memory.render()
 				with gradio.Blocks():
@@ -77,6 +78,7 @@ def listen() -> None:
 	execution.listen()
 	execution_thread_count.listen()
 	execution_queue_count.listen()
+	execution_batch_size.listen()
 	memory.listen()
 	benchmark.listen()
 
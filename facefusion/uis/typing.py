@@ -16,6 +16,7 @@ ComponentName = Literal\
 	'face_detector_model_dropdown',
 	'face_detector_score_slider',
 	'face_detector_size_dropdown',
+	'face_tracker_interval_slider',
 	'face_editor_eyebrow_direction_slider',
 	'face_editor_eye_gaze_horizontal_slider',
 	'face_editor_eye_gaze_vertical_slider',
@@ -49,6 +50,7 @@ ComponentName = Literal\
 	'face_selector_race_dropdown',
 	'face_swapper_model_dropdown',
 	'face_swapper_pixel_boost_dropdown',
+	'face_swapper_batch_size_slider',
 	'frame_colorizer_blend_slider',
 	'frame_colorizer_model_dropdown',
 	'frame_colorizer_size_dropdown',
@@ -1,3 +1,6 @@
+import os
+import threading
+from collections import OrderedDict
 from functools import lru_cache
 from typing import List, Optional, Tuple
 
@@ -8,7 +11,10 @@ from cv2.typing import Size
 from facefusion.choices import image_template_sizes, video_template_sizes
 from facefusion.common_helper import is_windows
 from facefusion.filesystem import is_image, is_video, sanitize_path_for_windows
-from facefusion.typing import Fps, Orientation, Resolution, VisionFrame
+from facefusion.typing import Fps, Orientation, Resolution, VideoMetadata, VideoReader, VideoReaderSet, VisionFrame
+
+VIDEO_READERS : VideoReaderSet = {}
+VIDEO_READER_LOCK : threading.Lock = threading.Lock()
 
 
 @lru_cache(maxsize = 128)
@@ -87,27 +93,97 @@ def get_video_frame(video_path : str, frame_number : int = 0) -> Optional[Vision
 	return None
 
 
-def count_video_frame_total(video_path : str) -> int:
-	if is_video(video_path):
-		if is_windows():
-			video_path = sanitize_path_for_windows(video_path)
-		video_capture = cv2.VideoCapture(video_path)
+def read_video_frame(video_path : str, frame_number : int = 0, frame_cache_total : int = 16) -> Optional[VisionFrame]:
+	with VIDEO_READER_LOCK:
+		video_reader = get_video_reader(video_path)
+
+		if video_reader:
+			frame_position = min(video_reader.get('frame_total'), max(frame_number - 1, 0))
+			vision_frames = video_reader.get('vision_frames')
+
+			if frame_position in vision_frames:
+				vision_frames.move_to_end(frame_position)
+				return vision_frames.get(frame_position)
+			if frame_position < video_reader.get('frame_position') or frame_position > video_reader.get('frame_position') + frame_cache_total:
+				video_reader.get('video_capture').set(cv2.CAP_PROP_POS_FRAMES, frame_position)
+				video_reader['frame_position'] = frame_position
+
+			while video_reader.get('frame_position') <= frame_position:
+				has_vision_frame, vision_frame = video_reader.get('video_capture').read()
+				if not has_vision_frame:
+					return None
+				vision_frames[video_reader.get('frame_position')] = vision_frame
+				video_reader['frame_position'] += 1
+				while len(vision_frames) > frame_cache_total:
+					vision_frames.popitem(last = False)
+			return vision_frames.get(frame_position)
+	return None
+
+
+def get_video_reader(video_path : str) -> Optional[VideoReader]:
+	if video_path not in VIDEO_READERS and is_video(video_path):
+		video_capture = cv2.VideoCapture(sanitize_path_for_windows(video_path) if is_windows() else video_path)
 		if video_capture.isOpened():
-			video_frame_total = int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
-			video_capture.release()
-			return video_frame_total
+			VIDEO_READERS[video_path] =\
+			{
+				'video_capture': video_capture,
+				'frame_position': 0,
+				'frame_total': int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT)),
+				'vision_frames': OrderedDict()
+			}
+	return VIDEO_READERS.get(video_path)
+
+
+def clear_video_readers() -> None:
+	with VIDEO_READER_LOCK:
+		for video_reader in VIDEO_READERS.values():
+			video_reader.get('video_capture').release()
+		VIDEO_READERS.clear()
+
+
+def detect_video_metadata(video_path : str) -> Optional[VideoMetadata]:
+	if is_video(video_path):
+		video_stat = os.stat(video_path)
+		return probe_video_metadata(video_path, video_stat.st_size, video_stat.st_mtime_ns)
+	return None
+
+
+# audio streams are not probed, ffmpeg reads them on demand
+@lru_cache(maxsize = 32)
+def probe_video_metadata(video_path : str, video_size : int, video_mtime : int) -> Optional[VideoMetadata]:
+	video_capture = cv2.VideoCapture(sanitize_path_for_windows(video_path) if is_windows() else video_path)
+
+	if video_capture.isOpened():
+		video_frame_total = int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
+		video_fps = video_capture.get(cv2.CAP_PROP_FPS)
+		video_fourcc = int(video_capture.get(cv2.CAP_PROP_FOURCC))
+		video_metadata : VideoMetadata =\
+		{
+			'frame_total': video_frame_total,
+			'fps': video_fps,
+			'resolution': (int(video_capture.get(cv2.CAP_PROP_FRAME_WIDTH)), int(video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT))),
+			'duration': video_frame_total / video_fps if video_fps else 0,
+			'codec': ''.join(chr(video_fourcc >> shift & 0xff) for shift in range(0, 32, 8)).strip('\x00 '),
+			'rotation': int(video_capture.get(cv2.CAP_PROP_ORIENTATION_META))
+		}
+		video_capture.release()
+		return video_metadata
+	return None
+
+
+def count_video_frame_total(video_path : str) -> int:
+	video_metadata = detect_video_metadata(video_path)
+
+	if video_metadata:
+		return video_metadata.get('frame_total')
 	return 0
 
 
 def detect_video_fps(video_path : str) -> Optional[float]:
-	if is_video(video_path):
-		if is_windows():
-			video_path = sanitize_path_for_windows(video_path)
-		video_capture = cv2.VideoCapture(video_path)
-		if video_capture.isOpened():
-			video_fps = video_capture.get(cv2.CAP_PROP_FPS)
-			video_capture.release()
-			return video_fps
+	video_metadata = detect_video_metadata(video_path)
+
+	if video_metadata:
+		return video_metadata.get('fps')
 	return None
 
 
@@ -120,15 +196,10 @@ def restrict_video_fps(video_path : str, fps : Fps) -> Fps:
 
 
 def detect_video_resolution(video_path : str) -> Optional[Resolution]:
-	if is_video(video_path):
-		if is_windows():
-			video_path = sanitize_path_for_windows(video_path)
-		video_capture = cv2.VideoCapture(video_path)
-		if video_capture.isOpened():
-			width = video_capture.get(cv2.CAP_PROP_FRAME_WIDTH)
-			height = video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT)
-			video_capture.release()
-			return int(width), int(height)
+	video_metadata = detect_video_metadata(video_path)
+
+	if video_metadata:
+		return video_metadata.get('resolution')
 	return None
 
 
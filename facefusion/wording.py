@@ -7,10 +7,20 @@ WORDING : Dict[str, Any] =\
 	'curl_not_installed': 'CURL is not installed',
 	'ffmpeg_not_installed': 'FFMpeg is not installed',
 	'creating_temp': 'Creating temporary resources',
+	'resuming_checkpoint': 'Resuming from temporary resources',
 	'extracting_frames': 'Extracting frames with a resolution of {resolution} and {fps} frames per second',
 	'extracting_frames_succeed': 'Extracting frames succeed',
 	'extracting_frames_failed': 'Extracting frames failed',
+	'extracting_frames_skipped': 'Extracting frames skipped',
+	'streaming_frames': 'Streaming frames with a resolution of {resolution} and {fps} frames per second',
+	'streaming_frames_succeed': 'Streaming frames succeed',
+	'streaming_frames_failed': 'Streaming frames failed',
+	'processing_segments': 'Processing {segment_total} video segments in parallel',
+	'processing_segments_succeed': 'Processing video segments succeed',
+	'processing_segments_failed': 'Processing video segments failed',
+	'processing_segment_failed': 'Processing video segment failed with {exception}',
 	'analysing': 'Analysing',
+	'analysing_video_failed': 'Analysing video failed',
 	'processing': 'Processing',
 	'downloading': 'Downloading',
 	'temp_frames_not_found': 'Temporary frames not found',
@@ -23,6 +33,7 @@ WORDING : Dict[str, Any] =\
 	'merging_video': 'Merging video with a resolution of {resolution} and {fps} frames per second',
 	'merging_video_succeed': 'Merging video succeed',
 	'merging_video_failed': 'Merging video failed',
+	'encoding_frames_failed': 'Encoding frames failed, falling back to merging video',
 	'skipping_audio': 'Skipping audio',
 	'replacing_audio_succeed': 'Replacing audio succeed',
 	'replacing_audio_skipped': 'Replacing audio skipped',
@@ -103,6 +114,7 @@ WORDING : Dict[str, Any] =\
 		'face_detector_size': 'specify the frame size provided to the face detector',
 		'face_detector_angles': 'specify the angles to rotate the frame before detecting faces',
 		'face_detector_score': 'filter the detected faces base on the confidence score',
+		'face_tracker_interval': 'specify the amount of frames between full face detections while tracking the faces in between',
 		# face landmarker
 		'face_landmarker_model': 'choose the model responsible for detecting the face landmarks',
 		'face_landmarker_score': 'filter the detected face landmarks base on the confidence score',
@@ -126,6 +138,9 @@ WORDING : Dict[str, Any] =\
 		'trim_frame_end': 'specify the ending frame of the target video',
 		'temp_frame_format': 'specify the temporary resources format',
 		'keep_temp': 'keep the temporary resources after processing',
+		'pipeline_mode': 'choose between processing temporary frames on disk per processor, fused in a single pass or streaming frames in memory',
+		'video_segment_count': 'specify the amount of video segments processed in parallel worker processes',
+		'frame_cache_path': 'specify the directory to cache processed frames across runs',
 		# output creation
 		'output_image_quality': 'specify the image quality which translates to the compression factor',
 		'output_image_resolution': 'specify the image output resolution based on the target image',
@@ -162,6 +177,7 @@ WORDING : Dict[str, Any] =\
 		'face_enhancer_blend': 'blend the enhanced into the previous face',
 		'face_swapper_model': 'choose the model responsible for swapping the face',
 		'face_swapper_pixel_boost': 'choose the pixel boost resolution for the face swapper',
+		'face_swapper_batch_size': 'specify the amount of face crops the face swapper infers in one batch',
 		'frame_colorizer_model': 'choose the model responsible for colorizing the frame',
 		'frame_colorizer_size': 'specify the frame size provided to the frame colorizer',
 		'frame_colorizer_blend': 'blend the colorized into the previous frame',
@@ -175,11 +191,16 @@ WORDING : Dict[str, Any] =\
 		# execution
 		'execution_device_id': 'specify the device used for processing',
 		'execution_providers': 'accelerate the model inference using different providers (choices: {choices}, ...)',
+		'execution_backend': 'choose between processing frames in parallel threads or parallel processes',
 		'execution_thread_count': 'specify the amount of parallel threads while processing',
 		'execution_queue_count': 'specify the amount of frames each thread is processing',
+		'execution_batch_size': 'specify the maximum amount of inference requests combined into one batch',
+		'execution_batch_window': 'specify the milliseconds to wait for inference requests to combine into one batch',
 		# memory
 		'video_memory_strategy': 'balance fast processing and low VRAM usage',
 		'system_memory_limit': 'limit the available RAM that can be used while processing',
+		'face_store_memory_limit': 'limit the RAM in megabytes that can be used to cache detected faces',
+		'face_store_spill': 'spill detected faces evicted from the face store to the disk',
 		# misc
 		'skip_download': 'omit downloads and remote lookups',
 		'log_level': 'adjust the message severity displayed in the terminal',
@@ -225,6 +246,7 @@ WORDING : Dict[str, Any] =\
 		'common_options_checkbox_group': 'OPTIONS',
 		'execution_providers_checkbox_group': 'EXECUTION PROVIDERS',
 		'execution_queue_count_slider': 'EXECUTION QUEUE COUNT',
+		'execution_batch_size_slider': 'EXECUTION BATCH SIZE',
 		'execution_thread_count_slider': 'EXECUTION THREAD COUNT',
 		'expression_restorer_factor_slider': 'EXPRESSION RESTORER FACTOR',
 		'expression_restorer_model_dropdown': 'EXPRESSION RESTORER MODEL',
@@ -233,6 +255,7 @@ WORDING : Dict[str, Any] =\
 		'face_detector_model_dropdown': 'FACE DETECTOR MODEL',
 		'face_detector_score_slider': 'FACE DETECTOR SCORE',
 		'face_detector_size_dropdown': 'FACE DETECTOR SIZE',
+		'face_tracker_interval_slider': 'FACE TRACKER INTERVAL',
 		'face_editor_eyebrow_direction_slider': 'FACE EDITOR EYEBROW DIRECTION',
 		'face_editor_eye_gaze_horizontal_slider': 'FACE EDITOR EYE GAZE HORIZONTAL',
 		'face_editor_eye_gaze_vertical_slider': 'FACE EDITOR EYE GAZE VERTICAL',
@@ -264,8 +287,10 @@ WORDING : Dict[str, Any] =\
 		'face_selector_mode_dropdown': 'FACE SELECTOR MODE',
 		'face_selector_order_dropdown': 'FACE SELECTOR ORDER',
 		'face_selector_race_dropdown': 'FACE SELECTOR RACE',
+		'face_store_memory_limit_slider': 'FACE STORE MEMORY LIMIT',
 		'face_swapper_model_dropdown': 'FACE SWAPPER MODEL',
 		'face_swapper_pixel_boost_dropdown': 'FACE SWAPPER PIXEL BOOST',
+		'face_swapper_batch_size_slider': 'FACE SWAPPER BATCH SIZE',
 		'frame_colorizer_blend_slider': 'FRAME COLORIZER BLEND',
 		'frame_colorizer_model_dropdown': 'FRAME COLORIZER MODEL',
 		'frame_colorizer_size_dropdown': 'FRAME COLORIZER SIZE',
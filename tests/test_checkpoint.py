@@ -0,0 +1,88 @@
+import pytest
+
+from facefusion import process_manager, state_manager
+from facefusion.checkpoint import create_checkpoint, get_checkpoint_path, get_processed_frames, has_extracted_frames, read_checkpoint, set_extracted_frames, set_processed_frames
+from facefusion.download import conditional_download
+from facefusion.ffmpeg import extract_frames
+from facefusion.filesystem import is_file
+from facefusion.jobs import job_store
+from facefusion.temp_helper import clear_temp_directory, create_temp_directory
+from .helper import get_test_example_file, get_test_examples_directory
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	process_manager.start()
+	conditional_download(get_test_examples_directory(),
+	[
+		'https://github.com/facefusion/facefusion-assets/releases/download/examples-3.0.0/target-240p.mp4'
+	])
+	if 'processors' not in job_store.get_step_keys():
+		job_store.register_step_keys([ 'processors' ])
+	state_manager.init_item('processors', [ 'face_swapper' ])
+	state_manager.init_item('temp_frame_format', 'jpg')
+	state_manager.init_item('keep_temp', False)
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	target_path = get_test_example_file('target-240p.mp4')
+	clear_temp_directory(target_path)
+	create_temp_directory(target_path)
+
+
+def test_create_checkpoint() -> None:
+	target_path = get_test_example_file('target-240p.mp4')
+
+	assert read_checkpoint(target_path) is None
+	assert create_checkpoint(target_path) is True
+	assert read_checkpoint(target_path).get('frame_total') == 0
+
+	state_manager.set_item('processors', [ 'face_enhancer' ])
+
+	assert read_checkpoint(target_path) is None
+
+	state_manager.set_item('processors', [ 'face_swapper' ])
+
+
+def test_create_checkpoint_with_source() -> None:
+	target_path = get_test_example_file('target-240p.mp4')
+	source_path = get_test_example_file('source-checkpoint.txt')
+	state_manager.init_item('source_paths', [ source_path ])
+
+	with open(source_path, 'w') as source_file:
+		source_file.write('source')
+	create_checkpoint(target_path)
+
+	assert read_checkpoint(target_path)
+
+	with open(source_path, 'w') as source_file:
+		source_file.write('changed source')
+
+	assert read_checkpoint(target_path) is None
+
+	state_manager.init_item('source_paths', [])
+
+
+def test_set_extracted_frames() -> None:
+	target_path = get_test_example_file('target-240p.mp4')
+	create_checkpoint(target_path)
+
+	assert has_extracted_frames(target_path) is False
+
+	extract_frames(target_path, '452x240', 25.0)
+	set_processed_frames(target_path, 'face_swapper', { 0 })
+
+	assert set_extracted_frames(target_path) is True
+	assert has_extracted_frames(target_path) is True
+	assert get_processed_frames(target_path, 'face_swapper') == []
+
+
+def test_set_processed_frames() -> None:
+	target_path = get_test_example_file('target-240p.mp4')
+	create_checkpoint(target_path)
+
+	assert get_processed_frames(target_path, 'face_swapper') == []
+	assert set_processed_frames(target_path, 'face_swapper', { 4, 0, 1 }) is True
+	assert get_processed_frames(target_path, 'face_swapper') == [ 0, 1, 4 ]
+	assert is_file(get_checkpoint_path(target_path) + '.tmp') is False
@@ -38,3 +38,10 @@ def test_sync_lip_to_video() -> None:
 
 	assert subprocess.run(commands).returncode == 0
 	assert is_test_output_file('test_sync_lip_to_video.mp4') is True
+
+
+def test_sync_lip_to_video_segments() -> None:
+	commands = [ sys.executable, 'facefusion.py', 'headless-run', '-j', get_test_jobs_directory(), '--processors', 'lip_syncer', '-s', get_test_example_file('source.mp3'), '-t', get_test_example_file('target-240p.mp4'), '-o', get_test_output_file('test_sync_lip_to_video_segments.mp4'), '--trim-frame-end', '50', '--video-segment-count', '2' ]
+
+	assert subprocess.run(commands).returncode == 0
+	assert is_test_output_file('test_sync_lip_to_video_segments.mp4') is True
@@ -0,0 +1,48 @@
+import subprocess
+from typing import List, Tuple
+from unittest.mock import patch
+
+import pytest
+
+from facefusion import state_manager
+from facefusion.content_analyser import analyse_video
+from facefusion.typing import VisionFrame
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	state_manager.init_item('log_level', 'error')
+
+
+def open_zero_decoder(frame_total : int, return_code : int) -> subprocess.Popen[bytes]:
+	return subprocess.Popen([ 'sh', '-c', 'head -c ' + str(frame_total * 224 * 224 * 3) + ' /dev/zero; exit ' + str(return_code) ], stdout = subprocess.PIPE)
+
+
+def analyse_zero_video(frame_total : int, probability : float, return_code : int = 0) -> Tuple[bool, List[int]]:
+	batch_totals = []
+
+	def forward_frames(vision_frames : VisionFrame) -> List[float]:
+		batch_totals.append(vision_frames.shape[0])
+		return [ probability ] * vision_frames.shape[0]
+
+	with patch('facefusion.content_analyser.count_video_frame_total', return_value = 750), patch('facefusion.content_analyser.detect_video_fps', return_value = 25.0), patch('facefusion.content_analyser.open_sample_decoder', return_value = open_zero_decoder(frame_total, return_code)), patch('facefusion.content_analyser.forward_frames', forward_frames):
+		analyse_video.cache_clear()
+		return analyse_video('target.mp4', 0, 0), batch_totals
+
+
+def test_analyse_video() -> None:
+	assert analyse_zero_video(30, 0.0) == (False, [ 16, 14 ])
+
+
+def test_analyse_video_early_stop() -> None:
+	assert analyse_zero_video(30, 1.0) == (True, [ 16 ])
+
+
+def test_analyse_video_short_read() -> None:
+	assert analyse_zero_video(20, 0.0) == (False, [ 16, 4 ])
+	assert analyse_zero_video(0, 0.0) == (False, [])
+
+
+def test_analyse_video_decoder_failure() -> None:
+	assert analyse_zero_video(20, 0.0, 1) == (True, [ 16, 4 ])
+	assert analyse_zero_video(0, 0.0, 1) == (True, [])
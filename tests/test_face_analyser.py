@@ -1,11 +1,15 @@
+import pickle
 import subprocess
+from typing import List, Tuple
+from unittest.mock import patch
 
+import numpy
 import pytest
 
 from facefusion import face_classifier, face_detector, face_landmarker, face_recognizer, state_manager
 from facefusion.download import conditional_download
-from facefusion.face_analyser import get_many_faces, get_one_face
-from facefusion.typing import Face
+from facefusion.face_analyser import bind_face_group, create_lazy_face, get_many_faces, get_one_face
+from facefusion.typing import Embedding, Face, VisionFrame
 from facefusion.vision import read_static_image
 from .helper import get_test_example_file, get_test_examples_directory
 
@@ -21,9 +25,12 @@ def before_all() -> None:
 	subprocess.run([ 'ffmpeg', '-i', get_test_example_file('source.jpg'), '-vf', 'crop=iw*0.6:ih*0.6', get_test_example_file('source-60crop.jpg') ])
 	state_manager.init_item('execution_device_id', 0)
 	state_manager.init_item('execution_providers', [ 'cpu' ])
+	state_manager.init_item('execution_batch_size', 1)
+	state_manager.init_item('execution_batch_window', 2)
 	state_manager.init_item('face_detector_angles', [ 0 ])
 	state_manager.init_item('face_detector_model', 'many')
 	state_manager.init_item('face_detector_score', 0.5)
+	state_manager.init_item('face_tracker_interval', 1)
 	state_manager.init_item('face_landmarker_model', 'many')
 	state_manager.init_item('face_landmarker_score', 0.5)
 	face_classifier.pre_check()
@@ -107,3 +114,28 @@ def test_get_many_faces() -> None:
 	assert isinstance(many_faces[0], Face)
 	assert isinstance(many_faces[1], Face)
 	assert isinstance(many_faces[2], Face)
+
+
+def test_lazy_face() -> None:
+	vision_frame = numpy.zeros((240, 320, 3), dtype = numpy.uint8)
+	face_landmark_5 = numpy.array([ [ 100, 100 ], [ 140, 100 ], [ 120, 120 ], [ 105, 140 ], [ 135, 140 ] ], dtype = numpy.float32)
+	faces : List[Face] = [ create_lazy_face(numpy.array([ 80, 80, 160, 160 ]), { 'detector': 1.0, 'landmarker': 0.0 }, { '5': face_landmark_5, '5/68': face_landmark_5, '68': numpy.zeros((68, 2)), '68/5': numpy.zeros((68, 2)) }, 0) for _ in range(2) ]
+	crop_totals = []
+
+	def calc_crop_embeddings(crop_vision_frames : List[VisionFrame]) -> List[Tuple[Embedding, Embedding]]:
+		crop_totals.append(len(crop_vision_frames))
+		return [ (numpy.ones(512), numpy.ones(512)) ] * len(crop_vision_frames)
+
+	bind_face_group(vision_frame, faces)
+
+	with patch('facefusion.face_recognizer.calc_crop_embeddings', calc_crop_embeddings):
+		assert faces[0].embedding.shape == (512,)
+		assert faces[1].normed_embedding.shape == (512,)
+		assert crop_totals == [ 2 ]
+		assert 'vision_frame' not in pickle.loads(pickle.dumps(faces[0])).__dict__
+
+		del vision_frame
+		faces[0].__dict__.pop('embedding_set')
+
+		assert faces[0].embedding is None
+		assert crop_totals == [ 2 ]
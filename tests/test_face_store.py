@@ -0,0 +1,136 @@
+import os
+
+import numpy
+import pytest
+
+from facefusion import face_store, state_manager
+from facefusion.face_analyser import create_lazy_face
+from facefusion.face_store import FACE_EMBEDDING_SIZE, calc_faces_size, clear_static_faces, create_frame_hash, get_face_store, get_face_store_statistics, get_static_faces, set_static_faces
+from facefusion.filesystem import is_directory
+from facefusion.temp_helper import get_temp_directory_path
+from facefusion.typing import Face
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	state_manager.init_item('face_store_memory_limit', 1)
+	state_manager.init_item('face_store_spill', False)
+	state_manager.init_item('target_path', 'target-face-store.mp4')
+	state_manager.init_item('face_detector_score', 0.5)
+	clear_static_faces()
+
+
+def create_face() -> Face:
+	return Face(
+		bounding_box = numpy.zeros(4),
+		score_set = {},
+		landmark_set = {},
+		angle = 0,
+		embedding = numpy.zeros(512 * 128),
+		normed_embedding = numpy.zeros(512 * 128),
+		gender = None,
+		age = None,
+		race = None
+	)
+
+
+def test_get_static_faces() -> None:
+	vision_frame = numpy.ones((8, 8, 3), dtype = numpy.uint8)
+	faces = [ create_face() ]
+
+	assert get_static_faces(vision_frame) is None
+
+	set_static_faces(vision_frame, faces)
+
+	assert get_static_faces(vision_frame) == faces
+	assert get_face_store_statistics().get('static_face_hits') == 1
+	assert get_face_store_statistics().get('static_face_misses') == 1
+
+
+def test_evict_static_faces() -> None:
+	vision_frames = [ numpy.full((8, 8, 3), index + 1, dtype = numpy.uint8) for index in range(3) ]
+
+	for vision_frame in vision_frames:
+		set_static_faces(vision_frame, [ create_face() ])
+
+	assert len(get_face_store().get('static_faces')) == 1
+	assert get_face_store_statistics().get('static_face_evictions') == 2
+	assert get_static_faces(vision_frames[0]) is None
+	assert get_static_faces(vision_frames[2])
+
+
+def test_spill_static_faces() -> None:
+	state_manager.set_item('face_store_spill', True)
+	vision_frames = [ numpy.full((8, 8, 3), index + 1, dtype = numpy.uint8) for index in range(3) ]
+
+	for vision_frame in vision_frames:
+		set_static_faces(vision_frame, [ create_face() ])
+
+	assert get_face_store_statistics().get('static_face_spills') == 2
+	assert os.path.dirname(face_store.FACE_STORE_SPILL_PATH) == get_temp_directory_path('target-face-store.mp4')
+
+	state_manager.set_item('face_detector_score', 0.9)
+
+	assert get_static_faces(vision_frames[0]) is None
+
+	state_manager.set_item('face_detector_score', 0.5)
+
+	assert get_static_faces(vision_frames[0])
+	assert get_face_store_statistics().get('static_face_misses') == 1
+
+	spill_directory_path = face_store.FACE_STORE_SPILL_PATH
+	clear_static_faces()
+
+	assert is_directory(spill_directory_path) is False
+
+
+def test_calc_faces_size() -> None:
+	lazy_face = create_lazy_face(*create_face()[:4])
+
+	assert calc_faces_size([ lazy_face ]) == 32 + FACE_EMBEDDING_SIZE
+
+	lazy_face.__dict__['embedding_set'] = (numpy.zeros(512, dtype = numpy.float32), numpy.zeros(512, dtype = numpy.float32))
+
+	assert calc_faces_size([ lazy_face ]) == 32 + 4096
+	assert calc_faces_size([ create_face() ]) == 32 + 2 * 512 * 128 * 8
+
+
+def test_create_frame_hash() -> None:
+	vision_frame = numpy.random.randint(0, 255, (9, 7, 3), dtype = numpy.uint8)
+	changed_vision_frame = vision_frame.copy()
+	changed_vision_frame[8, 6, 2] ^= 1
+
+	assert create_frame_hash(vision_frame) == create_frame_hash(vision_frame.copy())
+	assert create_frame_hash(vision_frame) != create_frame_hash(changed_vision_frame)
+	assert create_frame_hash(vision_frame[:, ::2]) == create_frame_hash(numpy.ascontiguousarray(vision_frame[:, ::2]))
+	assert create_frame_hash(vision_frame.reshape(7, 9, 3)) != create_frame_hash(vision_frame)
+	assert create_frame_hash(numpy.zeros((9, 7, 3), dtype = numpy.uint8)) is None
+
+
+def test_create_frame_hash_collision() -> None:
+	vision_frame = numpy.random.randint(0, 127, (16, 16, 3), dtype = numpy.uint8)
+	changed_vision_frame = vision_frame.copy()
+	changed_vision_frame.reshape(-1)[7] += 128
+	changed_vision_frame.reshape(-1)[15] += 128
+
+	assert create_frame_hash(vision_frame) != create_frame_hash(changed_vision_frame)
+
+
+def test_create_frame_hash_fallback() -> None:
+	vision_frame = numpy.random.randint(1, 255, (16, 16, 3), dtype = numpy.uint8)
+	changed_vision_frame = vision_frame.copy()
+	changed_vision_frame[1, 1, 1] ^= 1
+	changed_face = create_face()._replace(bounding_box = numpy.ones(4))
+
+	assert create_frame_hash(vision_frame) == create_frame_hash(changed_vision_frame)
+
+	set_static_faces(vision_frame, [ create_face() ])
+	set_static_faces(changed_vision_frame, [ changed_face ])
+
+	assert create_frame_hash(vision_frame) != create_frame_hash(changed_vision_frame)
+	assert get_static_faces(vision_frame) is None
+
+	set_static_faces(vision_frame, [ create_face() ])
+	set_static_faces(changed_vision_frame, [ changed_face ])
+
+	assert numpy.array_equal(get_static_faces(changed_vision_frame)[0].bounding_box, numpy.ones(4))
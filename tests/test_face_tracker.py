@@ -0,0 +1,45 @@
+import numpy
+
+from facefusion import state_manager
+from facefusion.face_tracker import FACE_TRACK_TOTAL, clear_face_tracks, create_thumbnail_frame, detect_scene_change, get_face_track, set_face_track, track_faces
+
+
+def test_set_face_track() -> None:
+	vision_frame = numpy.zeros((240, 320, 3), dtype = numpy.uint8)
+
+	for frame_number in range(FACE_TRACK_TOTAL + 2):
+		set_face_track(frame_number, vision_frame, [], 0)
+
+	assert get_face_track(0) is None
+	assert get_face_track(1) is None
+	assert get_face_track(FACE_TRACK_TOTAL + 1).get('track_total') == 0
+
+	clear_face_tracks()
+
+	assert get_face_track(FACE_TRACK_TOTAL + 1) is None
+
+
+def test_track_faces_without_landmarker() -> None:
+	state_manager.init_item('face_landmarker_score', 0)
+	state_manager.init_item('face_tracker_interval', 5)
+	vision_frame = numpy.zeros((240, 320, 3), dtype = numpy.uint8)
+	set_face_track(0, vision_frame, [ None ], 0) #type:ignore[list-item]
+
+	assert track_faces(vision_frame, 1) is None
+	assert track_faces(vision_frame, 5) is None
+
+	clear_face_tracks()
+
+
+def test_create_thumbnail_frame() -> None:
+	vision_frame = numpy.zeros((240, 320, 3), dtype = numpy.uint8)
+
+	assert create_thumbnail_frame(vision_frame).shape == (32, 32)
+
+
+def test_detect_scene_change() -> None:
+	thumbnail_frame = create_thumbnail_frame(numpy.full((240, 320, 3), 100, dtype = numpy.uint8))
+
+	assert detect_scene_change(thumbnail_frame, create_thumbnail_frame(numpy.full((240, 320, 3), 110, dtype = numpy.uint8))) is False
+	assert detect_scene_change(thumbnail_frame, create_thumbnail_frame(numpy.full((240, 320, 3), 200, dtype = numpy.uint8))) is True
+	assert detect_scene_change(thumbnail_frame, create_thumbnail_frame(numpy.full((240, 320, 3), 0, dtype = numpy.uint8))) is True
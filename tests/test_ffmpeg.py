@@ -5,7 +5,7 @@ import pytest
 
 from facefusion import process_manager, state_manager
 from facefusion.download import conditional_download
-from facefusion.ffmpeg import concat_video, extract_frames, read_audio_buffer
+from facefusion.ffmpeg import calc_video_segments, concat_video, detect_keyframe_numbers, extract_frames, open_sample_decoder, open_video_decoder, read_audio_buffer
 from facefusion.temp_helper import clear_temp_directory, create_temp_directory, get_temp_directory_path
 from .helper import get_test_example_file, get_test_examples_directory, get_test_output_file, prepare_test_output_directory
 
@@ -110,6 +110,55 @@ def test_extract_frames_with_trim_end() -> None:
 		clear_temp_directory(target_path)
 
 
+def test_open_video_decoder() -> None:
+	state_manager.init_item('trim_frame_start', 124)
+	state_manager.init_item('trim_frame_end', 224)
+	providers =\
+	[
+		(get_test_example_file('target-240p-25fps.mp4'), 120),
+		(get_test_example_file('target-240p-30fps.mp4'), 100),
+		(get_test_example_file('target-240p-60fps.mp4'), 50)
+	]
+
+	for target_path, frame_total in providers:
+		video_decoder = open_video_decoder(target_path, '452x240', 30.0)
+		video_buffer, _ = video_decoder.communicate()
+
+		assert video_decoder.returncode == 0
+		assert len(video_buffer) == 452 * 240 * 3 * frame_total
+
+
+def test_open_sample_decoder() -> None:
+	providers =\
+	[
+		(get_test_example_file('target-240p-25fps.mp4'), 0, 270, 25, 11),
+		(get_test_example_file('target-240p-25fps.mp4'), 100, 224, 25, 5),
+		(get_test_example_file('target-240p-30fps.mp4'), 0, 324, 30, 11)
+	]
+
+	for target_path, frame_start, frame_end, sample_interval, sample_total in providers:
+		video_decoder = open_sample_decoder(target_path, frame_start, frame_end, sample_interval, '224x224')
+		video_buffer, _ = video_decoder.communicate()
+
+		assert video_decoder.returncode == 0
+		assert len(video_buffer) == 224 * 224 * 3 * sample_total
+
+
+def test_detect_keyframe_numbers() -> None:
+	keyframe_numbers = detect_keyframe_numbers(get_test_example_file('target-240p-25fps.mp4'))
+
+	assert keyframe_numbers[0] == 0
+	assert keyframe_numbers == sorted(keyframe_numbers)
+	assert detect_keyframe_numbers(get_test_example_file('invalid.mp4')) == []
+
+
+def test_calc_video_segments() -> None:
+	assert calc_video_segments([ 0, 48, 96, 144, 192, 240 ], 0, 270, 3) == [ (0, 96), (96, 192), (192, 270) ]
+	assert calc_video_segments([ 0, 250 ], 10, 100, 3) == [ (10, 40), (40, 70), (70, 100) ]
+	assert calc_video_segments([ 0 ], 0, 2, 4) == [ (0, 1), (1, 2) ]
+	assert calc_video_segments([], 0, 100, 1) == [ (0, 100) ]
+
+
 def test_concat_video() -> None:
 	output_path = get_test_output_file('test-concat-video.mp4')
 	temp_output_paths =\
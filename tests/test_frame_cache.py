@@ -0,0 +1,52 @@
+import os
+import tempfile
+
+import pytest
+
+from facefusion import state_manager
+from facefusion.filesystem import remove_directory
+from facefusion.frame_cache import create_frame_hash, restore_cache_frame, store_cache_frame
+from facefusion.temp_helper import get_base_directory_path
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	state_manager.init_item('frame_cache_path', os.path.join(get_base_directory_path(), 'test-frame-cache'))
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	remove_directory(state_manager.get_item('frame_cache_path'))
+
+
+def test_create_frame_hash() -> None:
+	with tempfile.NamedTemporaryFile(suffix = '.png') as frame_file:
+		frame_file.write(b'frame')
+		frame_file.flush()
+
+		assert create_frame_hash('step-a', 0, 25.0, frame_file.name) == create_frame_hash('step-a', 0, 25.0, frame_file.name)
+		assert create_frame_hash('step-a', 0, 25.0, frame_file.name) != create_frame_hash('step-b', 0, 25.0, frame_file.name)
+		assert create_frame_hash('step-a', 0, 25.0, frame_file.name) != create_frame_hash('step-a', 1, 25.0, frame_file.name)
+		assert create_frame_hash('step-a', 0, 25.0, frame_file.name) != create_frame_hash('step-a', 0, 30.0, frame_file.name)
+
+
+def test_restore_cache_frame() -> None:
+	with tempfile.NamedTemporaryFile(suffix = '.png') as frame_file:
+		frame_file.write(b'frame')
+		frame_file.flush()
+		frame_hash = create_frame_hash('step-a', 0, 25.0, frame_file.name)
+
+		assert restore_cache_frame(frame_hash, frame_file.name) is False
+
+		frame_file.write(b'-processed')
+		frame_file.flush()
+
+		assert store_cache_frame(frame_hash, frame_file.name) is True
+
+		frame_file.truncate(0)
+		frame_file.flush()
+
+		assert restore_cache_frame(frame_hash, frame_file.name) is True
+
+		with open(frame_file.name, 'rb') as restore_file:
+			assert restore_file.read() == b'frame-processed'
@@ -0,0 +1,41 @@
+import numpy
+
+from facefusion.frame_ring import attach_frame_ring, close_frame_rings, create_frame_ring, destroy_frame_ring, get_frame_ring_name, get_frame_slot_buffer, get_frame_slot_number, get_frame_slot_state, read_frame_slot, set_frame_slot, write_frame_slot
+
+
+def test_write_frame_slot() -> None:
+	frame_ring = create_frame_ring(2, (4, 6, 3))
+	vision_frame = numpy.random.randint(0, 255, (4, 6, 3), dtype = numpy.uint8)
+
+	assert write_frame_slot(frame_ring, 1, 7, vision_frame) is True
+	assert write_frame_slot(frame_ring, 0, 8, numpy.zeros((2, 2, 3), dtype = numpy.uint8)) is False
+	assert numpy.array_equal(read_frame_slot(frame_ring, 1), vision_frame)
+	assert get_frame_slot_number(frame_ring, 1) == 7
+	assert get_frame_slot_state(frame_ring, 1) == 'processed'
+
+	destroy_frame_ring(frame_ring)
+
+
+def test_fill_frame_slot() -> None:
+	frame_ring = create_frame_ring(2, (4, 6, 3))
+
+	with get_frame_slot_buffer(frame_ring, 0) as frame_buffer:
+		frame_buffer[:] = bytes(range(72))
+	set_frame_slot(frame_ring, 0, 3, 'decoded')
+
+	assert read_frame_slot(frame_ring, 0).reshape(-1).tolist() == list(range(72))
+	assert not read_frame_slot(frame_ring, 1).any()
+	assert get_frame_slot_state(frame_ring, 0) == 'decoded'
+	assert attach_frame_ring(get_frame_ring_name(frame_ring)) is frame_ring
+
+	destroy_frame_ring(frame_ring)
+
+
+def test_close_frame_rings() -> None:
+	frame_ring = create_frame_ring(2, (4, 6, 3))
+	frame_ring_name = get_frame_ring_name(frame_ring)
+	close_frame_rings()
+
+	assert attach_frame_ring(frame_ring_name) is not frame_ring
+
+	destroy_frame_ring(attach_frame_ring(frame_ring_name))
@@ -1,10 +1,16 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import Queue
+from typing import Optional
 from unittest.mock import patch
 
+import numpy
+import onnx
 import pytest
 from onnxruntime import InferenceSession
 
 from facefusion import content_analyser, state_manager
-from facefusion.inference_manager import INFERENCE_POOLS, get_inference_pool
+from facefusion.inference_manager import INFERENCE_BROKERS, INFERENCE_POOLS, clear_inference_broker, fail_inference_requests, get_inference_pool, has_dynamic_batch, run_inference
+from facefusion.typing import InferenceInputs, InferenceOutputs, InferenceRequest
 
 
 @pytest.fixture(scope = 'module', autouse = True)
@@ -12,6 +18,8 @@ def before_all() -> None:
 	content_analyser.pre_check()
 	state_manager.init_item('execution_device_id', 0)
 	state_manager.init_item('execution_providers', [ 'cpu' ])
+	state_manager.init_item('execution_batch_size', 4)
+	state_manager.init_item('execution_batch_window', 2)
 
 
 def test_get_inference_pool() -> None:
@@ -28,3 +36,65 @@ def test_get_inference_pool() -> None:
 		assert isinstance(INFERENCE_POOLS.get('ui').get('test.cpu').get('content_analyser'), InferenceSession)
 
 	assert INFERENCE_POOLS.get('cli').get('test.cpu').get('content_analyser') == INFERENCE_POOLS.get('ui').get('test.cpu').get('content_analyser')
+
+
+def create_identity_session() -> InferenceSession:
+	graph = onnx.helper.make_graph(
+	[
+		onnx.helper.make_node('Identity', [ 'input' ], [ 'output' ])
+	], 'identity',
+	[
+		onnx.helper.make_tensor_value_info('input', onnx.TensorProto.FLOAT, [ 'batch', 3 ])
+	],
+	[
+		onnx.helper.make_tensor_value_info('output', onnx.TensorProto.FLOAT, [ 'batch', 3 ])
+	])
+	model = onnx.helper.make_model(graph, opset_imports = [ onnx.helper.make_opsetid('', 13) ])
+	model.ir_version = 8
+	return InferenceSession(model.SerializeToString(), providers = [ 'CPUExecutionProvider' ])
+
+
+def test_run_inference() -> None:
+	inference_session = create_identity_session()
+	inference_inputs_list = [ { 'input': numpy.full((index % 2 + 1, 3), index, dtype = numpy.float32) } for index in range(16) ]
+
+	assert has_dynamic_batch(inference_session) is True
+
+	with ThreadPoolExecutor(max_workers = 8) as executor:
+		inference_outputs_list = list(executor.map(lambda inference_inputs: run_inference(inference_session, inference_inputs), inference_inputs_list))
+
+	for inference_inputs, inference_outputs in zip(inference_inputs_list, inference_outputs_list):
+		assert numpy.array_equal(inference_outputs[0], inference_inputs.get('input'))
+	clear_inference_broker(inference_session)
+
+
+def test_run_inference_while_clearing() -> None:
+	inference_session = create_identity_session()
+	inference_inputs_list = [ { 'input': numpy.full((1, 3), index, dtype = numpy.float32) } for index in range(64) ]
+
+	def run_and_clear_inference(inference_inputs : InferenceInputs) -> InferenceOutputs:
+		inference_outputs = run_inference(inference_session, inference_inputs)
+		clear_inference_broker(inference_session)
+		return inference_outputs
+
+	with ThreadPoolExecutor(max_workers = 8) as executor:
+		inference_outputs_list = list(executor.map(run_and_clear_inference, inference_inputs_list, timeout = 10))
+
+	for inference_inputs, inference_outputs in zip(inference_inputs_list, inference_outputs_list):
+		assert numpy.array_equal(inference_outputs[0], inference_inputs.get('input'))
+	assert inference_session not in INFERENCE_BROKERS
+
+
+def test_fail_inference_requests() -> None:
+	inference_queue : Queue[Optional[InferenceRequest]] = Queue()
+	inference_request : InferenceRequest =\
+	{
+		'inference_inputs': { 'input': numpy.zeros((1, 3), dtype = numpy.float32) },
+		'future': Future()
+	}
+	inference_queue.put(None)
+	inference_queue.put(inference_request)
+	fail_inference_requests(inference_queue)
+
+	assert inference_queue.empty()
+	assert isinstance(inference_request.get('future').exception(), RuntimeError)
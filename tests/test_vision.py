@@ -1,9 +1,10 @@
 import subprocess
 
+import numpy
 import pytest
 
 from facefusion.download import conditional_download
-from facefusion.vision import count_video_frame_total, create_image_resolutions, create_video_resolutions, detect_image_resolution, detect_video_fps, detect_video_resolution, get_video_frame, normalize_resolution, pack_resolution, restrict_image_resolution, restrict_video_fps, restrict_video_resolution, unpack_resolution
+from facefusion.vision import count_video_frame_total, create_image_resolutions, create_video_resolutions, detect_image_resolution, detect_video_fps, detect_video_metadata, detect_video_resolution, get_video_frame, normalize_resolution, pack_resolution, read_video_frame, restrict_image_resolution, restrict_video_fps, restrict_video_resolution, unpack_resolution
 from .helper import get_test_example_file, get_test_examples_directory
 
 
@@ -53,6 +54,30 @@ def test_get_video_frame() -> None:
 	assert get_video_frame('invalid') is None
 
 
+def test_read_video_frame() -> None:
+	for frame_number in [ 1, 2, 3, 100, 50, 270, 271 ]:
+		vision_frame = read_video_frame(get_test_example_file('target-240p-25fps.mp4'), frame_number, 4)
+		temp_vision_frame = get_video_frame(get_test_example_file('target-240p-25fps.mp4'), frame_number)
+
+		if temp_vision_frame is None:
+			assert vision_frame is None
+		else:
+			assert numpy.array_equal(vision_frame, temp_vision_frame)
+	assert read_video_frame('invalid') is None
+
+
+def test_detect_video_metadata() -> None:
+	video_metadata = detect_video_metadata(get_test_example_file('target-240p-25fps.mp4'))
+
+	assert video_metadata.get('frame_total') == 270
+	assert video_metadata.get('fps') == 25.0
+	assert video_metadata.get('resolution') == (426, 226)
+	assert video_metadata.get('duration') == 10.8
+	assert video_metadata.get('codec') == 'h264'
+	assert detect_video_metadata(get_test_example_file('target-240p-25fps.mp4')) is video_metadata
+	assert detect_video_metadata('invalid') is None
+
+
 def test_count_video_frame_total() -> None:
 	assert count_video_frame_total(get_test_example_file('target-240p-25fps.mp4')) == 270
 	assert count_video_frame_total(get_test_example_file('target-240p-30fps.mp4')) == 324